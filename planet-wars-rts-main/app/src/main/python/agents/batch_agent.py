@@ -0,0 +1,33 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+import numpy as np
+
+from agents.planet_wars_agent import DEFAULT_OPPONENT
+from core.batch_forward_model import BatchGameState, BatchActions
+from core.game_state import GameParams, Player
+
+
+# === Batched agent interface: one call chooses an action in every game of a batch ===
+class BatchPlanetWarsAgent(ABC):
+    def __init__(self):
+        self.player: Player = Player.Neutral
+        self.params: GameParams = GameParams()
+
+    @abstractmethod
+    def get_batch_action(self, state: BatchGameState, live: np.ndarray) -> BatchActions:
+        pass
+
+    @abstractmethod
+    def get_agent_type(self) -> str:
+        pass
+
+    def prepare_to_play_as(
+        self,
+        player: Player,
+        params: GameParams,
+        opponent: Optional[str] = DEFAULT_OPPONENT
+    ) -> str:
+        self.player = player
+        self.params = params
+        return self.get_agent_type()
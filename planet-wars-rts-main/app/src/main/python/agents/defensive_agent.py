@@ -24,6 +24,7 @@ class DefensiveTurtleAgent(PlanetWarsPlayer):
 
     def get_action(self, game_state: GameState) -> Action:
         planet_by_id = {p.id: p for p in game_state.planets}                     # Dictionary for all planets by id
+        spatial = self.spatial_index(game_state)                                 # Precomputed planet distances
         my_planets = [p for p in game_state.planets if p.owner == self.player]   # Dictionary for my planet(s)
 
         """Defending: Checking for enemy transporters into friendly planets
@@ -56,7 +57,8 @@ class DefensiveTurtleAgent(PlanetWarsPlayer):
             if potential_targets:
                 # Pick target and source
                 target = min(potential_targets, key=lambda p: (p.n_ships, -p.growth_rate))
-                source = max(attack_sources, key=lambda p: (p.n_ships, -p.position.distance(target.position)))
+                distances = spatial.distance_rows[target.id]
+                source = max(attack_sources, key=lambda p: (p.n_ships, -distances[p.id]))
 
                 # Try to attack
                 action = self.attempt_attack(source, target)
@@ -86,8 +88,9 @@ class DefensiveTurtleAgent(PlanetWarsPlayer):
         if not helpers:
             return None
 
-        source = max(helpers, key=lambda p: (p.n_ships, -p.position.distance(dest_planet.position)))
-        spare = source.n_ships * (1 - self.DEFENSE_RESERVE)
+        distances = self.spatial.distance_rows[dest_id]
+        source = max(helpers, key=lambda p: (p.n_ships, -distances[p.id]))
+        spare = source.n_ships * (1 - self.REINFORCEMENT_RESERVE)
 
         if spare >= shortfall:
             send = min(int(spare), math.ceil(shortfall))
@@ -102,8 +105,7 @@ class DefensiveTurtleAgent(PlanetWarsPlayer):
 
     def attempt_attack(self, source, target) -> Optional[Action]:
         """Try to attack a target if it is safe, and we can most likely win"""
-        distance = source.position.distance(target.position)
-        eta = distance / self.params.transporter_speed
+        eta = self.spatial.eta_rows[source.id][target.id]
         estimated_defense = target.n_ships + target.growth_rate * eta
 
         fleet_needed = estimated_defense * self.SAFETY_MULTIPLIER
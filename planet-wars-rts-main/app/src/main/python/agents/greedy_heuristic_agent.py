@@ -21,18 +21,18 @@ class GreedyHeuristicAgent(PlanetWarsPlayer):
 
         # Pick source planet with the most ships
         source = max(my_planets, key=lambda p: p.n_ships)
+        distances = self.spatial_index(game_state).distance_rows[source.id]
 
         # Heuristic: prefer weak, nearby, fast-growing targets
         def target_score(target):
-            distance = source.position.distance(target.position)
+            distance = distances[target.id]
             ship_strength = target.n_ships if target.owner == Player.Neutral else target.n_ships * 1.5
             return ship_strength + distance - 2 * target.growth_rate
 
         target = min(candidate_targets, key=target_score)
 
         # Estimate whether the attack would succeed
-        distance = source.position.distance(target.position)
-        eta = distance / self.params.transporter_speed
+        eta = self.spatial.eta_rows[source.id][target.id]
         estimated_defense = target.n_ships + target.growth_rate * eta
 
         if source.n_ships <= estimated_defense:
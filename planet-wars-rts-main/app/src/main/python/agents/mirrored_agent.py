@@ -0,0 +1,86 @@
+from typing import Optional
+
+import numpy as np
+
+from agents.batch_agent import BatchPlanetWarsAgent
+from agents.planet_wars_agent import PlanetWarsAgent, DEFAULT_OPPONENT
+from core.batch_forward_model import BatchGameState, BatchActions
+from core.game_state import GameState, Action, Player, GameParams
+from core.symmetry import mirror_action, mirror_arrays, mirror_batch_actions
+
+
+class MirroredAgent(PlanetWarsAgent):
+    """
+    Lets an agent written, trained or tuned as one seat play either: in the other seat it is shown
+    the mirrored game (see GameState.mirrored) and its actions are mirrored back.
+    """
+
+    def __init__(self, agent: PlanetWarsAgent, seat: Player = Player.Player1):
+        self.agent = agent
+        self.seat = seat
+        self.params = GameParams()
+        self.mirror = False
+
+    def prepare_to_play_as(
+        self,
+        player: Player,
+        params: GameParams,
+        opponent: Optional[str] = DEFAULT_OPPONENT
+    ) -> str:
+        self.params = params
+        self.mirror = player != self.seat
+        self.agent.prepare_to_play_as(self.seat, params, opponent)
+        return self.get_agent_type()
+
+    def get_action(self, game_state: GameState) -> Action:
+        if not self.mirror:
+            return self.agent.get_action(game_state)
+        action = self.agent.get_action(game_state.mirrored(self.params))
+        return mirror_action(action, len(game_state.planets))
+
+    def process_game_over(self, final_state: GameState) -> None:
+        self.agent.process_game_over(final_state.mirrored(self.params) if self.mirror else final_state)
+
+    def get_agent_type(self) -> str:
+        return self.agent.get_agent_type()
+
+
+class MirroredBatchAgent(BatchPlanetWarsAgent):
+    """MirroredAgent for a BatchPlanetWarsAgent, mirroring the whole batch at once."""
+
+    def __init__(self, agent: BatchPlanetWarsAgent, seat: Player = Player.Player1):
+        super().__init__()
+        self.agent = agent
+        self.seat = seat
+        self.mirror = False
+
+    def prepare_to_play_as(
+        self,
+        player: Player,
+        params: GameParams,
+        opponent: Optional[str] = DEFAULT_OPPONENT
+    ) -> str:
+        super().prepare_to_play_as(player, params, opponent)
+        self.mirror = player != self.seat
+        self.agent.prepare_to_play_as(self.seat, params, opponent)
+        return self.get_agent_type()
+
+    def get_batch_action(self, state: BatchGameState, live: np.ndarray) -> BatchActions:
+        if not self.mirror:
+            return self.agent.get_batch_action(state, live)
+        actions = self.agent.get_batch_action(mirror_arrays(state, self.params), live)
+        return mirror_batch_actions(actions, state.n_planets)
+
+    def get_agent_type(self) -> str:
+        return self.agent.get_agent_type()
+
+
+if __name__ == "__main__":
+    from agents.greedy_heuristic_agent import GreedyHeuristicAgent
+    from core.game_runner import GameRunner
+
+    # the greedy agent only ever plays as Player1 here, but takes both seats
+    game_params = GameParams(num_planets=20)
+    runner = GameRunner(MirroredAgent(GreedyHeuristicAgent()), MirroredAgent(GreedyHeuristicAgent()),
+                        game_params, seed=3)
+    print(runner.run_games(10))
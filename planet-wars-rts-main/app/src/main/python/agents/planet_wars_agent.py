@@ -2,6 +2,8 @@ from abc import ABC, abstractmethod
 from typing import Optional
 
 from core.game_state import GameParams, GameState, Player, Action
+from core.observation import Observation
+from core.spatial_index import SpatialIndex
 
 
 DEFAULT_OPPONENT = "Anon"
@@ -35,6 +37,9 @@ class PlanetWarsPlayer(PlanetWarsAgent):
     def __init__(self):
         self.player: Player = Player.Neutral
         self.params: GameParams = GameParams()
+        self.spatial: Optional[SpatialIndex] = None
+        # the planets list the index was last checked against
+        self.spatial_planets = None
 
     def prepare_to_play_as(
         self,
@@ -44,4 +49,62 @@ class PlanetWarsPlayer(PlanetWarsAgent):
     ) -> str:
         self.player = player
         self.params = params
+        self.spatial = None
+        self.spatial_planets = None
         return self.get_agent_type()
+
+    def spatial_index(self, game_state: GameState) -> SpatialIndex:
+        """
+        The SpatialIndex of game_state's map. It is kept while the agent is shown the same map, even when
+        every tick brings a new GameState, and rebuilt as soon as the planets' positions differ, so one
+        agent can be asked about several maps in turn.
+        """
+        planets = game_state.planets
+        # the live state keeps its planets list from tick to tick, so positions are only compared on a new one
+        if planets is not self.spatial_planets:
+            if self.spatial is None or self.spatial.transporter_speed != self.params.transporter_speed \
+                    or not self.spatial.matches(planets):
+                self.spatial = game_state.spatial_index(self.params.transporter_speed)
+            self.spatial_planets = planets
+        return self.spatial
+
+
+# === Partially observable agent interface, as PartialObservationAgent in AgentInterfaces.kt ===
+class PartialObservationAgent(ABC):
+
+    @abstractmethod
+    def get_action(self, observation: Observation) -> Action:
+        pass
+
+    @abstractmethod
+    def get_agent_type(self) -> str:
+        pass
+
+    def prepare_to_play_as(
+        self,
+        player: Player,
+        params: GameParams,
+        opponent: Optional[str] = DEFAULT_OPPONENT
+    ) -> str:
+        return self.get_agent_type()
+
+    # the final state is fully observable, so agents can learn from it
+    def process_game_over(self, final_state: GameState) -> None:
+        pass
+
+
+class PartialObservationPlayer(PartialObservationAgent):
+    def __init__(self):
+        self.player: Player = Player.Neutral
+        self.params: GameParams = GameParams()
+
+    def prepare_to_play_as(
+        self,
+        player: Player,
+        params: GameParams,
+        opponent: Optional[str] = DEFAULT_OPPONENT
+    ) -> str:
+        self.player = player
+        self.params = params
+        return self.get_agent_type()
+
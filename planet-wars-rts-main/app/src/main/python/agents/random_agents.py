@@ -1,9 +1,15 @@
 import random
 from typing import Optional
 
-from agents.planet_wars_agent import PlanetWarsPlayer
+import numpy as np
+
+from agents.batch_agent import BatchPlanetWarsAgent
+from agents.planet_wars_agent import PlanetWarsPlayer, PartialObservationPlayer
+from core.array_forward_model import PLAYER_CODES
+from core.batch_forward_model import BatchGameState, BatchActions
 from core.game_state import GameState, Action, Player, GameParams
 from core.game_state_factory import GameStateFactory
+from core.observation import Observation
 
 class PureRandomAgent(PlanetWarsPlayer):
     """
@@ -53,6 +59,69 @@ class CarefulRandomAgent(PlanetWarsPlayer):
         return "Careful Random Agent"
 
 
+class PartialObservationBetterRandomAgent(PartialObservationPlayer):
+    """
+    Port of the Kotlin PartialObservationBetterRandomAgent: a random idle planet of ours
+    sends half its ships, which we can see as we own it, to a random neutral or opponent planet.
+    """
+    def get_action(self, observation: Observation) -> Action:
+        my_planets = [p for p in observation.observed_planets if p.owner == self.player and p.transporter is None]
+        if not my_planets:
+            return Action.do_nothing()
+
+        other_planets = [p for p in observation.observed_planets
+                         if p.owner == self.player.opponent() or p.owner == Player.Neutral]
+        if not other_planets:
+            return Action.do_nothing()
+
+        source = random.choice(my_planets)
+        target = random.choice(other_planets)
+        if source.n_ships is None:
+            return Action.do_nothing()
+
+        return Action(
+            player_id=self.player,
+            source_planet_id=source.id,
+            destination_planet_id=target.id,
+            num_ships=source.n_ships / 2
+        )
+
+    def get_agent_type(self) -> str:
+        return "Partial Observation Better Random Agent"
+
+
+class BatchCarefulRandomAgent(BatchPlanetWarsAgent):
+    """
+    CarefulRandomAgent for every game of a batch at once: a random idle planet of ours
+    sends half its ships to a random opponent planet.
+    """
+    def __init__(self, seed: Optional[int] = None):
+        super().__init__()
+        self.rng = np.random.default_rng(seed)
+
+    def get_batch_action(self, state: BatchGameState, live: np.ndarray) -> BatchActions:
+        me = PLAYER_CODES[self.player]
+        opponent = PLAYER_CODES[self.player.opponent()]
+        sources = self.pick_random(live[:, None] & (state.owner == me) & ~state.t_active)
+        targets = self.pick_random(live[:, None] & (state.owner == opponent))
+
+        actions = BatchActions.do_nothing(state.batch_size)
+        games = np.flatnonzero((sources >= 0) & (targets >= 0))
+        actions.source[games] = sources[games]
+        actions.destination[games] = targets[games]
+        actions.num_ships[games] = state.ships[games, sources[games]] / 2
+        return actions
+
+    def pick_random(self, candidates: np.ndarray) -> np.ndarray:
+        # uniform choice per row among the candidate planets, -1 where there are none
+        keys = np.where(candidates, self.rng.random(candidates.shape), -1.0)
+        choice = keys.argmax(axis=1)
+        return np.where(candidates.any(axis=1), choice, -1)
+
+    def get_agent_type(self) -> str:
+        return "Batch Careful Random Agent"
+
+
 # Example usage
 if __name__ == "__main__":
     agent = CarefulRandomAgent()
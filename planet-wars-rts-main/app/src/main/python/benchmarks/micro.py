@@ -0,0 +1,108 @@
+"""
+Micro-benchmarks of the Python engine and the bundled agents.
+
+    python -m benchmarks.micro --output results.json
+    python -m benchmarks.micro --baseline results.json --tolerance 0.25
+
+With --baseline the run fails (exit status 1) if any benchmark is slower than the baseline
+by more than the tolerance. Baselines are machine specific: record one on the machine that
+runs the comparison.
+"""
+import argparse
+import json
+import random
+import sys
+from typing import Callable, Dict, Iterator, Tuple
+
+from agents.defensive_agent import DefensiveTurtleAgent
+from agents.greedy_heuristic_agent import GreedyHeuristicAgent
+from agents.random_agents import CarefulRandomAgent, PureRandomAgent
+from benchmarks.timing import compare, load_results, save_results, time_call
+from benchmarks.workloads import make_state, scaled_params
+from client_server.util import deserialize_args, serialize_result
+from core.forward_model import ForwardModel
+from core.game_state import Player
+from core.game_state_factory import GameStateFactory
+
+PLANET_COUNTS = (10, 50, 200)
+QUICK_PLANET_COUNTS = (10, 50)
+DENSITIES = (0.0, 0.5, 1.0)
+AGENTS = (PureRandomAgent, CarefulRandomAgent, GreedyHeuristicAgent, DefensiveTurtleAgent)
+
+Benchmark = Tuple[str, Callable, Callable]
+
+
+def benchmarks(planet_counts) -> Iterator[Benchmark]:
+    for n in planet_counts:
+        params = scaled_params(n)
+        seeds = iter(range(1 << 30))
+        yield (f"game_state_factory.create_game[planets={n}]",
+               lambda seed: GameStateFactory(params, seed).create_game(),
+               lambda: next(seeds))
+
+        for density in DENSITIES:
+            tag = f"planets={n},density={density}"
+            state = make_state(params, density)
+
+            def fresh_model(state=state, params=params):
+                return ForwardModel(state.fast_clone(), params)
+
+            yield f"forward_model.step[{tag}]", lambda model: model.step({}), fresh_model
+            yield f"game_state.model_copy_deep[{tag}]", lambda _, state=state: state.model_copy(deep=True), None
+            yield f"client_server.json_round_trip[{tag}]", lambda _, state=state: json_round_trip(state), None
+
+            for agent_class in AGENTS:
+                agent = agent_class()
+                agent.prepare_to_play_as(Player.Player1, params)
+                yield (f"agent.get_action[{agent_class.__name__},{tag}]",
+                       lambda _, agent=agent, state=state: agent.get_action(state), None)
+
+
+def json_round_trip(state):
+    # what an agent server does with a get_action request: parse JSON, validate, and reply
+    text = json.dumps(serialize_result(state))
+    return deserialize_args("get_action", [json.loads(text)])[0]
+
+
+def run(planet_counts, name_filter: str = "", min_time: float = 0.2) -> Dict[str, Dict[str, float]]:
+    random.seed(0)
+    results = {}
+    for name, run_call, prepare in benchmarks(planet_counts):
+        if name_filter not in name:
+            continue
+        try:
+            results[name] = time_call(run_call, prepare, min_time=min_time)
+            print(f"{name:<75} {results[name]['median_us']:>12.2f} us")
+        except Exception as e:
+            results[name] = {"error": f"{type(e).__name__}: {e}"}
+            print(f"{name:<75} failed: {results[name]['error']}")
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Planet Wars engine micro-benchmarks")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    parser.add_argument("--baseline", help="Compare against results previously written with --output")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed slowdown against the baseline, as a fraction (default: 0.25)")
+    parser.add_argument("--filter", default="", help="Only run benchmarks whose name contains this")
+    parser.add_argument("--quick", action="store_true", help="Smaller maps and shorter timings")
+    args = parser.parse_args(argv)
+
+    results = run(QUICK_PLANET_COUNTS if args.quick else PLANET_COUNTS, args.filter,
+                  min_time=0.05 if args.quick else 0.2)
+    if args.output:
+        save_results(results, args.output)
+    if args.baseline:
+        regressions = compare(results, load_results(args.baseline), args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.tolerance:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"\nNo regressions beyond {args.tolerance:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
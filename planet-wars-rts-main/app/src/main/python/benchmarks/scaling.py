@@ -0,0 +1,181 @@
+"""
+Scaling sweep: full games over a grid of map sizes and game lengths.
+
+    python -m benchmarks.scaling --planets 10 50 200 1000 --max-ticks 2000 20000 --output scaling.json
+
+For every configuration it records ticks per second, peak RSS, the peak memory allocated within a tick and
+the time per tick of each ForwardModel phase and of each agent's get_action. A log-log fit of
+those times against the number of planets then shows how each of them scales: a slope near 1
+is linear, near 2 quadratic. Each configuration runs in a fresh process so peak RSS is its own.
+"""
+import argparse
+import json
+import random
+import resource
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List
+
+import numpy as np
+
+from agents.defensive_agent import DefensiveTurtleAgent
+from agents.greedy_heuristic_agent import GreedyHeuristicAgent
+from agents.random_agents import CarefulRandomAgent, PureRandomAgent
+from benchmarks.timing import machine_info
+from benchmarks.workloads import scaled_params
+from core.forward_model import ForwardModel
+from core.game_state import Player
+from core.game_state_factory import GameStateFactory
+
+AGENTS = {cls.__name__: cls for cls in (PureRandomAgent, CarefulRandomAgent, GreedyHeuristicAgent,
+                                        DefensiveTurtleAgent)}
+PHASES = ("apply_actions", "update_transporters", "update_planets")
+
+# ticks replayed under tracemalloc after the timed game, which would otherwise be slowed down by it
+TRACED_TICKS = 100
+
+
+class PhaseTimedForwardModel(ForwardModel):
+    """ForwardModel that adds up the time spent in each phase of step."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.phase_time = {phase: 0.0 for phase in PHASES}
+
+    def apply_actions(self, actions):
+        t0 = time.perf_counter()
+        super().apply_actions(actions)
+        self.phase_time["apply_actions"] += time.perf_counter() - t0
+
+    def update_transporters(self, pending):
+        t0 = time.perf_counter()
+        super().update_transporters(pending)
+        self.phase_time["update_transporters"] += time.perf_counter() - t0
+
+    def update_planets(self, pending):
+        t0 = time.perf_counter()
+        super().update_planets(pending)
+        self.phase_time["update_planets"] += time.perf_counter() - t0
+
+
+def play(model: ForwardModel, agents: Dict[Player, object], n_ticks: int, play_on: bool,
+         agent_time: Dict[Player, float]) -> int:
+    ticks = 0
+    while ticks < n_ticks and (play_on or not model.is_terminal()):
+        actions = {}
+        for player, agent in agents.items():
+            t0 = time.perf_counter()
+            actions[player] = agent.get_action(model.state)
+            agent_time[player] += time.perf_counter() - t0
+        model.step(actions)
+        ticks += 1
+    return ticks
+
+
+def new_agents(agent_names: List[str], params, seed: int) -> Dict[Player, object]:
+    """Freshly prepared agents, with the global random generator they draw from seeded, so every call plays alike."""
+    random.seed(seed)
+    agents = {Player.Player1: AGENTS[agent_names[0]](), Player.Player2: AGENTS[agent_names[1]]()}
+    for player, agent in agents.items():
+        agent.prepare_to_play_as(player, params)
+    return agents
+
+
+def run_config(num_planets: int, max_ticks: int, agent_names: List[str], seed: int, play_on: bool) -> dict:
+    """Plays one game and measures it; meant to run in a fresh worker process."""
+    params = scaled_params(num_planets, max_ticks=max_ticks)
+    initial = GameStateFactory(params, seed).create_game()
+    agents = new_agents(agent_names, params, seed)
+
+    model = PhaseTimedForwardModel(initial.model_copy(deep=True), params)
+    agent_time = {player: 0.0 for player in agents}
+    t0 = time.perf_counter()
+    ticks = play(model, agents, max_ticks, play_on, agent_time)
+    elapsed = time.perf_counter() - t0
+
+    # how far traced memory rises above its level at the start of a tick, at its highest, averaged over
+    # the first ticks of the game replayed under tracemalloc by fresh agents seeded as for the timed run;
+    # it is a number of bytes, not a count of allocations
+    traced = PhaseTimedForwardModel(initial.model_copy(deep=True), params)
+    agents = new_agents(agent_names, params, seed)
+    peaks = []
+    tracemalloc.start()
+    for _ in range(min(TRACED_TICKS, ticks)):
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        play(traced, agents, 1, True, {player: 0.0 for player in agents})
+        peaks.append(tracemalloc.get_traced_memory()[1] - before)
+    tracemalloc.stop()
+
+    per_tick = max(ticks, 1)
+    return {
+        "num_planets": num_planets,
+        "max_ticks": max_ticks,
+        "ticks": ticks,
+        "ticks_per_second": ticks / elapsed if elapsed > 0 else 0.0,
+        "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "peak_alloc_bytes_per_tick": float(np.mean(peaks)) if peaks else 0.0,
+        "phase_us_per_tick": {phase: t * 1e6 / per_tick for phase, t in model.phase_time.items()},
+        "agent_us_per_call": {f"{player.value}:{agent_names[i]}": agent_time[player] * 1e6 / per_tick
+                              for i, player in enumerate(agents)},
+    }
+
+
+def fit_slopes(runs: List[dict]) -> Dict[int, Dict[str, float]]:
+    """Per game length, the slope of log(time per tick) against log(num_planets) for each phase and agent."""
+    slopes = {}
+    for max_ticks in sorted({run["max_ticks"] for run in runs}):
+        group = sorted((run for run in runs if run["max_ticks"] == max_ticks), key=lambda r: r["num_planets"])
+        if len(group) < 2:
+            continue
+        n = np.log([run["num_planets"] for run in group])
+        series = {f"phase:{p}": [run["phase_us_per_tick"][p] for run in group] for p in PHASES}
+        for key in group[0]["agent_us_per_call"]:
+            series[f"agent:{key}"] = [run["agent_us_per_call"][key] for run in group]
+        slopes[max_ticks] = {
+            name: float(np.polyfit(n, np.log(np.maximum(values, 1e-3)), 1)[0])
+            for name, values in series.items()
+        }
+    return slopes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Planet Wars scaling sweep")
+    parser.add_argument("--planets", type=int, nargs="+", default=[10, 50, 200, 1000])
+    parser.add_argument("--max-ticks", type=int, nargs="+", default=[2000])
+    parser.add_argument("--agents", nargs=2, default=["GreedyHeuristicAgent", "CarefulRandomAgent"],
+                        choices=sorted(AGENTS), metavar="AGENT", help=f"Two of: {', '.join(sorted(AGENTS))}")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--play-on", action="store_true",
+                        help="Keep stepping until max ticks even after a player has been wiped out")
+    parser.add_argument("--output", help="Write runs and fitted slopes as JSON to this file")
+    args = parser.parse_args(argv)
+
+    runs = []
+    for max_ticks in args.max_ticks:
+        for num_planets in args.planets:
+            with ProcessPoolExecutor(max_workers=1) as pool:
+                run = pool.submit(run_config, num_planets, max_ticks, args.agents, args.seed, args.play_on).result()
+            runs.append(run)
+            phases = ", ".join(f"{p} {t:.1f}" for p, t in run["phase_us_per_tick"].items())
+            agents = ", ".join(f"{a} {t:.1f}" for a, t in run["agent_us_per_call"].items())
+            print(f"planets={num_planets} max_ticks={max_ticks}: {run['ticks']} ticks, "
+                  f"{run['ticks_per_second']:.0f} ticks/s, peak RSS {run['peak_rss_kb'] / 1024:.0f} MB, "
+                  f"{run['peak_alloc_bytes_per_tick'] / 1024:.1f} KB peak allocation per tick")
+            print(f"    us per tick: {phases}; agents: {agents}")
+
+    slopes = fit_slopes(runs)
+    for max_ticks, fitted in slopes.items():
+        print(f"\nlog-log slope against num_planets (max_ticks={max_ticks}):")
+        for name, slope in fitted.items():
+            flag = "  <- superlinear" if slope > 1.5 else ""
+            print(f"    {name:<45} {slope:5.2f}{flag}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"machine": machine_info(), "runs": runs, "slopes": slopes}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import json
+import platform
+import statistics
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+
+def time_call(run: Callable[[Any], Any], prepare: Optional[Callable[[], Any]] = None,
+              min_time: float = 0.2, repeat: int = 5) -> Dict[str, float]:
+    """
+    Times run(prepare()) and returns per-call microseconds: the median and minimum over repeat batches.
+    prepare is called outside the timed region, once per call, so run can consume its argument
+    (e.g. step a fresh model). The batch size grows until a batch takes min_time / repeat.
+    """
+    prepare = prepare or (lambda: None)
+
+    def batch(number: int) -> float:
+        args = [prepare() for _ in range(number)]
+        t0 = time.perf_counter()
+        for arg in args:
+            run(arg)
+        return time.perf_counter() - t0
+
+    number = 1
+    while True:
+        elapsed = batch(number)
+        if elapsed >= min_time / repeat or number >= 1 << 20:
+            break
+        number *= 2 if elapsed == 0 else max(2, min(10, int(min_time / repeat / elapsed) + 1))
+    per_call = [batch(number) / number * 1e6 for _ in range(repeat)]
+    return {"median_us": statistics.median(per_call), "min_us": min(per_call), "number": number}
+
+
+def machine_info() -> Dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "system": platform.system(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def save_results(results: Dict[str, Dict[str, float]], path: Path):
+    Path(path).write_text(json.dumps({"machine": machine_info(), "results": results}, indent=2))
+
+
+def load_results(path: Path) -> Dict[str, Dict[str, float]]:
+    return json.loads(Path(path).read_text())["results"]
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+            tolerance: float) -> List[str]:
+    """
+    Lists the benchmarks whose median is more than tolerance (a fraction) slower than in the baseline.
+    Benchmarks missing on either side, or that failed there (no median, or not a positive one), are not compared.
+    """
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get(name, {}).get("median_us")
+        after = result.get("median_us")
+        if before is None or after is None or before <= 0:
+            continue
+        if after > before * (1 + tolerance):
+            regressions.append(f"{name}: {before:.2f} us -> {after:.2f} us ({after / before - 1:+.0%})")
+    return regressions
@@ -0,0 +1,39 @@
+import math
+import random
+
+from core.forward_model import ForwardModel
+from core.game_state import GameParams, GameState, Player, Action
+from core.game_state_factory import GameStateFactory
+
+
+def scaled_params(num_planets: int, **overrides) -> GameParams:
+    """Default GameParams with the map grown in proportion to the planet count, so large maps stay feasible."""
+    scale = max(1.0, math.sqrt(num_planets / GameParams().num_planets))
+    params = GameParams(
+        num_planets=num_planets,
+        width=int(GameParams().width * scale),
+        height=int(GameParams().height * scale),
+    )
+    return params.model_copy(update=overrides)
+
+
+def make_state(params: GameParams, density: float, seed: int = 0) -> GameState:
+    """
+    A fresh map on which a fraction density of the players' planets have a transporter in flight,
+    launched through the ForwardModel towards random planets with half their ships.
+    """
+    rng = random.Random(seed)
+    state = GameStateFactory(params, seed).create_game()
+    model = ForwardModel(state, params)
+    for planet in state.planets:
+        if planet.owner != Player.Neutral and rng.random() < density:
+            target = rng.randrange(len(state.planets))
+            if target == planet.id:
+                target = (target + 1) % len(state.planets)
+            model.apply_actions({planet.owner: Action(
+                player_id=planet.owner,
+                source_planet_id=planet.id,
+                destination_planet_id=target,
+                num_ships=planet.n_ships / 2
+            )})
+    return state
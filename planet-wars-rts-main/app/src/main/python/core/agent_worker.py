@@ -0,0 +1,63 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError
+from typing import Any, Callable, Optional, Tuple
+
+
+class AgentWorker:
+    """
+    A daemon thread that runs one seat's agent calls, so the caller can stop waiting for them.
+    Calls are never cancelled: like the Kotlin GameRunnerCoRoutines, a late call keeps running
+    in the background and its result is thrown away. The next call starts once it has finished,
+    so a late call eats into the following call's budget, and an agent that never returns times
+    out on every move without stalling the game. While a late call runs it also competes for the
+    GIL with everything else in the process, including the other seat's calls, which are slowed
+    down and timed as slower. Being a daemon, a stuck thread does not keep the interpreter from
+    exiting; close() ends the thread once any call in progress returns.
+    """
+
+    def __init__(self, name: str):
+        self.tasks: queue.SimpleQueue = queue.SimpleQueue()
+        self.pending: Optional[Future] = None
+        self.thread = threading.Thread(target=self.run, name=name, daemon=True)
+        self.thread.start()
+
+    def run(self):
+        while True:
+            task = self.tasks.get()
+            if task is None:
+                return
+            future, fn, args = task
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(*args))
+            except BaseException as e:
+                future.set_exception(e)
+
+    def call(self, timeout: float, fn: Callable[..., Any], *args: Any) -> Tuple[bool, Any]:
+        """
+        Runs fn(*args) and waits at most timeout seconds for it, including any wait for a late
+        previous call. Returns (True, result), or (False, None) if it did not finish in time.
+        Exceptions raised by fn in time are re-raised here.
+        """
+        deadline = time.perf_counter() + timeout
+        if self.pending is not None:
+            try:
+                # the previous call's own outcome, exception or not, no longer matters
+                self.pending.exception(timeout=timeout)
+            except TimeoutError:
+                return False, None
+        future: Future = Future()
+        self.pending = future
+        self.tasks.put((future, fn, args))
+        try:
+            return True, future.result(timeout=max(0.0, deadline - time.perf_counter()))
+        except TimeoutError:
+            return False, None
+
+    def close(self):
+        """Stops the thread after the call in progress, if any; does not wait for it."""
+        self.tasks.put(None)
+        self.pending = None
@@ -0,0 +1,437 @@
+import heapq
+import math
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from core.game_state import GameState, GameParams, Player, Action, Planet, Transporter, Vec2d
+
+
+# Small integer codes used for ownership in the array-backed engine
+NEUTRAL = 0
+PLAYER1 = 1
+PLAYER2 = 2
+
+PLAYER_CODES: Dict[Player, int] = {Player.Neutral: NEUTRAL, Player.Player1: PLAYER1, Player.Player2: PLAYER2}
+CODE_PLAYERS: List[Player] = [Player.Neutral, Player.Player1, Player.Player2]
+
+# arrival tick of a transporter that will never reach its destination
+NO_ARRIVAL = np.iinfo(np.int64).max
+# number of ticks fast-forwarded per vectorized block, bounds the scratch memory
+FAST_FORWARD_BLOCK = 256
+
+
+class ArrayGameState:
+    """
+    Struct-of-arrays version of a GameState.
+    Each planet can have at most one transporter in flight, so transporter slot i
+    belongs to planet i (its source), exactly as Planet.transporter does.
+    Planet geometry (x, y, radius, growth) never changes during a game and is shared by copies.
+    """
+
+    def __init__(self, n_planets: int):
+        # planets
+        self.owner = np.zeros(n_planets, dtype=np.int8)
+        self.ships = np.zeros(n_planets, dtype=np.float64)
+        self.growth = np.zeros(n_planets, dtype=np.float64)
+        self.radius = np.zeros(n_planets, dtype=np.float64)
+        self.x = np.zeros(n_planets, dtype=np.float64)
+        self.y = np.zeros(n_planets, dtype=np.float64)
+        # transporters, indexed by source planet
+        self.t_active = np.zeros(n_planets, dtype=bool)
+        self.t_owner = np.zeros(n_planets, dtype=np.int8)
+        self.t_x = np.zeros(n_planets, dtype=np.float64)
+        self.t_y = np.zeros(n_planets, dtype=np.float64)
+        self.t_vx = np.zeros(n_planets, dtype=np.float64)
+        self.t_vy = np.zeros(n_planets, dtype=np.float64)
+        self.t_dest = np.full(n_planets, -1, dtype=np.int32)
+        self.t_ships = np.zeros(n_planets, dtype=np.float64)
+        self.game_tick = 0
+
+    @property
+    def n_planets(self) -> int:
+        return len(self.owner)
+
+    @staticmethod
+    def from_game_state(state: GameState) -> 'ArrayGameState':
+        arrays = ArrayGameState(len(state.planets))
+        for i, planet in enumerate(state.planets):
+            arrays.owner[i] = PLAYER_CODES[planet.owner]
+            arrays.ships[i] = planet.n_ships
+            arrays.growth[i] = planet.growth_rate
+            arrays.radius[i] = planet.radius
+            arrays.x[i] = planet.position.x
+            arrays.y[i] = planet.position.y
+            transporter = planet.transporter
+            if transporter is not None:
+                arrays.t_active[i] = True
+                arrays.t_owner[i] = PLAYER_CODES[transporter.owner]
+                arrays.t_x[i] = transporter.s.x
+                arrays.t_y[i] = transporter.s.y
+                arrays.t_vx[i] = transporter.v.x
+                arrays.t_vy[i] = transporter.v.y
+                arrays.t_dest[i] = transporter.destination_index
+                arrays.t_ships[i] = transporter.n_ships
+        arrays.game_tick = state.game_tick
+        return arrays
+
+    def to_game_state(self) -> GameState:
+        planets = []
+        for i in range(self.n_planets):
+            transporter = None
+            if self.t_active[i]:
+                transporter = Transporter(
+                    s=Vec2d(x=float(self.t_x[i]), y=float(self.t_y[i])),
+                    v=Vec2d(x=float(self.t_vx[i]), y=float(self.t_vy[i])),
+                    owner=CODE_PLAYERS[self.t_owner[i]],
+                    source_index=i,
+                    destination_index=int(self.t_dest[i]),
+                    n_ships=float(self.t_ships[i])
+                )
+            planets.append(Planet(
+                owner=CODE_PLAYERS[self.owner[i]],
+                n_ships=float(self.ships[i]),
+                position=Vec2d(x=float(self.x[i]), y=float(self.y[i])),
+                growth_rate=float(self.growth[i]),
+                radius=float(self.radius[i]),
+                transporter=transporter,
+                id=i
+            ))
+        return GameState(planets=planets, game_tick=self.game_tick)
+
+    def copy(self) -> 'ArrayGameState':
+        clone = ArrayGameState.__new__(ArrayGameState)
+        # static geometry is shared, everything that changes per tick is copied
+        clone.growth = self.growth
+        clone.radius = self.radius
+        clone.x = self.x
+        clone.y = self.y
+        clone.owner = self.owner.copy()
+        clone.ships = self.ships.copy()
+        clone.t_active = self.t_active.copy()
+        clone.t_owner = self.t_owner.copy()
+        clone.t_x = self.t_x.copy()
+        clone.t_y = self.t_y.copy()
+        clone.t_vx = self.t_vx.copy()
+        clone.t_vy = self.t_vy.copy()
+        clone.t_dest = self.t_dest.copy()
+        clone.t_ships = self.t_ships.copy()
+        clone.game_tick = self.game_tick
+        return clone
+
+
+class ArrayForwardModel:
+    """
+    Drop-in alternative to ForwardModel that steps an ArrayGameState.
+    Every floating point operation is done in the same order as ForwardModel,
+    so both engines produce bit-identical states tick for tick.
+    The model owns the state: anything derived from it (per-slot destination
+    geometry, growth mask, planet counts, arrival schedule) is cached here and refreshed by sync().
+
+    The tick at which each transporter will land is worked out when it is launched and kept
+    in a priority queue, which lets advance_until_next_event() skip over the quiet ticks in
+    between when neither player acts.
+    """
+
+    def __init__(self, state: ArrayGameState, params: GameParams):
+        self.state = state
+        self.params = params
+        n = state.n_planets
+        # scratch buffers reused every tick to avoid allocations
+        self._dx = np.zeros(n, dtype=np.float64)
+        self._dy = np.zeros(n, dtype=np.float64)
+        self._arrived = np.zeros(n, dtype=bool)
+        self.sync()
+
+    def sync(self):
+        """Rebuilds the cached views of the state; call after editing the state by hand."""
+        state = self.state
+        dest = np.where(state.t_active, state.t_dest, 0)
+        self._dest_x = state.x[dest]
+        self._dest_y = state.y[dest]
+        self._dest_radius = np.where(state.t_active, state.radius[dest], 0.0)
+        self.n_in_flight = int(np.count_nonzero(state.t_active))
+        self._arrival_tick = np.full(state.n_planets, NO_ARRIVAL, dtype=np.int64)
+        self._arrivals: List[Tuple[int, int]] = []
+        for slot in np.flatnonzero(state.t_active).tolist():
+            self._schedule_arrival(slot, state.game_tick)
+        self._sync_owners()
+
+    def _sync_owners(self):
+        # growth is added as ships + growth * 1.0 on owned planets and ships + 0.0 on
+        # neutral ones, which is exactly the same as only updating the owned planets
+        self._grow = self.state.growth * (self.state.owner != NEUTRAL)
+        self._planet_counts = np.bincount(self.state.owner, minlength=3).tolist()
+
+    @staticmethod
+    def from_game_state(state: GameState, params: GameParams) -> 'ArrayForwardModel':
+        return ArrayForwardModel(ArrayGameState.from_game_state(state), params)
+
+    def to_game_state(self) -> GameState:
+        return self.state.to_game_state()
+
+    def step(self, actions: Dict[Player, Action]):
+        self.apply_actions(actions)
+        pending = self.update_transporters()
+        self.update_planets(pending)
+        self.state.game_tick += 1
+
+    def apply_actions(self, actions: Dict[Player, Action]):
+        state = self.state
+        for player, action in actions.items():
+            if action is Action.DO_NOTHING or action == Action.DO_NOTHING:
+                continue
+            source = action.source_planet_id
+            target = action.destination_planet_id
+            if not state.t_active[source] and state.owner[source] == PLAYER_CODES[player] \
+                    and state.ships[source] >= action.num_ships:
+                state.ships[source] -= action.num_ships
+                # same arithmetic as (target - source).normalize() * speed on Vec2d
+                sx = state.x.item(source)
+                sy = state.y.item(source)
+                dx = state.x.item(target) - sx
+                dy = state.y.item(target) - sy
+                magnitude = math.sqrt(dx ** 2 + dy ** 2)
+                if magnitude > 0:
+                    scale = 1.0 / magnitude
+                    dx = dx * scale
+                    dy = dy * scale
+                state.t_active[source] = True
+                state.t_owner[source] = PLAYER_CODES[player]
+                state.t_x[source] = sx
+                state.t_y[source] = sy
+                state.t_vx[source] = dx * self.params.transporter_speed
+                state.t_vy[source] = dy * self.params.transporter_speed
+                state.t_dest[source] = target
+                state.t_ships[source] = action.num_ships
+                self._dest_x[source] = state.x[target]
+                self._dest_y[source] = state.y[target]
+                self._dest_radius[source] = state.radius[target]
+                self.n_in_flight += 1
+                self._schedule_arrival(source, state.game_tick)
+
+    def _schedule_arrival(self, slot: int, tick: int):
+        """
+        Finds the step in which the transporter in slot lands, given that its current
+        position is the one tested by the step that starts at tick.
+        The straight-line estimate (distance - radius) / speed bounds the search, and the exact
+        tick is then found on positions built by repeated addition, with the same distance test
+        as update_transporters, so it always agrees with per-tick stepping.
+        """
+        state = self.state
+        radius = self._dest_radius[slot]
+        distance = math.sqrt((state.t_x.item(slot) - self._dest_x.item(slot)) ** 2 +
+                             (state.t_y.item(slot) - self._dest_y.item(slot)) ** 2)
+        speed = math.sqrt(state.t_vx.item(slot) ** 2 + state.t_vy.item(slot) ** 2)
+        if speed == 0:
+            arrival = tick if distance < radius else NO_ARRIVAL
+        else:
+            # by the time it has covered distance + radius it has flown past the planet
+            n = int((distance + radius) / speed) + 2
+            xs = np.empty(n + 1)
+            ys = np.empty(n + 1)
+            xs[0] = state.t_x[slot]
+            xs[1:] = state.t_vx[slot]
+            ys[0] = state.t_y[slot]
+            ys[1:] = state.t_vy[slot]
+            np.cumsum(xs, out=xs)
+            np.cumsum(ys, out=ys)
+            xs -= self._dest_x[slot]
+            ys -= self._dest_y[slot]
+            hits = np.flatnonzero(np.sqrt(xs * xs + ys * ys) < radius)
+            arrival = tick + int(hits[0]) if hits.size else NO_ARRIVAL
+        self._arrival_tick[slot] = arrival
+        if arrival != NO_ARRIVAL:
+            heapq.heappush(self._arrivals, (arrival, slot))
+
+    def next_arrival_tick(self) -> int:
+        """Tick of the next step in which a transporter lands, or NO_ARRIVAL if none will."""
+        arrivals = self._arrivals
+        # entries for transporters that have already landed are dropped lazily
+        while arrivals and (not self.state.t_active[arrivals[0][1]]
+                            or self._arrival_tick[arrivals[0][1]] != arrivals[0][0]):
+            heapq.heappop(arrivals)
+        return arrivals[0][0] if arrivals else NO_ARRIVAL
+
+    def advance_until_next_event(self, max_ticks: int) -> int:
+        """
+        Advances the game, with both players doing nothing, up to and including the next
+        step in which a transporter lands, but by no more than max_ticks and never past the end
+        of the game. The quiet ticks before the landing are applied in one go: every transporter
+        moves and every owned planet grows exactly as repeated single steps would have done.
+        Returns the number of ticks advanced.
+        """
+        if max_ticks <= 0 or self.is_terminal():
+            return 0
+        state = self.state
+        # the game is over once game_tick passes params.max_ticks
+        ticks_left = self.params.max_ticks + 1 - state.game_tick
+        quiet = min(self.next_arrival_tick() - state.game_tick, max_ticks, ticks_left)
+        if quiet > 0:
+            self._fast_forward(quiet)
+        if quiet < max_ticks and quiet < ticks_left:
+            self.step({})
+            return quiet + 1
+        return quiet
+
+    def _fast_forward(self, n_ticks: int):
+        # cumulative sums add the per-tick increments one at a time, in order, so the result
+        # is the same as n_ticks separate additions rather than a single multiplication
+        state = self.state
+        values = np.stack([state.ships, state.t_x, state.t_y])
+        deltas = np.stack([self._grow, state.t_vx, state.t_vy])
+        while n_ticks > 0:
+            block = min(n_ticks, FAST_FORWARD_BLOCK)
+            acc = np.empty((block + 1,) + values.shape)
+            acc[0] = values
+            acc[1:] = deltas
+            np.cumsum(acc, axis=0, out=acc)
+            values = acc[-1]
+            n_ticks -= block
+            state.game_tick += block
+        state.ships[:] = values[0]
+        state.t_x[:] = values[1]
+        state.t_y[:] = values[2]
+
+    def update_transporters(self) -> Dict[int, List[float]]:
+        """
+        Moves or lands every transporter in flight.
+        Returns the pending ships per destination planet as [player1, player2],
+        accumulated in source planet order just like ForwardModel's pending dict.
+        """
+        pending: Dict[int, List[float]] = {}
+        if self.n_in_flight == 0:
+            return pending
+        state = self.state
+
+        # distance test on every slot at once; idle slots have radius 0 and never arrive
+        dx = np.subtract(state.t_x, self._dest_x, out=self._dx)
+        dy = np.subtract(state.t_y, self._dest_y, out=self._dy)
+        np.multiply(dx, dx, out=dx)
+        np.multiply(dy, dy, out=dy)
+        np.add(dx, dy, out=dx)
+        np.sqrt(dx, out=dx)
+        arrived = np.less(dx, self._dest_radius, out=self._arrived)
+        np.logical_and(arrived, state.t_active, out=arrived)
+
+        for slot in arrived.nonzero()[0].tolist():
+            dest = state.t_dest.item(slot)
+            incoming = pending.get(dest)
+            if incoming is None:
+                incoming = pending[dest] = [0.0, 0.0]
+            incoming[state.t_owner.item(slot) - PLAYER1] += state.t_ships.item(slot)
+            state.t_active[slot] = False
+            state.t_dest[slot] = -1
+            state.t_vx[slot] = 0.0
+            state.t_vy[slot] = 0.0
+            self._dest_radius[slot] = 0.0
+            self._arrival_tick[slot] = NO_ARRIVAL
+            self.n_in_flight -= 1
+
+        # landed and idle slots have zero velocity, so this only moves the others
+        np.add(state.t_x, state.t_vx, out=state.t_x)
+        np.add(state.t_y, state.t_vy, out=state.t_y)
+        return pending
+
+    def update_planets(self, pending: Dict[int, List[float]]):
+        state = self.state
+        owner_before = {planet_id: state.owner.item(planet_id) for planet_id in pending}
+
+        # player planets grow every tick, neutral ones never do
+        np.add(state.ships, self._grow, out=state.ships)
+
+        captured = False
+        for planet_id, (p1, p2) in pending.items():
+            owner = owner_before[planet_id]
+            ships = state.ships.item(planet_id)
+            if owner == NEUTRAL:
+                net = p1 - p2
+                ships -= abs(net)
+                if ships < 0:
+                    state.owner[planet_id] = PLAYER1 if net > 0 else PLAYER2
+                    ships = -ships
+                    captured = True
+            else:
+                ships += (p1 - p2) if owner == PLAYER1 else (p2 - p1)
+                if ships < 0:
+                    state.owner[planet_id] = PLAYER1 + PLAYER2 - owner
+                    ships = -ships
+                    captured = True
+            state.ships[planet_id] = ships
+        if captured:
+            self._sync_owners()
+
+    def is_terminal(self) -> bool:
+        if self.state.game_tick > self.params.max_ticks:
+            return True
+        return self._planet_counts[PLAYER1] == 0 or self._planet_counts[PLAYER2] == 0
+
+    def status_string(self) -> str:
+        return (
+            f"Game tick: {self.state.game_tick}; "
+            f"Player 1: {int(self.get_ships(Player.Player1))}; "
+            f"Player 2: {int(self.get_ships(Player.Player2))}; "
+            f"Leader: {self.get_leader().value}"
+        )
+
+    def get_ships(self, player: Player) -> float:
+        # summed left to right in planet order, exactly as ForwardModel.get_ships does
+        return sum(self.state.ships[self.state.owner == PLAYER_CODES[player]].tolist())
+
+    def get_leader(self) -> Player:
+        s1 = self.get_ships(Player.Player1)
+        s2 = self.get_ships(Player.Player2)
+        if s1 == s2:
+            return Player.Neutral
+        return Player.Player1 if s1 > s2 else Player.Player2
+
+
+if __name__ == "__main__":
+    # check the array engine against ForwardModel and compare their speed
+    import time
+    from core.forward_model import ForwardModel
+    from core.game_state_factory import GameStateFactory
+    from agents.random_agents import CarefulRandomAgent
+
+    params = GameParams(num_planets=20)
+    state = GameStateFactory(params).create_game()
+    model = ForwardModel(state.model_copy(deep=True), params)
+    array_model = ArrayForwardModel.from_game_state(state, params)
+    agent1 = CarefulRandomAgent()
+    agent2 = CarefulRandomAgent()
+    agent1.prepare_to_play_as(Player.Player1, params)
+    agent2.prepare_to_play_as(Player.Player2, params)
+
+    n_checked = 0
+    while not model.is_terminal():
+        actions = {
+            Player.Player1: agent1.get_action(model.state),
+            Player.Player2: agent2.get_action(model.state),
+        }
+        model.step(actions)
+        array_model.step(actions)
+        assert array_model.to_game_state() == model.state, f"Engines diverged at tick {model.state.game_tick}"
+        n_checked += 1
+    print(f"Identical for {n_checked} ticks; {model.status_string()}")
+
+    n_steps = 2000
+    model = ForwardModel(state.model_copy(deep=True), params)
+    t0 = time.perf_counter()
+    for _ in range(n_steps):
+        model.step({})
+    t1 = time.perf_counter()
+    array_model = ArrayForwardModel.from_game_state(state, params)
+    for _ in range(n_steps):
+        array_model.step({})
+    t2 = time.perf_counter()
+    print(f"ForwardModel:      {(t1 - t0) * 1e6 / n_steps:.1f} us per step")
+    print(f"ArrayForwardModel: {(t2 - t1) * 1e6 / n_steps:.1f} us per step")
+
+    # idle end-game: one call per landing instead of one per tick
+    array_model = ArrayForwardModel.from_game_state(state, params)
+    array_model.step({Player.Player1: agent1.get_action(state), Player.Player2: agent2.get_action(state)})
+    n_calls = 0
+    while not array_model.is_terminal():
+        array_model.advance_until_next_event(params.max_ticks)
+        n_calls += 1
+    print(f"Fast-forwarded to tick {array_model.state.game_tick} in {n_calls} calls")
@@ -0,0 +1,278 @@
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from core.array_forward_model import ArrayGameState, NEUTRAL, PLAYER1, PLAYER2, PLAYER_CODES, CODE_PLAYERS
+from core.game_state import GameState, GameParams, Player, Action
+
+
+class BatchActions:
+    """
+    One action per game for a single player.
+    A negative source planet id means the player does nothing in that game.
+    """
+
+    def __init__(self, source: np.ndarray, destination: np.ndarray, num_ships: np.ndarray):
+        self.source = np.asarray(source, dtype=np.int64)
+        self.destination = np.asarray(destination, dtype=np.int64)
+        self.num_ships = np.asarray(num_ships, dtype=np.float64)
+
+    @staticmethod
+    def do_nothing(batch_size: int) -> 'BatchActions':
+        return BatchActions(
+            np.full(batch_size, -1, dtype=np.int64),
+            np.full(batch_size, -1, dtype=np.int64),
+            np.zeros(batch_size, dtype=np.float64)
+        )
+
+    @staticmethod
+    def from_actions(actions: Sequence[Action]) -> 'BatchActions':
+        batch = BatchActions.do_nothing(len(actions))
+        for b, action in enumerate(actions):
+            if action is Action.DO_NOTHING or action == Action.DO_NOTHING:
+                continue
+            batch.source[b] = action.source_planet_id
+            batch.destination[b] = action.destination_planet_id
+            batch.num_ships[b] = action.num_ships
+        return batch
+
+
+class BatchGameState:
+    """
+    B independent games with the same number of planets, stored as [B, num_planets] arrays.
+    The layout follows ArrayGameState with a leading batch axis; game_tick is per game.
+    """
+
+    def __init__(self, batch_size: int, n_planets: int):
+        shape = (batch_size, n_planets)
+        self.owner = np.zeros(shape, dtype=np.int8)
+        self.ships = np.zeros(shape, dtype=np.float64)
+        self.growth = np.zeros(shape, dtype=np.float64)
+        self.radius = np.zeros(shape, dtype=np.float64)
+        self.x = np.zeros(shape, dtype=np.float64)
+        self.y = np.zeros(shape, dtype=np.float64)
+        self.t_active = np.zeros(shape, dtype=bool)
+        self.t_owner = np.zeros(shape, dtype=np.int8)
+        self.t_x = np.zeros(shape, dtype=np.float64)
+        self.t_y = np.zeros(shape, dtype=np.float64)
+        self.t_vx = np.zeros(shape, dtype=np.float64)
+        self.t_vy = np.zeros(shape, dtype=np.float64)
+        self.t_dest = np.full(shape, -1, dtype=np.int32)
+        self.t_ships = np.zeros(shape, dtype=np.float64)
+        self.game_tick = np.zeros(batch_size, dtype=np.int64)
+
+    ARRAY_FIELDS = ("owner", "ships", "growth", "radius", "x", "y",
+                    "t_active", "t_owner", "t_x", "t_y", "t_vx", "t_vy", "t_dest", "t_ships")
+
+    @property
+    def batch_size(self) -> int:
+        return self.owner.shape[0]
+
+    @property
+    def n_planets(self) -> int:
+        return self.owner.shape[1]
+
+    @staticmethod
+    def from_game_states(states: Sequence[GameState]) -> 'BatchGameState':
+        batch = BatchGameState(len(states), len(states[0].planets))
+        for b, state in enumerate(states):
+            batch.set_game(b, ArrayGameState.from_game_state(state))
+        return batch
+
+    def set_game(self, b: int, game: ArrayGameState):
+        if game.n_planets != self.n_planets:
+            raise ValueError(f"Expected {self.n_planets} planets, got {game.n_planets}")
+        for name in BatchGameState.ARRAY_FIELDS:
+            getattr(self, name)[b] = getattr(game, name)
+        self.game_tick[b] = game.game_tick
+
+    def get_game(self, b: int) -> ArrayGameState:
+        """Returns game b as an ArrayGameState whose arrays are views into this batch."""
+        game = ArrayGameState.__new__(ArrayGameState)
+        for name in BatchGameState.ARRAY_FIELDS:
+            setattr(game, name, getattr(self, name)[b])
+        game.game_tick = int(self.game_tick[b])
+        return game
+
+    def to_game_state(self, b: int) -> GameState:
+        return self.get_game(b).to_game_state()
+
+
+class BatchForwardModel:
+    """
+    Steps B games at once with the rules of ForwardModel, vectorized over the batch.
+    Each game produces the same states, bit for bit, as ForwardModel would on its own.
+    Games that are terminal at the start of a step are left untouched, so a batch can
+    be stepped until every game has finished.
+    """
+
+    def __init__(self, state: BatchGameState, params: GameParams):
+        self.state = state
+        self.params = params
+
+    def step_batch(self, actions: Dict[Player, BatchActions]) -> np.ndarray:
+        """Advances every live game by one tick and returns the per-game terminal flags."""
+        live = ~self.is_terminal_batch()
+        self.apply_actions(actions, live)
+        p1_incoming, p2_incoming, received = self.update_transporters(live)
+        self.update_planets(p1_incoming, p2_incoming, received, live)
+        self.state.game_tick[live] += 1
+        return self.is_terminal_batch()
+
+    def apply_actions(self, actions: Dict[Player, BatchActions], live: np.ndarray):
+        state = self.state
+        # players act in dict order, as in ForwardModel; they can never share a source planet
+        for player, action in actions.items():
+            games = np.flatnonzero(live & (action.source >= 0))
+            if games.size == 0:
+                continue
+            source = action.source[games]
+            target = action.destination[games]
+            num_ships = action.num_ships[games]
+            valid = ~state.t_active[games, source] \
+                & (state.owner[games, source] == PLAYER_CODES[player]) \
+                & (state.ships[games, source] >= num_ships)
+            games, source, target, num_ships = games[valid], source[valid], target[valid], num_ships[valid]
+            if games.size == 0:
+                continue
+
+            state.ships[games, source] -= num_ships
+            sx = state.x[games, source]
+            sy = state.y[games, source]
+            dx = state.x[games, target] - sx
+            dy = state.y[games, target] - sy
+            magnitude = np.sqrt(dx ** 2 + dy ** 2)
+            moving = magnitude > 0
+            scale = np.divide(1.0, magnitude, out=np.ones_like(magnitude), where=moving)
+            dx = np.where(moving, dx * scale, dx)
+            dy = np.where(moving, dy * scale, dy)
+
+            state.t_active[games, source] = True
+            state.t_owner[games, source] = PLAYER_CODES[player]
+            state.t_x[games, source] = sx
+            state.t_y[games, source] = sy
+            state.t_vx[games, source] = dx * self.params.transporter_speed
+            state.t_vy[games, source] = dy * self.params.transporter_speed
+            state.t_dest[games, source] = target
+            state.t_ships[games, source] = num_ships
+
+    def update_transporters(self, live: np.ndarray):
+        state = self.state
+        p1_incoming = np.zeros(state.ships.shape, dtype=np.float64)
+        p2_incoming = np.zeros(state.ships.shape, dtype=np.float64)
+        received = np.zeros(state.ships.shape, dtype=bool)
+
+        in_flight = state.t_active & live[:, None]
+        games, slots = np.nonzero(in_flight)
+        if games.size == 0:
+            return p1_incoming, p2_incoming, received
+
+        dest = state.t_dest[games, slots]
+        dx = state.t_x[games, slots] - state.x[games, dest]
+        dy = state.t_y[games, slots] - state.y[games, dest]
+        arrived = np.sqrt(dx ** 2 + dy ** 2) < state.radius[games, dest]
+
+        if arrived.any():
+            # np.nonzero walks rows in order, so within each game the ships are
+            # accumulated in source planet order like ForwardModel's pending dict
+            landed_games = games[arrived]
+            landed_slots = slots[arrived]
+            landed_dest = dest[arrived]
+            landed_owner = state.t_owner[landed_games, landed_slots]
+            landed_ships = state.t_ships[landed_games, landed_slots]
+            for_p1 = landed_owner == PLAYER1
+            np.add.at(p1_incoming, (landed_games[for_p1], landed_dest[for_p1]), landed_ships[for_p1])
+            for_p2 = landed_owner == PLAYER2
+            np.add.at(p2_incoming, (landed_games[for_p2], landed_dest[for_p2]), landed_ships[for_p2])
+            received[landed_games, landed_dest] = True
+            state.t_active[landed_games, landed_slots] = False
+            state.t_dest[landed_games, landed_slots] = -1
+
+        moving_games = games[~arrived]
+        moving_slots = slots[~arrived]
+        state.t_x[moving_games, moving_slots] += state.t_vx[moving_games, moving_slots]
+        state.t_y[moving_games, moving_slots] += state.t_vy[moving_games, moving_slots]
+        return p1_incoming, p2_incoming, received
+
+    def update_planets(self, p1_incoming: np.ndarray, p2_incoming: np.ndarray,
+                       received: np.ndarray, live: np.ndarray):
+        state = self.state
+        neutral = state.owner == NEUTRAL
+        growing = ~neutral & live[:, None]
+        np.add(state.ships, state.growth, out=state.ships, where=growing)
+
+        hit = neutral & received
+        if hit.any():
+            net = p1_incoming[hit] - p2_incoming[hit]
+            ships = state.ships[hit] - np.abs(net)
+            captured = ships < 0
+            owner = state.owner[hit]
+            owner[captured] = np.where(net[captured] > 0, PLAYER1, PLAYER2)
+            ships[captured] = -ships[captured]
+            state.owner[hit] = owner
+            state.ships[hit] = ships
+
+        hit = ~neutral & received
+        if hit.any():
+            owner = state.owner[hit]
+            net = np.where(owner == PLAYER1,
+                           p1_incoming[hit] - p2_incoming[hit],
+                           p2_incoming[hit] - p1_incoming[hit])
+            ships = state.ships[hit] + net
+            captured = ships < 0
+            owner[captured] = PLAYER1 + PLAYER2 - owner[captured]
+            ships[captured] = -ships[captured]
+            state.owner[hit] = owner
+            state.ships[hit] = ships
+
+    def is_terminal_batch(self) -> np.ndarray:
+        owner = self.state.owner
+        return (self.state.game_tick > self.params.max_ticks) \
+            | ~(owner == PLAYER1).any(axis=1) \
+            | ~(owner == PLAYER2).any(axis=1)
+
+    def get_ships_batch(self, player: Player) -> np.ndarray:
+        # cumulative sums run left to right, matching the planet-order sum in ForwardModel
+        ships = np.where(self.state.owner == PLAYER_CODES[player], self.state.ships, 0.0)
+        return np.cumsum(ships, axis=1)[:, -1]
+
+    def get_leader_batch(self) -> List[Player]:
+        s1 = self.get_ships_batch(Player.Player1)
+        s2 = self.get_ships_batch(Player.Player2)
+        codes = np.where(s1 == s2, NEUTRAL, np.where(s1 > s2, PLAYER1, PLAYER2))
+        return [CODE_PLAYERS[c] for c in codes.tolist()]
+
+
+if __name__ == "__main__":
+    # step a batch of random games and compare throughput with one ForwardModel
+    import time
+    from core.forward_model import ForwardModel
+    from core.game_state_factory import GameStateFactory
+
+    params = GameParams(num_planets=20)
+    batch_size = 1000
+    rng = np.random.default_rng(0)
+    states = [GameStateFactory(params).create_game() for _ in range(batch_size)]
+    model = BatchForwardModel(BatchGameState.from_game_states(states), params)
+
+    n_steps = 500
+    t0 = time.perf_counter()
+    for _ in range(n_steps):
+        actions = {}
+        for player in (Player.Player1, Player.Player2):
+            source = rng.integers(0, params.num_planets, batch_size)
+            actions[player] = BatchActions(
+                source,
+                rng.integers(0, params.num_planets, batch_size),
+                model.state.ships[np.arange(batch_size), source] / 2
+            )
+        model.step_batch(actions)
+    t1 = time.perf_counter()
+    print(f"Batch of {batch_size}: {(t1 - t0) * 1e6 / (n_steps * batch_size):.2f} us per game tick")
+
+    single = ForwardModel(states[0].model_copy(deep=True), params)
+    t0 = time.perf_counter()
+    for _ in range(n_steps):
+        single.step({})
+    t1 = time.perf_counter()
+    print(f"ForwardModel: {(t1 - t0) * 1e6 / n_steps:.2f} us per game tick")
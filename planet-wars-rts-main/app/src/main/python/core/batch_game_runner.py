@@ -0,0 +1,100 @@
+import copy
+from typing import Dict, List, Union
+
+import numpy as np
+
+from agents.batch_agent import BatchPlanetWarsAgent
+from agents.planet_wars_agent import PlanetWarsAgent
+from core.batch_forward_model import BatchForwardModel, BatchGameState, BatchActions
+from core.game_state import GameParams, GameState, Player
+from core.game_state_factory import GameStateFactory
+
+SeatAgents = Union[BatchPlanetWarsAgent, List[PlanetWarsAgent]]
+
+
+class BatchGameRunner:
+    """
+    Plays games in batches on a BatchForwardModel instead of one at a time.
+    Agents can be BatchPlanetWarsAgents, which choose actions for the whole batch in one call,
+    or ordinary PlanetWarsAgents, which are asked once per live game with that game's GameState.
+    A BatchPlanetWarsAgent plays every game of a batch; any other agent is copied once per game
+    and each copy is prepared for its own game, as agents keep per-game state.
+    """
+
+    def __init__(self, agent1, agent2, game_params: GameParams, batch_size: int = 256):
+        self.agent1 = agent1
+        self.agent2 = agent2
+        self.game_params = game_params
+        self.batch_size = batch_size
+        self.seats: Dict[Player, SeatAgents] = {}
+        self.game_state: GameState = GameStateFactory(game_params).create_game()
+
+    def new_batch(self, batch_size: int) -> BatchForwardModel:
+        factory = GameStateFactory(self.game_params)
+        if self.game_params.new_map_each_run:
+            states = [factory.create_game() for _ in range(batch_size)]
+        else:
+            states = [self.game_state] * batch_size
+        self.seats = {
+            Player.Player1: self.seat_agents(self.agent1, Player.Player1, batch_size),
+            Player.Player2: self.seat_agents(self.agent2, Player.Player2, batch_size),
+        }
+        return BatchForwardModel(BatchGameState.from_game_states(states), self.game_params)
+
+    def seat_agents(self, agent, player: Player, batch_size: int) -> SeatAgents:
+        if isinstance(agent, BatchPlanetWarsAgent):
+            agent.prepare_to_play_as(player, self.game_params)
+            return agent
+        agents = [copy.deepcopy(agent) for _ in range(batch_size)]
+        for game_agent in agents:
+            game_agent.prepare_to_play_as(player, self.game_params)
+        return agents
+
+    def get_actions(self, agents: SeatAgents, model: BatchForwardModel, live: np.ndarray) -> BatchActions:
+        if isinstance(agents, BatchPlanetWarsAgent):
+            return agents.get_batch_action(model.state, live)
+        actions = BatchActions.do_nothing(model.state.batch_size)
+        for b in np.flatnonzero(live).tolist():
+            action = agents[b].get_action(model.state.to_game_state(b))
+            actions.source[b] = action.source_planet_id
+            actions.destination[b] = action.destination_planet_id
+            actions.num_ships[b] = action.num_ships
+        return actions
+
+    def run_batch(self, batch_size: int) -> BatchForwardModel:
+        model = self.new_batch(batch_size)
+        live = ~model.is_terminal_batch()
+        while live.any():
+            actions = {
+                Player.Player1: self.get_actions(self.seats[Player.Player1], model, live),
+                Player.Player2: self.get_actions(self.seats[Player.Player2], model, live),
+            }
+            live = ~model.step_batch(actions)
+        return model
+
+    def run_games(self, n_games: int) -> Dict[Player, int]:
+        scores = {Player.Player1: 0, Player.Player2: 0, Player.Neutral: 0}
+        remaining = n_games
+        while remaining > 0:
+            batch_size = min(self.batch_size, remaining)
+            final_model = self.run_batch(batch_size)
+            for winner in final_model.get_leader_batch():
+                scores[winner] += 1
+            remaining -= batch_size
+        return scores
+
+
+if __name__ == "__main__":
+    from agents.random_agents import BatchCarefulRandomAgent
+
+    game_params = GameParams(num_planets=10)
+    runner = BatchGameRunner(BatchCarefulRandomAgent(seed=1), BatchCarefulRandomAgent(seed=2), game_params)
+
+    n_games = 1000
+    import time
+    t0 = time.time()
+    results = runner.run_games(n_games)
+    t1 = time.time()
+
+    print(results)
+    print(f"Time per game: {(t1 - t0) * 1000 / n_games:.3f} ms")
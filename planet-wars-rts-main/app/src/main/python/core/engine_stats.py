@@ -0,0 +1,70 @@
+from typing import Dict, Iterable
+
+from pydantic import Field
+
+from core.game_state import CamelModel
+
+# reasons ForwardModel.apply_actions rejects an action, checked in this order
+TRANSPORTER_BUSY = "transporter_busy"
+NOT_OWNER = "not_owner"
+NOT_ENOUGH_SHIPS = "not_enough_ships"
+
+
+class EngineStats(CamelModel):
+    """
+    Counters for one ForwardModel, or for several when they share an instance or are merged.
+    Stats from other runners or processes can be combined with merge, and JSON round-trips
+    through to_json / from_json.
+    """
+    n_steps: int = Field(default=0)
+    n_actions: int = Field(default=0)
+    failed_actions: Dict[str, int] = Field(default_factory=dict)
+    n_arrivals: int = Field(default=0)
+    n_captures: int = Field(default=0)
+    # seconds spent inside ForwardModel.step, excluding debug checks
+    step_time: float = Field(default=0.0)
+
+    @property
+    def n_failed_actions(self) -> int:
+        return sum(self.failed_actions.values())
+
+    def record_failure(self, reason: str):
+        self.failed_actions[reason] = self.failed_actions.get(reason, 0) + 1
+
+    def time_per_step(self) -> float:
+        return self.step_time / self.n_steps if self.n_steps else 0.0
+
+    def merge(self, other: 'EngineStats') -> 'EngineStats':
+        """Adds other's counts into these stats and returns them."""
+        self.n_steps += other.n_steps
+        self.n_actions += other.n_actions
+        for reason, count in other.failed_actions.items():
+            self.failed_actions[reason] = self.failed_actions.get(reason, 0) + count
+        self.n_arrivals += other.n_arrivals
+        self.n_captures += other.n_captures
+        self.step_time += other.step_time
+        return self
+
+    @staticmethod
+    def combine(stats: Iterable['EngineStats']) -> 'EngineStats':
+        total = EngineStats()
+        for s in stats:
+            total.merge(s)
+        return total
+
+    def to_json(self) -> str:
+        return self.model_dump_json(by_alias=True)
+
+    @staticmethod
+    def from_json(text: str) -> 'EngineStats':
+        return EngineStats.model_validate_json(text)
+
+    def summary(self) -> str:
+        return (
+            f"Steps: {self.n_steps}; "
+            f"time per step: {self.time_per_step() * 1000:.3f} ms; "
+            f"successful actions: {self.n_actions}; "
+            f"failed actions: {self.n_failed_actions} {self.failed_actions}; "
+            f"arrivals: {self.n_arrivals}; "
+            f"captures: {self.n_captures}"
+        )
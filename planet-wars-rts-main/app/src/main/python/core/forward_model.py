@@ -1,23 +1,144 @@
-from typing import Dict, Optional
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from core.engine_stats import EngineStats, TRANSPORTER_BUSY, NOT_OWNER, NOT_ENOUGH_SHIPS
 from core.game_state import GameState, GameParams, Player, Action, Planet, Transporter, Vec2d
+from core.state_hash import compute_hashes, planet_keys, quantize, transporter_keys, transporter_steps
 
 
-class ForwardModel:
-    n_updates = 0
-    n_failed_actions = 0
-    n_actions = 0
+@dataclass
+class UndoRecord:
+    """Everything one step changed, with the previous values, so that ForwardModel.undo can put them back."""
+    aggregates: tuple
+    # the state's board hash and mirrored board hash
+    hashes: tuple
+    # planet id and n_ships before the step, for every planet whose ships changed
+    ships: List[Tuple[int, float]] = field(default_factory=list)
+    # planet id and owner before the step, for every planet that changed hands
+    owners: List[Tuple[int, Player]] = field(default_factory=list)
+    # ids of the planets that launched a transporter this step
+    launched: List[int] = field(default_factory=list)
+    # planet id and transporter for every transporter that landed this step
+    removed: List[Tuple[int, Transporter]] = field(default_factory=list)
+    # source planet id and position before the step for every transporter that moved; by id, not by
+    # object, as a copy-on-write clone can make the state swap in copies of its transporters
+    moved: List[Tuple[int, Vec2d]] = field(default_factory=list)
+
 
-    def __init__(self, state: GameState, params: GameParams):
+class ForwardModel:
+    def __init__(self, state: GameState, params: GameParams, debug: bool = False, record_undo: bool = False,
+                 stats: Optional[EngineStats] = None):
         self.state = state
         self.params = params
+        # pass a shared EngineStats to accumulate over several models, e.g. all the games of a runner
+        self.stats = EngineStats() if stats is None else stats
+        # in debug mode the cached aggregates are checked against a full recount after every step
+        self.debug = debug
+        # with record_undo every step pushes an UndoRecord, so a search can walk a game tree
+        # depth-first on one state with step() / undo() instead of copying it at every node
+        self.record_undo = record_undo
+        self.undo_stack: List[UndoRecord] = []
+        self._record: Optional[UndoRecord] = None
+        # [hash, mirror hash] while a step updates the state's hashes, None when they are not known
+        self._hashes: Optional[List[int]] = None
+        self.refresh_aggregates()
+
+    def refresh_aggregates(self):
+        """Recounts the per-player aggregates from scratch; call after editing the state by hand."""
+        self.planet_counts, self.ship_totals, self.in_flight_totals = self.count_aggregates()
+
+    def count_aggregates(self):
+        planet_counts = {Player.Player1: 0, Player.Player2: 0, Player.Neutral: 0}
+        ship_totals = {Player.Player1: 0.0, Player.Player2: 0.0, Player.Neutral: 0.0}
+        in_flight_totals = {Player.Player1: 0.0, Player.Player2: 0.0}
+        for planet in self.state.planets:
+            planet_counts[planet.owner] += 1
+            ship_totals[planet.owner] += planet.n_ships
+            if planet.transporter is not None:
+                in_flight_totals[planet.transporter.owner] += planet.transporter.n_ships
+        return planet_counts, ship_totals, in_flight_totals
+
+    def check_aggregates(self):
+        expected = self.count_aggregates()
+        cached = (self.planet_counts, self.ship_totals, self.in_flight_totals)
+        if cached != expected:
+            raise RuntimeError(
+                f"Cached aggregates out of date at tick {self.state.game_tick}: {cached} != {expected}"
+            )
+        hashes = self.state.cached_hashes()
+        if hashes[0] is not None:
+            if hashes != compute_hashes(self.state):
+                raise RuntimeError(f"Incremental state hash out of date at tick {self.state.game_tick}")
 
     def step(self, actions: Dict[Player, Action]):
+        t0 = time.perf_counter()
+        state = self.state
+        state.ensure_writable()
+        if self.record_undo:
+            self._record = UndoRecord(
+                aggregates=(dict(self.planet_counts), dict(self.ship_totals), dict(self.in_flight_totals)),
+                hashes=state.cached_hashes()
+            )
+        # the hashes are only maintained once something has asked for them
+        h, mh = state.cached_hashes()
+        if h is not None:
+            self._hashes = [h, mh]
         self.apply_actions(actions)
         pending: Dict[int, Dict[Player, float]] = {}
         self.update_transporters(pending)
         self.update_planets(pending)
-        ForwardModel.n_updates += 1
-        self.state.game_tick += 1
+        state.game_tick += 1
+        if self._hashes is not None:
+            state.set_cached_hashes(*self._hashes)
+            self._hashes = None
+        if self._record is not None:
+            self.undo_stack.append(self._record)
+            self._record = None
+        stats = self.stats
+        stats.n_steps += 1
+        stats.step_time += time.perf_counter() - t0
+        if self.debug:
+            self.check_aggregates()
+
+    def undo(self):
+        """Restores the state and aggregates to exactly what they were before the last recorded step."""
+        if not self.undo_stack:
+            raise RuntimeError("Nothing to undo: no recorded steps left (is record_undo set?)")
+        record = self.undo_stack.pop()
+        # the planets may be shared with a copy-on-write clone taken since the step
+        self.state.ensure_writable()
+        planets = self.state.planets
+        self.state.game_tick -= 1
+        # a planet can appear twice in ships (launch, then growth), so walk back to its oldest value
+        for planet_id, owner in record.owners:
+            planets[planet_id].owner = owner
+        for planet_id, n_ships in reversed(record.ships):
+            planets[planet_id].n_ships = n_ships
+        for planet_id, position in record.moved:
+            planets[planet_id].transporter.s = position
+        for planet_id, transporter in record.removed:
+            planets[planet_id].transporter = transporter
+        for planet_id in record.launched:
+            planets[planet_id].transporter = None
+        self.planet_counts, self.ship_totals, self.in_flight_totals = record.aggregates
+        self.state.set_cached_hashes(*record.hashes)
+        if self.debug:
+            self.check_aggregates()
+
+    def clear_undo(self):
+        self.undo_stack.clear()
+
+    def toggle_hash(self, keys):
+        self._hashes[0] ^= keys[0]
+        self._hashes[1] ^= keys[1]
+
+    def rehash_planet(self, planet: Planet, owner: Player, n_ships: float):
+        """XORs out the planet's old (owner, ships) feature and XORs in the current one, if it changed."""
+        if planet.owner == owner and quantize(planet.n_ships) == quantize(n_ships):
+            return
+        n_planets = len(self.state.planets)
+        self.toggle_hash(planet_keys(n_planets, planet.id, owner, n_ships))
+        self.toggle_hash(planet_keys(n_planets, planet.id, planet.owner, planet.n_ships))
 
     def apply_actions(self, actions: Dict[Player, Action]):
         for player, action in actions.items():
@@ -26,6 +147,10 @@ class ForwardModel:
             source = self.state.planets[action.source_planet_id]
             target = self.state.planets[action.destination_planet_id]
             if source.transporter is None and source.owner == player and source.n_ships >= action.num_ships:
+                n_ships = source.n_ships
+                if self._record is not None:
+                    self._record.ships.append((source.id, n_ships))
+                    self._record.launched.append(source.id)
                 source.n_ships -= action.num_ships
                 direction = (target.position - source.position).normalize()
                 velocity = direction * self.params.transporter_speed
@@ -38,15 +163,23 @@ class ForwardModel:
                     n_ships=action.num_ships
                 )
                 source.transporter = transporter
-                ForwardModel.n_actions += 1
+                if self._hashes is not None:
+                    self.rehash_planet(source, player, n_ships)
+                    self.toggle_hash(transporter_keys(len(self.state.planets), transporter, 0))
+                self.ship_totals[player] -= action.num_ships
+                self.in_flight_totals[player] += action.num_ships
+                self.stats.n_actions += 1
+            elif source.transporter is not None:
+                self.stats.record_failure(TRANSPORTER_BUSY)
+            elif source.owner != player:
+                self.stats.record_failure(NOT_OWNER)
             else:
-                ForwardModel.n_failed_actions += 1
+                self.stats.record_failure(NOT_ENOUGH_SHIPS)
 
     def is_terminal(self) -> bool:
         if self.state.game_tick > self.params.max_ticks:
             return True
-        return not any(p.owner == Player.Player1 for p in self.state.planets) or \
-               not any(p.owner == Player.Player2 for p in self.state.planets)
+        return self.planet_counts[Player.Player1] == 0 or self.planet_counts[Player.Player2] == 0
 
     def status_string(self) -> str:
         return (
@@ -57,7 +190,19 @@ class ForwardModel:
         )
 
     def get_ships(self, player: Player) -> float:
-        return sum(p.n_ships for p in self.state.planets if p.owner == player)
+        return self.ship_totals[player]
+
+    def get_planet_count(self, player: Player) -> int:
+        return self.planet_counts[player]
+
+    def get_ships_in_flight(self, player: Player) -> float:
+        return self.in_flight_totals[player]
+
+    def get_material_balance(self, player: Player) -> float:
+        """Ships on planets and in flight for player, minus the same for the opponent."""
+        opponent = player.opponent()
+        return (self.ship_totals[player] + self.in_flight_totals[player]) - \
+            (self.ship_totals[opponent] + self.in_flight_totals[opponent])
 
     def get_leader(self) -> Player:
         s1 = self.get_ships(Player.Player1)
@@ -73,15 +218,32 @@ class ForwardModel:
         pending[destination.id][transporter.owner] += transporter.n_ships
 
     def update_transporters(self, pending: Dict[int, Dict[Player, float]]):
+        # the in-flight totals are recounted in the same pass, so they never drift
+        in_flight_totals = {Player.Player1: 0.0, Player.Player2: 0.0}
+        record = self._record
+        hashing = self._hashes is not None
         for planet in self.state.planets:
             transporter = planet.transporter
             if transporter:
                 destination = self.state.planets[transporter.destination_index]
+                if hashing:
+                    n_planets = len(self.state.planets)
+                    steps = transporter_steps(transporter, planet.position)
+                    self.toggle_hash(transporter_keys(n_planets, transporter, steps))
                 if transporter.s.distance(destination.position) < destination.radius:
                     self.transporter_arrival(destination, transporter, pending)
                     planet.transporter = None
+                    self.stats.n_arrivals += 1
+                    if record is not None:
+                        record.removed.append((planet.id, transporter))
                 else:
+                    if record is not None:
+                        record.moved.append((planet.id, transporter.s))
                     transporter.s = transporter.s + transporter.v
+                    if hashing:
+                        self.toggle_hash(transporter_keys(n_planets, transporter, steps + 1))
+                    in_flight_totals[transporter.owner] += transporter.n_ships
+        self.in_flight_totals = in_flight_totals
 
     def update_neutral_planet(self, planet: Planet, pending: Optional[Dict[Player, float]]):
         if not pending:
@@ -106,12 +268,32 @@ class ForwardModel:
             planet.n_ships = -planet.n_ships
 
     def update_planets(self, pending: Dict[int, Dict[Player, float]]):
+        # planet counts and ship totals are recounted in planet order as each planet is updated,
+        # so they are exactly what a fresh sum over the planets would give
+        planet_counts = {Player.Player1: 0, Player.Player2: 0, Player.Neutral: 0}
+        ship_totals = {Player.Player1: 0.0, Player.Player2: 0.0, Player.Neutral: 0.0}
+        record = self._record
+        hashing = self._hashes is not None
         for planet in self.state.planets:
             p_pending = pending.get(planet.id)
+            owner, n_ships = planet.owner, planet.n_ships
             if planet.owner == Player.Neutral:
                 self.update_neutral_planet(planet, p_pending)
             else:
                 self.update_player_planet(planet, p_pending)
+            if planet.owner != owner:
+                self.stats.n_captures += 1
+            if hashing:
+                self.rehash_planet(planet, owner, n_ships)
+            if record is not None:
+                if planet.n_ships != n_ships:
+                    record.ships.append((planet.id, n_ships))
+                if planet.owner != owner:
+                    record.owners.append((planet.id, owner))
+            planet_counts[planet.owner] += 1
+            ship_totals[planet.owner] += planet.n_ships
+        self.planet_counts = planet_counts
+        self.ship_totals = ship_totals
 
 
 if __name__ == "__main__":
@@ -124,4 +306,13 @@ if __name__ == "__main__":
     for _ in range(1000):
         model.step({})  # simulate empty action dicts
 
-    print(f"Steps: {ForwardModel.n_updates}")
+    print(model.stats.summary())
+
+    # step forward and back again on one state
+    model = ForwardModel(state, params, record_undo=True)
+    before = state.model_copy(deep=True)
+    for _ in range(100):
+        model.step({})
+    while model.undo_stack:
+        model.undo()
+    print(f"Undo restores the state: {state == before}")
@@ -1,61 +1,174 @@
-from typing import Dict
+import time
+from typing import Dict, Optional
+from core.agent_worker import AgentWorker
+from core.engine_stats import EngineStats
 from core.forward_model import ForwardModel
-from core.game_state import GameParams, GameState, Player
-from core.game_state_factory import GameStateFactory
+from core.game_state import GameParams, GameState, Player, Action
+from core.game_state_factory import GameStateFactory, derive_seed
+from core.latency import LatencyProfiler
+from core.map_bank import MapBank, map_params_hash
+from core.observation import ObservationFactory
+from core.state_view import read_only
 from agents.random_agents import PureRandomAgent, CarefulRandomAgent  # adjust path
 
 
 class GameRunner:
-    def __init__(self, agent1, agent2, game_params: GameParams):
+    def __init__(self, agent1, agent2, game_params: GameParams,
+                 seed: Optional[int] = None, map_bank: Optional[MapBank] = None,
+                 profiler: Optional[LatencyProfiler] = None, time_budget_ms: Optional[float] = None,
+                 recorder=None, partial_observation: bool = False, include_transporter_locations: bool = True):
         self.agent1 = agent1
         self.agent2 = agent2
         self.game_params = game_params
-        self.game_state: GameState = GameStateFactory(game_params).create_game()
-        self.forward_model: ForwardModel = ForwardModel(self.game_state.model_copy(deep=True), game_params)
+        # with a seed, map i is generated from derive_seed(seed, i); with a bank, map i is bank map i
+        self.seed = seed
+        self.map_bank = map_bank
+        if map_bank is not None and map_params_hash(map_bank.params) != map_params_hash(game_params):
+            raise ValueError("Map bank was generated for different map parameters")
+        # engine counters accumulated over every game this runner plays
+        self.stats = EngineStats()
+        # when set, every get_action call is timed
+        self.profiler = profiler
+        # with a time budget each agent decides in its own worker thread, on a snapshot of the state,
+        # and a decision that misses the deadline is replaced by DO_NOTHING and counted as a timeout;
+        # the threads are stopped by close(), which run_games calls when it is done
+        self.time_budget_ms = time_budget_ms
+        self.workers: Dict[Player, AgentWorker] = {}
+        self.n_timeouts = {Player.Player1: 0, Player.Player2: 0}
+        # e.g. a replay.replay_writer.ReplayWriter; told about every game start, step and end
+        self.recorder = recorder
+        # with partial observation agents are PartialObservationAgents and see an Observation
+        # built for their own seat each tick, as in the Kotlin PartialObservationGameRunner
+        self.partial_observation = partial_observation
+        self.observations = ObservationFactory(include_transporter_locations)
+        self.n_maps = 0
+        self.map_seed: Optional[int] = None
+        # whether game_state has been played on; until then the next game reuses it, so that
+        # game i of a seeded runner or a bank is played on map i
+        self.map_played = False
+        self.game_state: GameState = self.next_map()
+        self.forward_model: ForwardModel = ForwardModel(self.game_state.fast_clone(), game_params)
         self.new_game()
 
-    def run_game(self) -> ForwardModel:
-        self.new_game()
+    def run_game(self, map_index: Optional[int] = None) -> ForwardModel:
+        self.new_game(map_index)
+        self.map_played = True
         while not self.forward_model.is_terminal():
-            actions = {
-                Player.Player1: self.agent1.get_action(self.forward_model.state.model_copy(deep=True)),
-                Player.Player2: self.agent2.get_action(self.forward_model.state.model_copy(deep=True)),
-            }
-            self.forward_model.step(actions)
+            self.step_game()
         return self.forward_model
 
-    def new_game(self):
-        if self.game_params.new_map_each_run:
-            self.game_state = GameStateFactory(self.game_params).create_game()
-        self.forward_model = ForwardModel(self.game_state.model_copy(deep=True), self.game_params)
-        self.agent1.prepare_to_play_as(Player.Player1, self.game_params)
-        self.agent2.prepare_to_play_as(Player.Player2, self.game_params)
+    def get_actions(self) -> Dict[Player, Action]:
+        if self.time_budget_ms is not None:
+            snapshot = None if self.partial_observation else read_only(self.forward_model.state.fast_clone())
+            return {
+                Player.Player1: self.budgeted_action(Player.Player1, self.agent1, self.observe(Player.Player1, snapshot)),
+                Player.Player2: self.budgeted_action(Player.Player2, self.agent2, self.observe(Player.Player2, snapshot)),
+            }
+        if self.profiler is None:
+            return {
+                Player.Player1: self.agent1.get_action(self.observe(Player.Player1, self.state_view)),
+                Player.Player2: self.agent2.get_action(self.observe(Player.Player2, self.state_view)),
+            }
+        return {
+            Player.Player1: self.timed_action(Player.Player1, self.agent1),
+            Player.Player2: self.timed_action(Player.Player2, self.agent2),
+        }
+
+    def observe(self, player: Player, full_view):
+        """What player's agent is shown: full_view, or with partial observation its own Observation."""
+        if not self.partial_observation:
+            return full_view
+        # a frozen snapshot that shares nothing mutable with the live state, so it needs no view
+        return self.observations.observe(self.forward_model.state, {player})
+
+    def timed_action(self, player: Player, agent) -> Action:
+        observation = self.observe(player, self.state_view)
+        t0 = time.perf_counter()
+        action = agent.get_action(observation)
+        self.profiler.record(player, time.perf_counter() - t0)
+        return action
+
+    def budgeted_action(self, player: Player, agent, snapshot) -> Action:
+        # the seats are asked one after the other, each with the full budget, so calls that finish
+        # in time never overlap. A call that times out is not: it keeps running on its worker thread
+        # and competes for the GIL with the other seat's next call, whose measured time goes up
+        # and which may then time out itself; see AgentWorker
+        if player not in self.workers:
+            self.workers[player] = AgentWorker(f"{player.value} agent")
+        t0 = time.perf_counter()
+        in_time, action = self.workers[player].call(self.time_budget_ms / 1000, agent.get_action, snapshot)
+        if self.profiler is not None:
+            self.profiler.record(player, time.perf_counter() - t0)
+        if not in_time:
+            self.n_timeouts[player] += 1
+            return Action.DO_NOTHING
+        return action
+
+    def next_map(self, map_index: Optional[int] = None) -> GameState:
+        """Draws the next map, or map map_index, and records the seed that reproduces it."""
+        if map_index is None:
+            map_index = self.n_maps
+        self.n_maps += 1
+        if self.map_bank is not None:
+            map_index %= len(self.map_bank)
+            self.map_seed = self.map_bank.map_seed(map_index)
+            return self.map_bank.get_game(map_index)
+        self.map_seed = None if self.seed is None else derive_seed(self.seed, map_index)
+        return GameStateFactory(self.game_params, self.map_seed).create_game()
+
+    def new_game(self, map_index: Optional[int] = None):
+        if map_index is not None or (self.game_params.new_map_each_run and self.map_played):
+            self.game_state = self.next_map(map_index)
+            self.map_played = False
+        self.forward_model = ForwardModel(self.game_state.fast_clone(), self.game_params, stats=self.stats)
+        # agents share one read-only view of the live state instead of getting copies each tick
+        self.state_view = read_only(self.forward_model.state)
+        self.observations.reset()
+        agent_types = {
+            Player.Player1: self.agent1.prepare_to_play_as(Player.Player1, self.game_params),
+            Player.Player2: self.agent2.prepare_to_play_as(Player.Player2, self.game_params),
+        }
+        if self.profiler is not None:
+            self.profiler.start_game(agent_types)
+        if self.recorder is not None:
+            self.recorder.start_game(self.forward_model.state, agent_types, map_seed=self.map_seed)
 
     def step_game(self) -> ForwardModel:
         if self.forward_model.is_terminal():
             return self.forward_model
-        actions = {
-            Player.Player1: self.agent1.get_action(self.forward_model.state),
-            Player.Player2: self.agent2.get_action(self.forward_model.state),
-        }
+        self.map_played = True
+        actions = self.get_actions()
         self.forward_model.step(actions)
+        if self.recorder is not None:
+            self.recorder.record_step(self.forward_model.state, actions)
+            if self.forward_model.is_terminal():
+                self.recorder.end_game(self.forward_model)
         return self.forward_model
 
     def run_games(self, n_games: int) -> Dict[Player, int]:
         scores = {Player.Player1: 0, Player.Player2: 0, Player.Neutral: 0}
-        for _ in range(n_games):
-            final_model = self.run_game()
-            winner = final_model.get_leader()
-            scores[winner] += 1
+        try:
+            for _ in range(n_games):
+                final_model = self.run_game()
+                winner = final_model.get_leader()
+                scores[winner] += 1
+        finally:
+            self.close()
         return scores
 
+    def close(self):
+        """Stops the agents' worker threads; they are started again if the runner plays on."""
+        for worker in self.workers.values():
+            worker.close()
+        self.workers = {}
+
 
 if __name__ == "__main__":
 
     game_params = GameParams(num_planets=10)
     agent1 = CarefulRandomAgent()
     agent2 = PureRandomAgent()
-    runner = GameRunner(agent1, agent2, game_params)
+    runner = GameRunner(agent1, agent2, game_params, profiler=LatencyProfiler())
 
     n_games = 10
     import time
@@ -65,6 +178,7 @@ if __name__ == "__main__":
 
     print(results)
     print(f"Time per game: {(t1 - t0) * 1000 / n_games:.3f} ms")
-    print(f"Time per step: {(t1 - t0) * 1000 / ForwardModel.n_updates:.3f} ms")
-    print(f"Successful actions: {ForwardModel.n_actions}")
-    print(f"Failed actions: {ForwardModel.n_failed_actions}")
+    print(f"Time per step: {(t1 - t0) * 1000 / runner.stats.n_steps:.3f} ms (engine only: "
+          f"{runner.stats.time_per_step() * 1000:.3f} ms)")
+    print(runner.stats.summary())
+    print(runner.profiler.report())
@@ -3,8 +3,12 @@ from __future__ import annotations  # For forward references in type hints
 import re
 import math
 from enum import Enum
-from typing import List, Optional, ClassVar
-from pydantic import BaseModel, Field, ConfigDict
+from typing import List, Optional, ClassVar, Tuple
+from pydantic import BaseModel, Field, ConfigDict, PrivateAttr
+
+from core.spatial_index import SpatialIndex
+from core.state_hash import compute_hashes, mirrored_index, tick_key
+from core.state_view import unwrap
 
 
 # --- Helper functions for camelCase <-> snake_case ---
@@ -27,6 +31,20 @@ class CamelModel(BaseModel):
         extra='forbid'  # helps catch unexpected fields
     )
 
+    # a ReadOnlyView of a model compares equal to the model, whichever side it is on
+    def __eq__(self, other: object) -> bool:
+        return super().__eq__(unwrap(other))
+
+
+def construct_unvalidated(cls, fields: dict):
+    """What model_construct does for a complete set of fields, without its per-call overhead."""
+    model = object.__new__(cls)
+    object.__setattr__(model, "__dict__", fields)
+    object.__setattr__(model, "__pydantic_fields_set__", set(fields))
+    object.__setattr__(model, "__pydantic_extra__", None)
+    object.__setattr__(model, "__pydantic_private__", None)
+    return model
+
 
 # --- Enums ---
 
@@ -44,6 +62,10 @@ class Player(str, Enum):
             raise ValueError("Neutral has no opponent")
 
 
+# the seat each player takes in the point-reflected game
+MIRRORED_PLAYER = {Player.Player1: Player.Player2, Player.Player2: Player.Player1, Player.Neutral: Player.Neutral}
+
+
 # --- Data classes ---
 
 # class Vec2d(CamelModel):
@@ -118,6 +140,141 @@ class GameState(CamelModel):
     planets: List[Planet]
     game_tick: int = Field(default=0)
 
+    # set while the planets list is shared with a copy-on-write clone
+    _shared_planets: bool = PrivateAttr(default=False)
+    # board hash and hash of the point-reflected board, computed on first use and then
+    # kept up to date by the ForwardModel; None means not known
+    _hash: Optional[int] = PrivateAttr(default=None)
+    _mirror_hash: Optional[int] = PrivateAttr(default=None)
+    # planets never move, so the index is shared by every copy of the state
+    _spatial_index: Optional[SpatialIndex] = PrivateAttr(default=None)
+
+    def __eq__(self, other: object) -> bool:
+        # private bookkeeping (sharing flags, caches) is not part of the game state
+        other = unwrap(other)
+        if not isinstance(other, GameState):
+            return NotImplemented
+        return self.game_tick == other.game_tick and self.planets == other.planets
+
+    def fast_clone(self, copy_on_write: bool = False) -> GameState:
+        """
+        Cheap alternative to model_copy(deep=True) for search and rollouts.
+        Only what changes from tick to tick is copied: the planets' owners and ship counts
+        and their transporters. Positions are shared, as Vec2d objects are never mutated in place.
+        With copy_on_write=True the clone shares the planets themselves, and whichever state is
+        stepped first by the ForwardModel takes a private copy (see ensure_writable).
+        Copy-on-write clones must therefore only be modified through the ForwardModel.
+        """
+        if copy_on_write:
+            clone = GameState.model_construct(planets=self.planets, game_tick=self.game_tick)
+            self._shared_planets = True
+            clone._shared_planets = True
+        else:
+            clone = GameState.model_construct(planets=self._copy_planets(), game_tick=self.game_tick)
+        clone.set_cached_hashes(*self.cached_hashes())
+        clone.__pydantic_private__["_spatial_index"] = self.__pydantic_private__["_spatial_index"]
+        return clone
+
+    def ensure_writable(self):
+        """Takes a private copy of planets shared with a copy-on-write clone, before mutating them."""
+        if self._shared_planets:
+            self.planets = self._copy_planets()
+            self._shared_planets = False
+
+    def state_hash(self) -> int:
+        """
+        64-bit Zobrist-style hash of owners, quantized ship counts, transporters and the tick.
+        Equal states hash equally; see core.state_hash for what is quantized.
+        """
+        h, _ = self.board_hashes()
+        return h ^ tick_key(self.game_tick)
+
+    def canonical_hash(self) -> int:
+        """Hash shared by this state and its point reflection with the players swapped."""
+        h, mh = self.board_hashes()
+        key = tick_key(self.game_tick)
+        return min(h ^ key, mh ^ key)
+
+    def board_hashes(self) -> Tuple[int, int]:
+        h, mh = self.cached_hashes()
+        if h is None:
+            h, mh = compute_hashes(self)
+            self.set_cached_hashes(h, mh)
+        return h, mh
+
+    def spatial_index(self, transporter_speed: float = 3.0) -> SpatialIndex:
+        """
+        Distance, ETA and nearest-neighbour lookups between planets, built on first use.
+        Pass params.transporter_speed for ETAs in ticks under non-default parameters.
+        """
+        private = self.__pydantic_private__
+        index = private["_spatial_index"]
+        if index is None or index.transporter_speed != transporter_speed or index.n_planets != len(self.planets):
+            index = SpatialIndex.from_game_state(self, transporter_speed)
+            private["_spatial_index"] = index
+        return index
+
+    def mirrored(self, params: GameParams) -> GameState:
+        """
+        The same position seen from the other seat: planet i takes the ships and transporter of its
+        point reflection, planet mirrored_index(i), with Player1 and Player2 swapped, and transporters
+        are reflected through the centre of the params.width x params.height map, so params must be
+        the ones the map was made with.
+        Planet geometry is kept as it is, which is exact for the point-symmetric maps GameStateFactory makes.
+        """
+        planets = self.planets
+        n = len(planets)
+        mirrored_planets = []
+        for i, planet in enumerate(planets):
+            reflection = planets[mirrored_index(i, n)]
+            transporter = reflection.transporter
+            if transporter is not None:
+                s, v = transporter.s, transporter.v
+                transporter = construct_unvalidated(Transporter, {
+                    "s": construct_unvalidated(Vec2d, {"x": params.width - s.x, "y": params.height - s.y}),
+                    "v": construct_unvalidated(Vec2d, {"x": -v.x, "y": -v.y}),
+                    "owner": MIRRORED_PLAYER[transporter.owner],
+                    "source_index": mirrored_index(transporter.source_index, n),
+                    "destination_index": mirrored_index(transporter.destination_index, n),
+                    "n_ships": transporter.n_ships,
+                })
+            fields = dict(planet.__dict__)
+            fields["owner"] = MIRRORED_PLAYER[reflection.owner]
+            fields["n_ships"] = reflection.n_ships
+            fields["transporter"] = transporter
+            mirrored_planets.append(construct_unvalidated(Planet, fields))
+        state = GameState.model_construct(planets=mirrored_planets, game_tick=self.game_tick)
+        # the board hash and the mirrored board hash trade places
+        h, mh = self.cached_hashes()
+        state.set_cached_hashes(mh, h)
+        state.__pydantic_private__["_spatial_index"] = self.__pydantic_private__["_spatial_index"]
+        return state
+
+    def invalidate_hash(self):
+        """Forgets the cached hash; call after changing planets or transporters outside the ForwardModel."""
+        self.set_cached_hashes(None, None)
+
+    # pydantic resolves private attributes through a slow __getattr__, so the hashes, which the
+    # ForwardModel reads and writes every step, go through the private dict directly
+    def cached_hashes(self) -> Tuple[Optional[int], Optional[int]]:
+        private = self.__pydantic_private__
+        return private["_hash"], private["_mirror_hash"]
+
+    def set_cached_hashes(self, h: Optional[int], mh: Optional[int]):
+        private = self.__pydantic_private__
+        private["_hash"] = h
+        private["_mirror_hash"] = mh
+
+    def _copy_planets(self) -> List[Planet]:
+        planets = []
+        for planet in self.planets:
+            transporter = planet.transporter
+            if transporter is None:
+                planets.append(planet.model_copy())
+            else:
+                planets.append(planet.model_copy(update={"transporter": transporter.model_copy()}))
+        return planets
+
 
 class GameParams(CamelModel):
     # Spatial parameters
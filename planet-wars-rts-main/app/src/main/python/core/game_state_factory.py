@@ -1,25 +1,73 @@
+import hashlib
+import math
 import random
-from typing import List
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 from core.game_state import Player, Vec2d, Planet, GameState, GameParams
 
 
+def derive_seed(master_seed: int, index: int) -> int:
+    """Independent, reproducible 63-bit seed for item index of a run seeded with master_seed."""
+    digest = hashlib.sha256(f"{master_seed}:{index}".encode()).digest()
+    return int.from_bytes(digest[:8], "little") >> 1
+
+
+# candidates rejected in a row before a map is declared too crowded to finish
+MAX_RETRIES_PER_PLANET = 20_000
+
+
+class MapGenerationError(ValueError):
+    pass
+
+
+class PlanetGrid:
+    """
+    Uniform spatial hash of the planets placed so far, as (x, y, radius) tuples.
+    With cells as wide as the largest possible separation, a candidate can only clash
+    with planets in its own cell or the eight around it.
+    """
+
+    def __init__(self, cell_size: float):
+        self.cell_size = cell_size
+        self.cells: Dict[Tuple[int, int], List[Tuple[float, float, float]]] = {}
+
+    def add(self, x: float, y: float, radius: float):
+        key = (int(x // self.cell_size), int(y // self.cell_size))
+        self.cells.setdefault(key, []).append((x, y, radius))
+
+    def neighbours(self, x: float, y: float) -> Iterator[Tuple[float, float, float]]:
+        cx = int(x // self.cell_size)
+        cy = int(y // self.cell_size)
+        for i in (cx - 1, cx, cx + 1):
+            for j in (cy - 1, cy, cy + 1):
+                yield from self.cells.get((i, j), ())
+
+
 class GameStateFactory:
-    def __init__(self, params: GameParams):
+    def __init__(self, params: GameParams, seed: Optional[int] = None, max_retries: int = MAX_RETRIES_PER_PLANET):
         self.params = params
+        self.seed = seed
+        # without a seed we keep drawing from the global random module, as before
+        self.rng = random if seed is None else random.Random(seed)
+        self.max_retries = max_retries
 
-    def make_random_planet(self, owner: Player) -> Planet:
-        x = random.uniform(0, self.params.width / 2)
-        y = random.uniform(0, self.params.height)
-        num_ships = random.uniform(
+    def random_planet_values(self) -> Tuple[float, float, float, float, float]:
+        """Draws x, y, ships, growth rate and radius for a candidate planet."""
+        x = self.rng.uniform(0, self.params.width / 2)
+        y = self.rng.uniform(0, self.params.height)
+        num_ships = self.rng.uniform(
             self.params.min_initial_ships_per_planet,
             self.params.max_initial_ships_per_planet
         )
-        growth_rate = random.uniform(
+        growth_rate = self.rng.uniform(
             self.params.min_growth_rate,
             self.params.max_growth_rate
         )
         radius = growth_rate * self.params.growth_to_radius_factor
+        return x, y, num_ships, growth_rate, radius
+
+    def make_random_planet(self, owner: Player) -> Planet:
+        x, y, num_ships, growth_rate, radius = self.random_planet_values()
         return Planet(
             owner=owner,
             n_ships=num_ships,
@@ -29,30 +77,77 @@ class GameStateFactory:
         )
 
     def can_add(self, planets: List[Planet], candidate: Planet, radial_separation: float) -> bool:
+        placed = ((p.position.x, p.position.y, p.growth_rate * self.params.growth_to_radius_factor)
+                  for p in planets)
+        return self.fits(candidate.position.x, candidate.position.y, candidate.radius, radial_separation, placed)
+
+    def fits(self, x: float, y: float, radius: float, radial_separation: float,
+             placed: Iterable[Tuple[float, float, float]]) -> bool:
         edge_sep = self.params.edge_separation
-        if candidate.position.x - edge_sep < candidate.radius or \
-           candidate.position.x + edge_sep > self.params.width / 2 - candidate.radius:
+        if x - edge_sep < radius or \
+           x + edge_sep > self.params.width / 2 - radius:
             return False
-        if candidate.position.y - edge_sep < candidate.radius or \
-           candidate.position.y + edge_sep > self.params.height - candidate.radius:
+        if y - edge_sep < radius or \
+           y + edge_sep > self.params.height - radius:
             return False
-        for planet in planets:
-            planet_radius = planet.growth_rate * self.params.growth_to_radius_factor
-            dist = ((planet.position.x - candidate.position.x) ** 2 +
-                    (planet.position.y - candidate.position.y) ** 2) ** 0.5
-            if dist < radial_separation * (planet_radius + candidate.radius):
+        for px, py, planet_radius in placed:
+            dist = ((px - x) ** 2 +
+                    (py - y) ** 2) ** 0.5
+            if dist < radial_separation * (planet_radius + radius):
                 return False
         return True
 
+    def check_feasible(self, n_planets: int):
+        """Fails fast when n_planets cannot possibly fit on one half of the map."""
+        p = self.params
+        min_radius = p.min_growth_rate * p.growth_to_radius_factor
+        width = p.width / 2 - 2 * (p.edge_separation + min_radius)
+        height = p.height - 2 * (p.edge_separation + min_radius)
+        if n_planets > 0 and (width < 0 or height < 0):
+            raise MapGenerationError(
+                f"No planet fits on a {p.width / 2:g}x{p.height:g} half-map with "
+                f"edge_separation={p.edge_separation:g} and minimum radius {min_radius:g}"
+            )
+        # planet centres are at least min_gap apart, and discs of that diameter pack no denser than a hexagonal lattice
+        min_gap = p.radial_separation * 2 * min_radius
+        if min_gap > 0:
+            capacity = (width + min_gap) * (height + min_gap) / (min_gap ** 2 * math.sqrt(3) / 2)
+            if n_planets > capacity:
+                raise MapGenerationError(
+                    f"Cannot place {n_planets} planets on a {p.width / 2:g}x{p.height:g} half-map: "
+                    f"at most {int(capacity)} fit with radial_separation={p.radial_separation:g}; "
+                    f"use fewer planets, smaller separations or a larger map"
+                )
+
     def create_game(self) -> GameState:
         planets = []
         n_neutral = int(self.params.num_planets * self.params.initial_neutral_ratio) // 2
+        n_half = self.params.num_planets // 2
+        self.check_feasible(n_half)
 
-        while len(planets) < self.params.num_planets // 2:
-            player = Player.Neutral if len(planets) < n_neutral else Player.Player1
-            candidate = self.make_random_planet(player)
-            if self.can_add(planets, candidate, self.params.radial_separation):
-                planets.append(candidate)
+        # the grid only skips planets too far away to clash, so maps are the same as with a full scan
+        max_radius = self.params.max_growth_rate * self.params.growth_to_radius_factor
+        grid = PlanetGrid(max(self.params.radial_separation * 2 * max_radius, 1.0))
+        retries = 0
+        while len(planets) < n_half:
+            x, y, num_ships, growth_rate, radius = self.random_planet_values()
+            if not self.fits(x, y, radius, self.params.radial_separation, grid.neighbours(x, y)):
+                retries += 1
+                if retries > self.max_retries:
+                    raise MapGenerationError(
+                        f"Placed only {len(planets)} of {n_half} planets: {self.max_retries} candidates "
+                        f"in a row were rejected, the map is too crowded for these GameParams"
+                    )
+                continue
+            retries = 0
+            grid.add(x, y, radius)
+            planets.append(Planet(
+                owner=Player.Neutral if len(planets) < n_neutral else Player.Player1,
+                n_ships=num_ships,
+                position=Vec2d(x=x, y=y),
+                growth_rate=growth_rate,
+                radius=radius
+            ))
 
         reflected_planets = []
         for planet in planets:
@@ -0,0 +1,116 @@
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from core.game_state import CamelModel, Player
+
+# per-call RPC deadlines used by the league: league.run_agents_from_db and league.run_agents_uniform
+LEAGUE_BUDGET_MS = 50.0
+UNIFORM_LEAGUE_BUDGET_MS = 200.0
+
+
+class LatencySummary(CamelModel):
+    agent_type: str
+    n_calls: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    budget_ms: float
+    n_over_budget: int
+
+    @staticmethod
+    def from_samples(agent_type: str, samples_ms: List[float], budget_ms: float) -> 'LatencySummary':
+        if not samples_ms:
+            return LatencySummary(agent_type=agent_type, n_calls=0, p50_ms=0.0, p95_ms=0.0, p99_ms=0.0,
+                                  max_ms=0.0, budget_ms=budget_ms, n_over_budget=0)
+        samples = np.asarray(samples_ms)
+        p50, p95, p99 = np.percentile(samples, [50, 95, 99]).tolist()
+        return LatencySummary(
+            agent_type=agent_type,
+            n_calls=len(samples),
+            p50_ms=p50,
+            p95_ms=p95,
+            p99_ms=p99,
+            max_ms=float(samples.max()),
+            budget_ms=budget_ms,
+            n_over_budget=int((samples > budget_ms).sum())
+        )
+
+    def row(self) -> str:
+        return (
+            f"{self.agent_type:<30} {self.n_calls:>8} {self.p50_ms:>9.3f} {self.p95_ms:>9.3f} "
+            f"{self.p99_ms:>9.3f} {self.max_ms:>9.3f} {self.n_over_budget:>6}"
+        )
+
+
+class GameLatency:
+    """get_action latencies, in ms, of both seats in one game."""
+
+    def __init__(self, game_index: int, agent_types: Dict[Player, str]):
+        self.game_index = game_index
+        self.agent_types = agent_types
+        self.samples_ms: Dict[Player, List[float]] = {player: [] for player in agent_types}
+
+
+class LatencyProfiler:
+    """
+    Opt-in record of how long each get_action call takes, filled in by a GameRunner
+    given profiler=LatencyProfiler(). Reports can be broken down per game and seat or
+    pooled per agent type, with the number of calls slower than budget_ms.
+    """
+
+    def __init__(self, budget_ms: float = LEAGUE_BUDGET_MS):
+        self.budget_ms = budget_ms
+        self.games: List[GameLatency] = []
+
+    def start_game(self, agent_types: Dict[Player, str]):
+        # a game that was set up but never played (GameRunner sets one up on construction) is dropped
+        if self.games and not any(self.games[-1].samples_ms.values()):
+            self.games.pop()
+        self.games.append(GameLatency(len(self.games), agent_types))
+
+    def record(self, player: Player, seconds: float):
+        self.games[-1].samples_ms[player].append(seconds * 1000)
+
+    def game_summaries(self, game_index: int) -> Dict[Player, LatencySummary]:
+        game = self.games[game_index]
+        return {
+            player: LatencySummary.from_samples(game.agent_types[player], samples, self.budget_ms)
+            for player, samples in game.samples_ms.items()
+        }
+
+    def agent_type_summaries(self) -> Dict[str, LatencySummary]:
+        pooled: Dict[str, List[float]] = {}
+        for game in self.games:
+            for player, samples in game.samples_ms.items():
+                pooled.setdefault(game.agent_types[player], []).extend(samples)
+        return {
+            agent_type: LatencySummary.from_samples(agent_type, samples, self.budget_ms)
+            for agent_type, samples in pooled.items()
+        }
+
+    def report(self, per_game: bool = False) -> str:
+        header = f"{'agent type':<30} {'calls':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9} " \
+                 f"{'> ' + format(self.budget_ms, 'g'):>6}"
+        lines = [header]
+        lines.extend(summary.row() for summary in self.agent_type_summaries().values())
+        if per_game:
+            for game in self.games:
+                lines.append(f"game {game.game_index}:")
+                for player, summary in self.game_summaries(game.game_index).items():
+                    lines.append(f"  {player.value:<8} {summary.row()}")
+        return "\n".join(lines)
+
+    def within_budget(self, agent_type: Optional[str] = None) -> bool:
+        """
+        True if no call (of the given agent type, or of any agent) took longer than the budget.
+        Raises ValueError for an agent type that was never profiled, which is usually a misspelt name.
+        """
+        summaries = self.agent_type_summaries()
+        if agent_type is not None:
+            if agent_type not in summaries:
+                raise ValueError(f"No get_action calls recorded for agent type {agent_type!r}; "
+                                 f"profiled types: {sorted(summaries)}")
+            summaries = {agent_type: summaries[agent_type]}
+        return all(summary.n_over_budget == 0 for summary in summaries.values())
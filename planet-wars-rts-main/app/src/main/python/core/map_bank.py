@@ -0,0 +1,152 @@
+import hashlib
+import json
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from core.array_forward_model import PLAYER_CODES, CODE_PLAYERS
+from core.game_state import GameState, GameParams, Planet, Vec2d
+from core.game_state_factory import GameStateFactory, derive_seed
+
+
+# GameParams fields that affect map generation; the rest (max_ticks, speed, ...) don't change the maps
+MAP_PARAM_FIELDS = (
+    "width", "height", "edge_separation", "radial_separation", "growth_to_radius_factor",
+    "num_planets", "initial_neutral_ratio", "min_initial_ships_per_planet",
+    "max_initial_ships_per_planet", "min_growth_rate", "max_growth_rate",
+)
+
+# one record per planet, full float64 precision so banked maps equal freshly generated ones
+PLANET_DTYPE = np.dtype([
+    ("owner", np.int8),
+    ("n_ships", np.float64),
+    ("x", np.float64),
+    ("y", np.float64),
+    ("growth_rate", np.float64),
+    ("radius", np.float64),
+])
+
+MAPS_PER_TASK = 64
+
+
+def map_params_hash(params: GameParams) -> str:
+    fields = {name: getattr(params, name) for name in MAP_PARAM_FIELDS}
+    return hashlib.sha1(json.dumps(fields, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def encode_map(state: GameState) -> np.ndarray:
+    record = np.zeros(len(state.planets), dtype=PLANET_DTYPE)
+    for i, planet in enumerate(state.planets):
+        record[i] = (PLAYER_CODES[planet.owner], planet.n_ships, planet.position.x, planet.position.y,
+                     planet.growth_rate, planet.radius)
+    return record
+
+
+def decode_map(record: np.ndarray) -> GameState:
+    planets = [
+        Planet(
+            owner=CODE_PLAYERS[row["owner"]],
+            n_ships=float(row["n_ships"]),
+            position=Vec2d(x=float(row["x"]), y=float(row["y"])),
+            growth_rate=float(row["growth_rate"]),
+            radius=float(row["radius"]),
+            id=i
+        )
+        for i, row in enumerate(record)
+    ]
+    return GameState(planets=planets)
+
+
+def generate_maps(params: GameParams, seeds: Sequence[int]) -> np.ndarray:
+    return np.stack([encode_map(GameStateFactory(params, seed).create_game()) for seed in seeds])
+
+
+class MapBank:
+    """
+    Pre-generated maps for one set of GameParams, stored as a .npy file of planet records
+    (one row per map) and loaded with mmap, so drawing a map costs no rejection sampling.
+    Map i is the map GameStateFactory(params, map_seed(i)).create_game() produces,
+    so any banked game can be reproduced from its seed alone.
+    """
+
+    def __init__(self, params: GameParams, maps: np.ndarray, seed: int):
+        self.params = params
+        self.maps = maps
+        self.seed = seed
+
+    def __len__(self) -> int:
+        return len(self.maps)
+
+    def map_seed(self, index: int) -> int:
+        return derive_seed(self.seed, index)
+
+    def get_game(self, index: int) -> GameState:
+        return decode_map(self.maps[index])
+
+    @staticmethod
+    def generate(params: GameParams, n_maps: int, seed: int = 0, n_workers: Optional[int] = None) -> 'MapBank':
+        seeds = [derive_seed(seed, i) for i in range(n_maps)]
+        tasks = [seeds[i:i + MAPS_PER_TASK] for i in range(0, n_maps, MAPS_PER_TASK)]
+        if n_workers == 1 or len(tasks) <= 1:
+            chunks: List[np.ndarray] = [generate_maps(params, task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=n_workers) as pool:
+                chunks = list(pool.map(generate_maps, [params] * len(tasks), tasks))
+        maps = np.concatenate(chunks) if chunks else np.zeros((0, params.num_planets), dtype=PLANET_DTYPE)
+        return MapBank(params, maps, seed)
+
+    @staticmethod
+    def paths(params: GameParams, directory: Path):
+        stem = Path(directory) / f"maps_{map_params_hash(params)}"
+        return stem.with_suffix(".npy"), stem.with_suffix(".json")
+
+    def save(self, directory: Path) -> Path:
+        maps_path, meta_path = MapBank.paths(self.params, directory)
+        maps_path.parent.mkdir(parents=True, exist_ok=True)
+        np.save(maps_path, self.maps)
+        meta = {
+            "seed": self.seed,
+            "n_maps": len(self),
+            "params": self.params.model_dump(by_alias=True, mode="json"),
+        }
+        meta_path.write_text(json.dumps(meta, indent=2))
+        return maps_path
+
+    @staticmethod
+    def load(params: GameParams, directory: Path) -> 'MapBank':
+        maps_path, meta_path = MapBank.paths(params, directory)
+        meta = json.loads(meta_path.read_text())
+        maps = np.load(maps_path, mmap_mode="r")
+        return MapBank(params, maps, meta["seed"])
+
+    @staticmethod
+    def load_or_generate(params: GameParams, n_maps: int, directory: Path, seed: int = 0,
+                         n_workers: Optional[int] = None) -> 'MapBank':
+        maps_path, meta_path = MapBank.paths(params, directory)
+        if maps_path.exists() and meta_path.exists():
+            bank = MapBank.load(params, directory)
+            if bank.seed == seed and len(bank) >= n_maps:
+                return bank
+        MapBank.generate(params, n_maps, seed, n_workers).save(directory)
+        return MapBank.load(params, directory)
+
+
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    params = GameParams(num_planets=20)
+    with tempfile.TemporaryDirectory() as directory:
+        t0 = time.time()
+        bank = MapBank.load_or_generate(params, 1000, Path(directory), seed=42)
+        t1 = time.time()
+        print(f"Generated {len(bank)} maps in {t1 - t0:.2f} s")
+
+        t0 = time.time()
+        for i in range(len(bank)):
+            bank.get_game(i)
+        t1 = time.time()
+        print(f"Drawing a banked map: {(t1 - t0) * 1000 / len(bank):.3f} ms")
+        assert bank.get_game(7) == GameStateFactory(params, bank.map_seed(7)).create_game()
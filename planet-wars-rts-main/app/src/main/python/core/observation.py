@@ -0,0 +1,148 @@
+from typing import AbstractSet, Dict, List, Optional, Tuple
+
+from pydantic import ConfigDict
+
+from core.game_state import CamelModel, GameState, Player, Vec2d, construct_unvalidated
+
+
+# --- Partial observations, as in Observation.kt: the JSON matches the Kotlin classes ---
+# Observations are frozen like the Kotlin data classes, and their vectors are FrozenVec2d copies,
+# so an agent can keep or share them but cannot change them, nor the state they came from.
+
+class FrozenVec2d(Vec2d):
+    model_config = ConfigDict(frozen=True)
+
+    # equal to a Vec2d with the same coordinates, so observations compare equal after a JSON round trip
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Vec2d):
+            return self.x == other.x and self.y == other.y
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash((self.x, self.y))
+
+
+class TransporterObservation(CamelModel):
+    model_config = ConfigDict(frozen=True)
+
+    s: Vec2d
+    v: Vec2d
+    owner: Player
+    source_index: int
+    destination_index: int
+    n_ships: Optional[float]  # None when hidden
+
+
+class PlanetObservation(CamelModel):
+    model_config = ConfigDict(frozen=True)
+
+    owner: Player
+    n_ships: Optional[float]  # None when hidden
+    position: Vec2d
+    growth_rate: float
+    radius: float
+    transporter: Optional[TransporterObservation] = None
+    id: int = -1
+
+
+class Observation(CamelModel):
+    model_config = ConfigDict(frozen=True)
+
+    observed_planets: List[PlanetObservation]
+    game_tick: int
+
+
+def _frozen_copy(vector: Vec2d) -> FrozenVec2d:
+    return construct_unvalidated(FrozenVec2d, {"x": vector.x, "y": vector.y})
+
+
+class ObservationFactory:
+    """
+    Builds what a set of observers can see of a GameState, with the rules of the Kotlin ObservationFactory:
+    ship counts are hidden on planets and transporters the observers don't own, and other players'
+    transporters are left out altogether unless include_transporter_locations is set.
+    Nothing is validated or deep-copied. Planet positions never change, so a factory keeps its
+    copies of them until reset(), which should be called when a new map starts; one factory
+    can serve both seats of a game.
+    """
+
+    def __init__(self, include_transporter_locations: bool = True):
+        self.include_transporter_locations = include_transporter_locations
+        self.positions: List[FrozenVec2d] = []
+        # per source planet, the last transporter vectors seen and their copies: the ForwardModel
+        # replaces s every tick but never mutates a Vec2d, so unchanged vectors are copied once
+        self.transporter_vectors: Dict[int, Tuple[Vec2d, Vec2d, FrozenVec2d, FrozenVec2d]] = {}
+
+    def reset(self):
+        self.positions = []
+        self.transporter_vectors = {}
+
+    def frozen_vectors(self, slot: int, s: Vec2d, v: Vec2d) -> Tuple[FrozenVec2d, FrozenVec2d]:
+        cached = self.transporter_vectors.get(slot)
+        if cached is None or cached[1] is not v:
+            cached = (s, v, _frozen_copy(s), _frozen_copy(v))
+        elif cached[0] is not s:
+            cached = (s, v, _frozen_copy(s), cached[3])
+        else:
+            return cached[2], cached[3]
+        self.transporter_vectors[slot] = cached
+        return cached[2], cached[3]
+
+    @staticmethod
+    def create(state: GameState, observers: AbstractSet[Player], include_transporter_locations: bool = True) -> Observation:
+        return ObservationFactory(include_transporter_locations).observe(state, observers)
+
+    def observe(self, state: GameState, observers: AbstractSet[Player]) -> Observation:
+        planets = state.planets
+        if len(self.positions) != len(planets):
+            self.positions = [_frozen_copy(planet.position) for planet in planets]
+        positions = self.positions
+        include_transporters = self.include_transporter_locations
+        observed = []
+        for i, planet in enumerate(planets):
+            owned = planet.owner in observers
+            transporter = planet.transporter
+            seen = None
+            if transporter is not None:
+                own_transporter = transporter.owner in observers
+                # on the observers' own planets their transporters are always seen
+                if include_transporters or (owned and own_transporter):
+                    frozen_s, frozen_v = self.frozen_vectors(i, transporter.s, transporter.v)
+                    seen = construct_unvalidated(TransporterObservation, {
+                        "s": frozen_s, "v": frozen_v,
+                        "owner": transporter.owner, "source_index": transporter.source_index,
+                        "destination_index": transporter.destination_index,
+                        "n_ships": transporter.n_ships if owned and own_transporter else None,
+                    })
+            observed.append(construct_unvalidated(PlanetObservation, {
+                "owner": planet.owner,
+                "n_ships": planet.n_ships if owned else None,
+                "position": positions[i],
+                "growth_rate": planet.growth_rate,
+                "radius": planet.radius,
+                "transporter": seen,
+                "id": planet.id,
+            }))
+        return construct_unvalidated(Observation, {"observed_planets": observed, "game_tick": state.game_tick})
+
+
+if __name__ == "__main__":
+    import time
+    from core.game_state import GameParams
+    from core.game_state_factory import GameStateFactory
+
+    state = GameStateFactory(GameParams(num_planets=20)).create_game()
+    observation = ObservationFactory.create(state, {Player.Player1})
+    print(observation.observed_planets[0])
+    assert Observation.model_validate_json(observation.model_dump_json(by_alias=True)) == observation
+
+    n = 10000
+    t0 = time.perf_counter()
+    for _ in range(n):
+        ObservationFactory.create(state, {Player.Player1})
+    t1 = time.perf_counter()
+    for _ in range(n // 10):
+        state.model_copy(deep=True)
+    t2 = time.perf_counter()
+    print(f"ObservationFactory.create: {(t1 - t0) * 1e6 / n:.1f} us, "
+          f"deep copy of the state: {(t2 - t1) * 1e6 / (n // 10):.1f} us")
@@ -0,0 +1,125 @@
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from agents.planet_wars_agent import PlanetWarsAgent
+from core.engine_stats import EngineStats
+from core.game_runner import GameRunner
+from core.game_state import GameParams, Player
+from core.game_state_factory import derive_seed
+
+# builds a fresh agent; must be picklable, e.g. an agent class or a functools.partial, not a lambda
+AgentFactory = Callable[[], PlanetWarsAgent]
+
+
+def agent_seed(seed: int, game_index: int) -> int:
+    # a stream of its own, so agent randomness is independent of the map drawn from derive_seed(seed, game_index)
+    return derive_seed(derive_seed(seed, game_index), 0)
+
+
+class GlobalRandomState:
+    """
+    A private stream for the global random and numpy.random generators, which agents draw from.
+    Inside a `with` block the generators run from this stream; on leaving, the stream's progress
+    is kept for the next block and the caller's generator state is put back untouched.
+    """
+
+    def __init__(self, seed: int):
+        caller = random.getstate(), np.random.get_state()
+        random.seed(seed)
+        np.random.seed(seed % 2 ** 32)
+        self.state = random.getstate(), np.random.get_state()
+        self.caller = caller
+        self.restore(caller)
+
+    @staticmethod
+    def restore(state):
+        random.setstate(state[0])
+        np.random.set_state(state[1])
+
+    def __enter__(self) -> 'GlobalRandomState':
+        self.caller = random.getstate(), np.random.get_state()
+        self.restore(self.state)
+        return self
+
+    def __exit__(self, *exc_info):
+        self.state = random.getstate(), np.random.get_state()
+        self.restore(self.caller)
+
+
+def play_games(agent1_factory: AgentFactory, agent2_factory: AgentFactory, game_params: GameParams,
+               seed: int, game_indices: Sequence[int], recorder=None) -> Tuple[List[Player], EngineStats]:
+    """
+    Plays the given games and returns their winners and engine stats.
+    Game i depends only on seed and i: it is played on map i of a GameRunner seeded with seed
+    (or on its first map when new_map_each_run is off), by freshly built agents, with the global
+    random and numpy.random generators seeded for that game. So it has the same outcome in any worker.
+    The caller's own global generator state is left as it was.
+    An optional recorder is handed to the GameRunner, as in GameRunner(recorder=...).
+    """
+    runner = GameRunner(agent1_factory(), agent2_factory(), game_params, seed=seed, recorder=recorder)
+    winners = []
+    for game_index in game_indices:
+        with GlobalRandomState(agent_seed(seed, game_index)):
+            runner.agent1 = agent1_factory()
+            runner.agent2 = agent2_factory()
+            map_index = game_index if game_params.new_map_each_run else None
+            winners.append(runner.run_game(map_index).get_leader())
+    return winners, runner.stats
+
+
+class ParallelGameRunner:
+    """
+    Runs games over a ProcessPoolExecutor. Results are bit-identical for any number of workers,
+    as each game is seeded from the master seed and its index alone (see play_games).
+    Agents are created from picklable factories inside the workers, once per game.
+    """
+
+    def __init__(self, agent1_factory: AgentFactory, agent2_factory: AgentFactory, game_params: GameParams,
+                 seed: int = 0, n_workers: Optional[int] = None, games_per_task: int = 8):
+        self.agent1_factory = agent1_factory
+        self.agent2_factory = agent2_factory
+        self.game_params = game_params
+        self.seed = seed
+        self.n_workers = n_workers
+        self.games_per_task = games_per_task
+        # engine counters merged from every worker
+        self.stats = EngineStats()
+
+    def run_winners(self, n_games: int) -> List[Player]:
+        """Winners of games 0 .. n_games - 1, in game order."""
+        tasks = [range(i, min(i + self.games_per_task, n_games)) for i in range(0, n_games, self.games_per_task)]
+        if self.n_workers == 1 or len(tasks) <= 1:
+            results = [play_games(self.agent1_factory, self.agent2_factory, self.game_params, self.seed, task)
+                       for task in tasks]
+        else:
+            n = len(tasks)
+            with ProcessPoolExecutor(max_workers=self.n_workers) as pool:
+                results = list(pool.map(play_games, [self.agent1_factory] * n, [self.agent2_factory] * n,
+                                        [self.game_params] * n, [self.seed] * n, tasks))
+        for _, stats in results:
+            self.stats.merge(stats)
+        return [winner for winners, _ in results for winner in winners]
+
+    def run_games(self, n_games: int) -> Dict[Player, int]:
+        scores = {Player.Player1: 0, Player.Player2: 0, Player.Neutral: 0}
+        for winner in self.run_winners(n_games):
+            scores[winner] += 1
+        return scores
+
+
+if __name__ == "__main__":
+    import time
+    from agents.random_agents import CarefulRandomAgent, PureRandomAgent
+
+    game_params = GameParams(num_planets=10)
+    n_games = 40
+    for n_workers in (1, 4):
+        runner = ParallelGameRunner(CarefulRandomAgent, PureRandomAgent, game_params, seed=42, n_workers=n_workers)
+        t0 = time.time()
+        results = runner.run_games(n_games)
+        t1 = time.time()
+        print(f"{n_workers} worker(s): {results}, {(t1 - t0) * 1000 / n_games:.3f} ms per game")
+        print(runner.stats.summary())
@@ -0,0 +1,67 @@
+import math
+from typing import TYPE_CHECKING, List, Sequence
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from core.game_state import GameState, Planet
+
+
+class SpatialIndex:
+    """
+    Distances, travel times and nearest neighbours between the planets of one map, which never
+    change during a game. Matrices are indexed by planet id and read-only; distance_rows and
+    eta_rows hold the same values as Python lists, which are faster for single lookups.
+    """
+
+    def __init__(self, xs: List[float], ys: List[float], transporter_speed: float):
+        self.transporter_speed = transporter_speed
+        self.xs = list(xs)
+        self.ys = list(ys)
+        # same arithmetic as Vec2d.distance, so agents make the same choices as with positions
+        self.distance = np.array([[math.sqrt((x - other_x) ** 2 + (y - other_y) ** 2)
+                                   for other_x, other_y in zip(xs, ys)]
+                                  for x, y in zip(xs, ys)]).reshape(len(xs), len(xs))
+        self.eta = self.distance / transporter_speed if transporter_speed > 0 else \
+            np.where(self.distance > 0, np.inf, 0.0)
+        # planet ids ordered by distance, nearest first, without the planet itself
+        order = np.argsort(self.distance, axis=1, kind="stable")
+        n = len(xs)
+        self.neighbours = np.array([row[row != i] for i, row in enumerate(order)], dtype=np.int64) \
+            .reshape(n, max(n - 1, 0))
+        for array in (self.distance, self.eta, self.neighbours):
+            array.flags.writeable = False
+        self.distance_rows: List[List[float]] = self.distance.tolist()
+        self.eta_rows: List[List[float]] = self.eta.tolist()
+
+    # immutable, so copies of a GameState can share it
+    def __copy__(self) -> 'SpatialIndex':
+        return self
+
+    def __deepcopy__(self, memo=None) -> 'SpatialIndex':
+        return self
+
+    @staticmethod
+    def from_game_state(state: 'GameState', transporter_speed: float) -> 'SpatialIndex':
+        xs = [planet.position.x for planet in state.planets]
+        ys = [planet.position.y for planet in state.planets]
+        return SpatialIndex(xs, ys, transporter_speed)
+
+    @property
+    def n_planets(self) -> int:
+        return len(self.distance_rows)
+
+    def matches(self, planets: Sequence['Planet']) -> bool:
+        """Whether planets are those of the map the index was built for: same number, same positions."""
+        return len(planets) == len(self.xs) and all(
+            planet.position.x == x and planet.position.y == y for planet, x, y in zip(planets, self.xs, self.ys))
+
+    def dist(self, i: int, j: int) -> float:
+        return self.distance_rows[i][j]
+
+    def eta_between(self, i: int, j: int) -> float:
+        return self.eta_rows[i][j]
+
+    def nearest(self, i: int, k: int) -> np.ndarray:
+        """The k planets nearest to planet i, nearest first."""
+        return self.neighbours[i, :k]
@@ -0,0 +1,103 @@
+import math
+from functools import lru_cache
+from typing import TYPE_CHECKING, Tuple
+
+if TYPE_CHECKING:
+    from core.game_state import GameState, Transporter, Vec2d
+
+# Zobrist-style hashing: a state hashes to the XOR of one 64-bit key per feature, so a step
+# only has to XOR out the features it changed and XOR in the new ones.
+# Keys come from a splitmix64 mix of the feature's values instead of a random table,
+# since ship counts and transporter progress are unbounded.
+
+MASK64 = (1 << 64) - 1
+
+# ships are hashed as floor(n_ships / SHIP_QUANTUM), so states whose ship counts only
+# differ by fractions of a ship are treated as the same position
+SHIP_QUANTUM = 1.0
+
+# owners as codes; Player is a str enum, so Player members look up the same entries
+OWNER_CODES = {"Neutral": 0, "Player1": 1, "Player2": 2}
+
+# the owner a feature has in the point-reflected state, where the players swap sides
+MIRRORED_OWNER = (0, 2, 1)
+
+PLANET_FEATURE = 1
+TRANSPORTER_FEATURE = 2
+TICK_FEATURE = 3
+
+
+def mix64(x: int) -> int:
+    x = (x + 0x9E3779B97F4A7C15) & MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & MASK64
+    return x ^ (x >> 31)
+
+
+@lru_cache(maxsize=1 << 16)
+def feature_key(*values: int) -> int:
+    h = 0
+    for value in values:
+        h = mix64(h ^ (value & MASK64))
+    return h
+
+
+def quantize(n_ships: float) -> int:
+    return math.floor(n_ships / SHIP_QUANTUM)
+
+
+def mirrored_index(index: int, n_planets: int) -> int:
+    # GameStateFactory puts the reflection of planet i at i + n_planets / 2
+    return (index + n_planets // 2) % n_planets
+
+
+def tick_key(game_tick: int) -> int:
+    return feature_key(TICK_FEATURE, game_tick)
+
+
+def planet_keys(n_planets: int, planet_id: int, owner: str, n_ships: float) -> Tuple[int, int]:
+    """Key of a planet feature in the state itself and in its point reflection."""
+    code = OWNER_CODES[owner]
+    q = quantize(n_ships)
+    return (
+        feature_key(PLANET_FEATURE, planet_id, code, q),
+        feature_key(PLANET_FEATURE, mirrored_index(planet_id, n_planets), MIRRORED_OWNER[code], q),
+    )
+
+
+def transporter_steps(transporter: 'Transporter', source_position: 'Vec2d') -> int:
+    """Ticks the transporter has flown since launch; it moves by v every tick along a fixed line."""
+    speed = transporter.v.mag()
+    if speed == 0:
+        return 0
+    return round(transporter.s.distance(source_position) / speed)
+
+
+def transporter_keys(n_planets: int, transporter: 'Transporter', steps: int) -> Tuple[int, int]:
+    code = OWNER_CODES[transporter.owner]
+    q = quantize(transporter.n_ships)
+    return (
+        feature_key(TRANSPORTER_FEATURE, transporter.source_index, transporter.destination_index,
+                    code, q, steps),
+        feature_key(TRANSPORTER_FEATURE, mirrored_index(transporter.source_index, n_planets),
+                    mirrored_index(transporter.destination_index, n_planets),
+                    MIRRORED_OWNER[code], q, steps),
+    )
+
+
+def compute_hashes(state: 'GameState') -> Tuple[int, int]:
+    """Full recomputation of the board hash and mirrored board hash (the tick is not included)."""
+    n_planets = len(state.planets)
+    h = 0
+    mh = 0
+    for planet in state.planets:
+        key, mirror_key = planet_keys(n_planets, planet.id, planet.owner, planet.n_ships)
+        h ^= key
+        mh ^= mirror_key
+        transporter = planet.transporter
+        if transporter is not None:
+            steps = transporter_steps(transporter, planet.position)
+            key, mirror_key = transporter_keys(n_planets, transporter, steps)
+            h ^= key
+            mh ^= mirror_key
+    return h, mh
@@ -0,0 +1,136 @@
+import copy
+from typing import Any
+
+from pydantic import BaseModel
+
+
+class ReadOnlyStateError(TypeError):
+    pass
+
+
+# methods that change the model they are called on, or hand out a copy sharing its planets
+MUTATING_METHODS = frozenset({"ensure_writable", "invalidate_hash", "set_cached_hashes", "copy"})
+
+
+def read_only(value: Any) -> Any:
+    """Wraps models in ReadOnlyViews and lists in ReadOnlyLists of views; plain values are returned as is."""
+    if isinstance(value, (ReadOnlyView, ReadOnlyList)):
+        return value
+    if isinstance(value, BaseModel):
+        return ReadOnlyView(value)
+    if isinstance(value, list):
+        return ReadOnlyList(read_only(item) for item in value)
+    return value
+
+
+def unwrap(value: Any) -> Any:
+    """The model behind a ReadOnlyView; anything else is returned as is."""
+    return object.__getattribute__(value, "_target") if isinstance(value, ReadOnlyView) else value
+
+
+class ReadOnlyList(list):
+    """
+    A list of views that cannot be changed in place. It is still a list, so agents can iterate,
+    index, slice, concatenate (planets + [...]) and copy it; copies are plain lists of the same views.
+    """
+
+    __slots__ = ()
+
+    def _refuse(self, *args: Any, **kwargs: Any):
+        raise ReadOnlyStateError("Cannot change a list view: it is read-only; copy it with list(...) first")
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _refuse
+    append = extend = insert = pop = remove = clear = sort = reverse = _refuse
+
+    def __copy__(self) -> list:
+        return list(self)
+
+    def __deepcopy__(self, memo: Any = None) -> list:
+        return [copy.deepcopy(item, memo) for item in self]
+
+    def __reduce__(self):
+        return ReadOnlyList, (list(self),)
+
+
+class ReadOnlyView:
+    """
+    Zero-copy, frozen view of a live model such as the GameState held by a ForwardModel.
+    Reads go straight to the underlying model and nested models and lists come back
+    as views too, so agents can inspect the state but any assignment raises ReadOnlyStateError.
+    The view is live: it always shows the current state, not a snapshot.
+    Private and dunder attributes such as __dict__ are not forwarded, and methods that would
+    change the model (MUTATING_METHODS) raise ReadOnlyStateError instead of being handed out.
+    Copying a view (model_copy, fast_clone, copy.copy or copy.deepcopy) gives an independent copy,
+    which is what an agent should use for its own simulations.
+    isinstance checks see the wrapped type, so a view of a GameState passes isinstance(view, GameState).
+    """
+
+    __slots__ = ("_target", "_wrapped")
+
+    def __init__(self, target: BaseModel):
+        object.__setattr__(self, "_target", target)
+        # views of nested models and lists, reused while the underlying object is unchanged
+        object.__setattr__(self, "_wrapped", {})
+
+    @property
+    def __class__(self):
+        return type(self._target)
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(f"'{type(self._target).__name__}' view has no attribute '{name}'")
+        if name in MUTATING_METHODS:
+            raise ReadOnlyStateError(f"Cannot call '{name}': {type(self._target).__name__} view is read-only")
+        value = getattr(self._target, name)
+        if not isinstance(value, (BaseModel, list)):
+            return value
+        cached = self._wrapped.get(name)
+        if cached is not None and cached[0] is value:
+            return cached[1]
+        view = read_only(value)
+        self._wrapped[name] = (value, view)
+        return view
+
+    def __setattr__(self, name: str, value: Any):
+        raise ReadOnlyStateError(f"Cannot set '{name}': {type(self._target).__name__} view is read-only")
+
+    def __delattr__(self, name: str):
+        raise ReadOnlyStateError(f"Cannot delete '{name}': {type(self._target).__name__} view is read-only")
+
+    def model_copy(self, *, update: Any = None, deep: bool = False) -> BaseModel:
+        # a shallow copy would share mutable objects with the live state, so always copy deeply
+        return self._target.model_copy(update=update, deep=True)
+
+    def fast_clone(self, copy_on_write: bool = False) -> BaseModel:
+        # a copy-on-write clone would share the live planets, so always take a private copy
+        return self._target.fast_clone()
+
+    def __copy__(self) -> BaseModel:
+        return self._target.model_copy(deep=True)
+
+    def __deepcopy__(self, memo: Any = None) -> BaseModel:
+        return self._target.model_copy(deep=True)
+
+    def __reduce__(self):
+        return read_only, (self._target,)
+
+    def __eq__(self, other: Any) -> bool:
+        return self._target == unwrap(other)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return repr(self._target)
+
+    def __str__(self) -> str:
+        return str(self._target)
+
+    # arithmetic is looked up on the type, not through __getattr__, so Vec2d operators are forwarded
+    def __add__(self, other: Any) -> Any:
+        return self._target + unwrap(other)
+
+    def __sub__(self, other: Any) -> Any:
+        return self._target - unwrap(other)
+
+    def __mul__(self, other: Any) -> Any:
+        return self._target * unwrap(other)
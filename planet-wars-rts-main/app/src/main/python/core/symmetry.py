@@ -0,0 +1,84 @@
+from typing import TypeVar, Union
+
+import numpy as np
+
+from core.array_forward_model import ArrayGameState, NEUTRAL, PLAYER1, PLAYER2
+from core.batch_forward_model import BatchActions, BatchGameState
+from core.game_state import Action, GameParams, GameState, MIRRORED_PLAYER
+
+# GameStateFactory maps are point reflections through the centre with the seats swapped:
+# planet i and planet mirrored_index(i) (core.state_hash) are each other's reflection.
+# These transforms carry states and actions over to the mirrored game, as GameState.mirrored does,
+# so an agent written for one seat can play the other, and every recorded decision has a twin.
+
+# owner codes after the seats are swapped
+MIRRORED_CODES = np.array([NEUTRAL, PLAYER2, PLAYER1], dtype=np.int8)
+
+ArrayState = TypeVar("ArrayState", ArrayGameState, BatchGameState)
+
+
+def mirror_permutation(n_planets: int) -> np.ndarray:
+    """Planet i of the mirrored game is planet mirror_permutation(n)[i] of the original, and vice versa."""
+    return (np.arange(n_planets) + n_planets // 2) % n_planets
+
+
+def mirror_planet_ids(ids: np.ndarray, n_planets: int) -> np.ndarray:
+    """Maps planet ids to the mirrored game, leaving negative ids (no planet) as they are."""
+    ids = np.asarray(ids)
+    return np.where(ids >= 0, (ids + n_planets // 2) % n_planets, ids)
+
+
+def mirror_action(action: Action, n_planets: int) -> Action:
+    if action is Action.DO_NOTHING or action.source_planet_id < 0:
+        return action
+    return Action(
+        player_id=MIRRORED_PLAYER[action.player_id],
+        source_planet_id=(action.source_planet_id + n_planets // 2) % n_planets,
+        destination_planet_id=(action.destination_planet_id + n_planets // 2) % n_planets,
+        num_ships=action.num_ships
+    )
+
+
+def mirror_batch_actions(actions: BatchActions, n_planets: int) -> BatchActions:
+    return BatchActions(
+        mirror_planet_ids(actions.source, n_planets),
+        mirror_planet_ids(actions.destination, n_planets),
+        actions.num_ships.copy()
+    )
+
+
+def mirror_arrays(state: ArrayState, params: GameParams) -> ArrayState:
+    """
+    GameState.mirrored for an ArrayGameState or a BatchGameState (planets on the last axis).
+    Geometry is shared with the original, everything else is a permuted copy.
+    """
+    m = mirror_permutation(state.owner.shape[-1])
+    mirrored = type(state).__new__(type(state))
+    mirrored.growth = state.growth
+    mirrored.radius = state.radius
+    mirrored.x = state.x
+    mirrored.y = state.y
+    mirrored.owner = MIRRORED_CODES[state.owner[..., m]]
+    mirrored.ships = state.ships[..., m]
+    mirrored.t_active = state.t_active[..., m]
+    mirrored.t_owner = MIRRORED_CODES[state.t_owner[..., m]]
+    mirrored.t_x = params.width - state.t_x[..., m]
+    mirrored.t_y = params.height - state.t_y[..., m]
+    mirrored.t_vx = -state.t_vx[..., m]
+    mirrored.t_vy = -state.t_vy[..., m]
+    mirrored.t_dest = mirror_planet_ids(state.t_dest[..., m], len(m)).astype(state.t_dest.dtype)
+    mirrored.t_ships = state.t_ships[..., m]
+    mirrored.game_tick = state.game_tick.copy() if isinstance(state.game_tick, np.ndarray) else state.game_tick
+    return mirrored
+
+
+def is_point_symmetric(state: Union[GameState, ArrayGameState], params: GameParams, tolerance: float = 1e-9) -> bool:
+    """Whether planet geometry is symmetric under the reflection, which mirroring assumes."""
+    arrays = ArrayGameState.from_game_state(state) if isinstance(state, GameState) else state
+    if arrays.n_planets % 2:
+        return False
+    m = mirror_permutation(arrays.n_planets)
+    return bool(np.allclose(arrays.x[m], params.width - arrays.x, rtol=0, atol=tolerance)
+                and np.allclose(arrays.y[m], params.height - arrays.y, rtol=0, atol=tolerance)
+                and np.array_equal(arrays.growth[m], arrays.growth)
+                and np.array_equal(arrays.radius[m], arrays.radius))
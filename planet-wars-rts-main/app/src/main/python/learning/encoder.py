@@ -0,0 +1,184 @@
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from core.array_forward_model import PLAYER_CODES
+from core.game_state import GameParams, GameState, Player
+from core.spatial_index import SpatialIndex
+from core.symmetry import mirror_permutation, mirror_planet_ids
+from learning.trajectories import NO_PLANET, transporter_eta
+
+# per-planet channels; mine / theirs / neutral are one-hot ownership from the encoder's seat
+PLANET_CHANNELS = ("mine", "theirs", "neutral", "n_ships", "growth_rate", "radius", "x", "y")
+# per-transporter channels, in slot i for the transporter launched from planet i (zeros when there is none)
+TRANSPORTER_CHANNELS = ("active", "mine", "theirs", "n_ships", "x", "y", "destination", "eta")
+# planet-to-planet channels; they depend on the map only
+PAIR_CHANNELS = ("distance", "eta")
+
+
+class StaticFeatures(NamedTuple):
+    growth_rate: np.ndarray
+    radius: np.ndarray
+    x: np.ndarray
+    y: np.ndarray
+    pairs: np.ndarray
+
+
+class Observation(NamedTuple):
+    planets: np.ndarray          # (num_planets, len(PLANET_CHANNELS)) float32
+    transporters: np.ndarray     # (num_planets, len(TRANSPORTER_CHANNELS)) float32
+    pairs: np.ndarray            # (num_planets, num_planets, len(PAIR_CHANNELS)) float32, read-only
+    action_mask: np.ndarray      # (num_planets, num_planets) bool, True where source -> destination is allowed
+
+
+class ObservationEncoder:
+    """
+    Encodes a GameState, as seen from one seat, into fixed-shape float32 arrays.
+    Planet geometry and the pairwise channels are built once per map from the state's
+    SpatialIndex and reused for as long as the planets' positions match it, so one encoder
+    can be used across maps. Only owners, ships and transporters are read from the state each tick.
+    Ownership, destinations and ETAs follow learning.trajectories, laid out as separate channels.
+    """
+
+    def __init__(self, params: GameParams, player: Player):
+        self.params = params
+        self.player = player
+        self.static: Optional[StaticFeatures] = None
+        self.static_index: Optional[SpatialIndex] = None
+        # the planets list the static features were last checked against
+        self.static_planets = None
+
+    def reset(self, player: Optional[Player] = None):
+        if player is not None:
+            self.player = player
+        self.static = None
+        self.static_index = None
+        self.static_planets = None
+
+    def static_features(self, state: GameState) -> StaticFeatures:
+        planets = state.planets
+        # a live state keeps its planets list from tick to tick, so positions are only compared on a new one
+        if planets is self.static_planets:
+            return self.static
+        if self.static is None or not self.static_index.matches(planets):
+            index = state.spatial_index(self.params.transporter_speed)
+            pairs = np.stack([index.distance, index.eta], axis=-1).astype(np.float32)
+            pairs.flags.writeable = False
+            self.static = StaticFeatures(
+                growth_rate=np.array([p.growth_rate for p in planets], dtype=np.float64),
+                radius=np.array([p.radius for p in planets], dtype=np.float64),
+                x=np.array([p.position.x for p in planets], dtype=np.float64),
+                y=np.array([p.position.y for p in planets], dtype=np.float64),
+                pairs=pairs,
+            )
+            self.static_index = index
+        self.static_planets = planets
+        return self.static
+
+    def encode(self, state: GameState) -> Observation:
+        static = self.static_features(state)
+        n = len(static.x)
+        owner = np.empty(n, dtype=np.int8)
+        ships = np.empty(n, dtype=np.float64)
+        launched = []
+        for i, planet in enumerate(state.planets):
+            owner[i] = PLAYER_CODES[planet.owner]
+            ships[i] = planet.n_ships
+            transporter = planet.transporter
+            if transporter is not None:
+                launched.append((i, PLAYER_CODES[transporter.owner], transporter.n_ships, transporter.s.x,
+                                 transporter.s.y, transporter.destination_index, transporter.v.x, transporter.v.y))
+
+        me = PLAYER_CODES[self.player]
+        mine = owner == me
+        neutral = owner == 0
+        planets = np.empty((n, len(PLANET_CHANNELS)), dtype=np.float32)
+        planets[:, 0] = mine
+        planets[:, 1] = ~mine & ~neutral
+        planets[:, 2] = neutral
+        planets[:, 3] = ships
+        planets[:, 4] = static.growth_rate
+        planets[:, 5] = static.radius
+        planets[:, 6] = static.x
+        planets[:, 7] = static.y
+
+        transporters = np.zeros((n, len(TRANSPORTER_CHANNELS)), dtype=np.float32)
+        transporters[:, 6] = NO_PLANET
+        busy = np.zeros(n, dtype=bool)
+        if launched:
+            slot, t_owner, t_ships, t_x, t_y, t_dest, t_vx, t_vy = (np.array(column) for column in zip(*launched))
+            t_dest = t_dest.astype(np.int64)
+            busy[slot] = True
+            transporters[slot, 0] = 1.0
+            transporters[slot, 1] = t_owner == me
+            transporters[slot, 2] = t_owner != me
+            transporters[slot, 3] = t_ships
+            transporters[slot, 4] = t_x
+            transporters[slot, 5] = t_y
+            transporters[slot, 6] = t_dest
+            transporters[slot, 7] = transporter_eta(t_x, t_y, t_vx, t_vy, static.x[t_dest], static.y[t_dest])
+
+        return Observation(planets, transporters, static.pairs, self.action_mask(mine, busy))
+
+    @staticmethod
+    def action_mask(mine: np.ndarray, busy: np.ndarray) -> np.ndarray:
+        """
+        Launches ForwardModel.apply_actions accepts: from an idle planet of ours to any planet.
+        Sending ships to the source itself is allowed by the rules but never useful, so it is masked out.
+        """
+        mask = np.repeat((mine & ~busy)[:, None], len(mine), axis=1)
+        np.fill_diagonal(mask, False)
+        return mask
+
+
+def mirror_observation(observation: Observation, params: GameParams) -> Observation:
+    """
+    The encoding of the mirrored game from the other seat (see GameState.mirrored), without re-encoding:
+    ownership channels are relative to the seat, so only planets, positions and destinations change.
+    """
+    m = mirror_permutation(len(observation.planets))
+    planets = observation.planets[m]
+    planets[:, 6] = params.width - planets[:, 6]
+    planets[:, 7] = params.height - planets[:, 7]
+    transporters = observation.transporters[m]
+    active = transporters[:, 0] > 0
+    transporters[active, 4] = params.width - transporters[active, 4]
+    transporters[active, 5] = params.height - transporters[active, 5]
+    transporters[:, 6] = mirror_planet_ids(transporters[:, 6].astype(np.int64), len(m))
+    # planet geometry maps onto itself, so the pair channels of a symmetric map are unchanged up to rounding
+    pairs = observation.pairs[m][:, m]
+    pairs.flags.writeable = False
+    return Observation(planets, transporters, pairs, observation.action_mask[m][:, m])
+
+
+if __name__ == "__main__":
+    import time
+    from agents.greedy_heuristic_agent import GreedyHeuristicAgent
+    from core.forward_model import ForwardModel
+    from core.game_state_factory import GameStateFactory
+    from learning.trajectories import state_features
+
+    params = GameParams(num_planets=50)
+    state = GameStateFactory(params, seed=1).create_game()
+    model = ForwardModel(state, params)
+    agents = {Player.Player1: GreedyHeuristicAgent(), Player.Player2: GreedyHeuristicAgent()}
+    for player, agent in agents.items():
+        agent.prepare_to_play_as(player, params)
+    for _ in range(100):
+        model.step({player: agent.get_action(model.state) for player, agent in agents.items()})
+
+    encoder = ObservationEncoder(params, Player.Player1)
+    observation = encoder.encode(model.state)
+    print({name: array.shape for name, array in observation._asdict().items()})
+    print(f"{int(observation.action_mask.sum())} valid launches, "
+          f"{int(observation.transporters[:, 0].sum())} transporters in flight")
+
+    n = 2000
+    t0 = time.perf_counter()
+    for _ in range(n):
+        encoder.encode(model.state)
+    t1 = time.perf_counter()
+    for _ in range(n):
+        state_features(model.state, Player.Player1)
+    t2 = time.perf_counter()
+    print(f"encode: {(t1 - t0) * 1e6 / n:.1f} us, state_features: {(t2 - t1) * 1e6 / n:.1f} us per state")
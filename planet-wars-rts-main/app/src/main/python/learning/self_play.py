@@ -0,0 +1,140 @@
+"""
+Self-play data generation: games between two agents, played over a process pool and streamed
+as Decisions into compressed shards for imitation learning.
+
+    python -m learning.self_play --games 10000 --workers 8 --output data/greedy_vs_turtle
+
+Game i is seeded from --seed and i alone (see core.parallel_runner.play_games), so a dataset
+is reproducible and identical for any number of workers.
+"""
+import argparse
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from agents.defensive_agent import DefensiveTurtleAgent
+from agents.greedy_heuristic_agent import GreedyHeuristicAgent
+from agents.random_agents import CarefulRandomAgent, PureRandomAgent
+from core.game_state import GameParams
+from core.parallel_runner import AgentFactory, play_games
+from learning.shards import DEFAULT_SHARD_BYTES, ShardWriter
+from learning.trajectories import DEFAULT_FLUSH_STEPS, TrajectoryRecorder, mirror_game
+
+AGENTS = {cls.__name__: cls for cls in (PureRandomAgent, CarefulRandomAgent, GreedyHeuristicAgent,
+                                        DefensiveTurtleAgent)}
+
+
+class GameSink:
+    """
+    TrajectoryRecorder sink that passes chunks and outcomes on to a ShardWriter, with mirror
+    following each chunk with its mirrored twin.
+    """
+
+    def __init__(self, writer: ShardWriter, game_params: GameParams, mirror: bool = False):
+        self.writer = writer
+        self.game_params = game_params
+        self.mirror = mirror
+
+    def add_chunk(self, game: int, chunk: Dict[str, np.ndarray]):
+        self.writer.add_chunk(game, chunk)
+        if self.mirror:
+            self.writer.add_chunk(game, mirror_game(chunk, self.game_params), mirrored=True)
+
+    def end_game(self, game: int, player1_outcome: int):
+        self.writer.end_game(game, player1_outcome)
+
+
+class ChunkLog:
+    """TrajectoryRecorder sink that keeps what it is sent, to replay it into another sink later."""
+
+    def __init__(self):
+        self.calls: List[Tuple[str, tuple]] = []
+
+    def add_chunk(self, game: int, chunk: Dict[str, np.ndarray]):
+        self.calls.append(("add_chunk", (game, chunk)))
+
+    def end_game(self, game: int, player1_outcome: int):
+        self.calls.append(("end_game", (game, player1_outcome)))
+
+    def replay(self, sink):
+        for name, args in self.calls:
+            getattr(sink, name)(*args)
+
+
+def record_games(agent1_factory: AgentFactory, agent2_factory: AgentFactory, game_params: GameParams,
+                 seed: int, game_indices: range, sink=None, flush_every: int = DEFAULT_FLUSH_STEPS):
+    """Plays the games and sends their chunks to sink; without one, returns them in a ChunkLog."""
+    log = ChunkLog() if sink is None else None
+    recorder = TrajectoryRecorder(game_params, sink=sink or log, flush_every=flush_every,
+                                  first_game=game_indices.start)
+    play_games(agent1_factory, agent2_factory, game_params, seed, game_indices, recorder=recorder)
+    return log
+
+
+def self_play(writer: ShardWriter, agent1_factory: AgentFactory, agent2_factory: AgentFactory,
+              game_params: GameParams, n_games: int, seed: int = 0, n_workers: Optional[int] = 1,
+              games_per_task: int = 4, mirror: bool = False, flush_every: int = DEFAULT_FLUSH_STEPS):
+    """
+    Writes the decisions of games 0 .. n_games - 1 to writer, in game order, flush_every steps at a time.
+    With one worker they are written while each game is played. Otherwise a worker sends back the
+    chunks of a whole task, and at most two tasks per worker are in flight, so memory stays
+    bounded however many games are generated. The shards are the same either way.
+    With mirror, each chunk is followed by its mirrored twin, doubling the decisions per game played.
+    """
+    sink = GameSink(writer, game_params, mirror)
+    tasks = [range(i, min(i + games_per_task, n_games)) for i in range(0, n_games, games_per_task)]
+    if n_workers == 1 or len(tasks) <= 1:
+        for task in tasks:
+            record_games(agent1_factory, agent2_factory, game_params, seed, task, sink, flush_every)
+        return
+    with ProcessPoolExecutor(max_workers=n_workers) as pool:
+        window = 2 * (n_workers or os.cpu_count() or 1)
+        in_flight = deque()
+        for task in tasks:
+            in_flight.append(pool.submit(record_games, agent1_factory, agent2_factory,
+                                         game_params, seed, task, None, flush_every))
+            if len(in_flight) >= window:
+                in_flight.popleft().result().replay(sink)
+        while in_flight:
+            in_flight.popleft().result().replay(sink)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate sharded self-play training data")
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--agents", nargs=2, default=["GreedyHeuristicAgent", "DefensiveTurtleAgent"],
+                        choices=sorted(AGENTS), metavar="AGENT", help=f"Two of: {', '.join(sorted(AGENTS))}")
+    parser.add_argument("--planets", type=int, default=GameParams().num_planets)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: one per CPU)")
+    parser.add_argument("--max-shard-mb", type=float, default=DEFAULT_SHARD_BYTES / 2 ** 20,
+                        help="Uncompressed size limit of each shard")
+    parser.add_argument("--mirror", action="store_true",
+                        help="Also write every decision as its twin in the mirrored game")
+    parser.add_argument("--output", required=True, help="Directory for the shards and manifest.json")
+    args = parser.parse_args(argv)
+
+    params = GameParams(num_planets=args.planets)
+    metadata = {
+        "agents": args.agents,
+        "seed": args.seed,
+        "mirror": args.mirror,
+        "params": params.model_dump(by_alias=True, mode="json"),
+    }
+    t0 = time.time()
+    with ShardWriter(Path(args.output), int(args.max_shard_mb * 2 ** 20), metadata) as writer:
+        self_play(writer, AGENTS[args.agents[0]], AGENTS[args.agents[1]], params, args.games,
+                  seed=args.seed, n_workers=args.workers, mirror=args.mirror)
+    t1 = time.time()
+    size = sum(shard["bytes"] for shard in writer.shards)
+    print(f"{writer.n_records:,} decisions from {len(writer.games)} games in {len(writer.shards)} shards, "
+          f"{size / 2 ** 20:.1f} MB, {writer.n_records / (t1 - t0):,.0f} decisions/s")
+
+
+if __name__ == "__main__":
+    main()
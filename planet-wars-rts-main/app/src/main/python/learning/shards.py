@@ -0,0 +1,146 @@
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+
+from learning.trajectories import Decision, PLANET_FEATURES, decisions, outcomes
+
+MANIFEST = "manifest.json"
+# 2: adds the mirrored column
+# 3: adds the outcomes of games whose decisions were written before they ended
+FORMAT_VERSION = 3
+
+# uncompressed bytes of decisions per shard; compressed shards are smaller still
+DEFAULT_SHARD_BYTES = 64 * 1024 * 1024
+
+# scalar columns of a shard, besides the (n, n_planets, n_features) features array
+COLUMNS = {
+    "game": np.int64,
+    "tick": np.int32,
+    "player": np.int8,
+    "source": np.int32,
+    "destination": np.int32,
+    "n_ships": np.float32,
+    "outcome": np.int8,
+    "mirrored": np.bool_,
+}
+COLUMN_BYTES = sum(np.dtype(dtype).itemsize for dtype in COLUMNS.values())
+
+
+class ShardWriter:
+    """
+    Writes a stream of Decisions to compressed .npz shards of at most max_shard_bytes
+    (uncompressed), named shard_NNNNNN.npz, and describes them in manifest.json.
+    Only the shard being filled is held in memory. Use as a context manager, or call close().
+    It is also a sink for learning.trajectories.TrajectoryRecorder: decisions can be written while
+    their game is still being played, and its outcome, given to end_game, is kept in the manifest
+    and filled in by read_shards.
+    """
+
+    def __init__(self, directory: Path, max_shard_bytes: int = DEFAULT_SHARD_BYTES,
+                 metadata: Optional[Dict[str, Any]] = None):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_shard_bytes = max_shard_bytes
+        self.metadata = metadata or {}
+        self.shards: List[Dict[str, Any]] = []
+        self.n_records = 0
+        self.games = set()
+        # Player1's outcome of each game reported with end_game
+        self.outcomes: Dict[int, int] = {}
+        self.start_shard()
+
+    def start_shard(self):
+        self.columns: Dict[str, List] = {name: [] for name in COLUMNS}
+        self.features: List[np.ndarray] = []
+        self.shard_bytes = 0
+
+    def add(self, decision: Decision):
+        for name in COLUMNS:
+            self.columns[name].append(getattr(decision, name))
+        self.features.append(decision.features)
+        self.shard_bytes += decision.features.nbytes + COLUMN_BYTES
+        self.games.add(decision.game)
+        if self.shard_bytes >= self.max_shard_bytes:
+            self.flush()
+
+    def write(self, decisions):
+        for decision in decisions:
+            self.add(decision)
+
+    def add_chunk(self, game: int, chunk: Dict[str, np.ndarray], mirrored: bool = False):
+        self.write(decisions(game, chunk, mirrored))
+
+    def end_game(self, game: int, player1_outcome: int):
+        self.outcomes[game] = player1_outcome
+
+    def flush(self):
+        if not self.features:
+            return
+        path = self.directory / f"shard_{len(self.shards):06d}.npz"
+        arrays = {name: np.array(values, dtype=COLUMNS[name]) for name, values in self.columns.items()}
+        arrays["features"] = np.stack(self.features)
+        np.savez_compressed(path, **arrays)
+        self.shards.append({
+            "file": path.name,
+            "n_records": len(self.features),
+            "first_game": int(arrays["game"][0]),
+            "last_game": int(arrays["game"][-1]),
+            "bytes": path.stat().st_size,
+        })
+        self.n_records += len(self.features)
+        self.start_shard()
+        self.write_manifest()
+
+    def write_manifest(self):
+        manifest = {
+            "format_version": FORMAT_VERSION,
+            "planet_features": list(PLANET_FEATURES),
+            "n_records": self.n_records,
+            "n_games": len(self.games),
+            "shards": self.shards,
+            "outcomes": {str(game): outcome for game, outcome in sorted(self.outcomes.items())},
+            **self.metadata,
+        }
+        (self.directory / MANIFEST).write_text(json.dumps(manifest, indent=2))
+
+    def close(self):
+        self.flush()
+        self.write_manifest()
+
+    def __enter__(self) -> 'ShardWriter':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_manifest(directory: Path) -> Dict[str, Any]:
+    return json.loads((Path(directory) / MANIFEST).read_text())
+
+
+def read_shards(directory: Path) -> Iterator[Dict[str, np.ndarray]]:
+    """
+    The shards listed in the manifest, in order, one dict of column arrays at a time, with the
+    outcomes recorded in the manifest filled in.
+    """
+    manifest = read_manifest(directory)
+    recorded = manifest.get("outcomes", {})
+    games = np.array(sorted(int(game) for game in recorded), dtype=np.int64)
+    player1_outcomes = np.array([recorded[str(game)] for game in games], dtype=np.int8)
+    for shard in manifest["shards"]:
+        with np.load(Path(directory) / shard["file"]) as data:
+            arrays = {name: data[name] for name in data.files}
+        if len(games):
+            fill_outcomes(arrays, games, player1_outcomes)
+        yield arrays
+
+
+def fill_outcomes(arrays: Dict[str, np.ndarray], games: np.ndarray, player1_outcomes: np.ndarray):
+    """Sets the outcome of the decisions of the given games, which Player1 ended with player1_outcomes."""
+    index = np.minimum(np.searchsorted(games, arrays["game"]), len(games) - 1)
+    known = games[index] == arrays["game"]
+    # a mirrored decision was taken by the other seat of the recorded game
+    seat = np.where(arrays["mirrored"], 3 - arrays["player"], arrays["player"])
+    arrays["outcome"] = np.where(known, outcomes(seat, player1_outcomes[index]), arrays["outcome"]).astype(np.int8)
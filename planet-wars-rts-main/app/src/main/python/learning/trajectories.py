@@ -0,0 +1,242 @@
+from typing import Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+from core.array_forward_model import PLAYER_CODES
+from core.batch_forward_model import BatchGameState
+from core.forward_model import ForwardModel
+from core.game_state import Action, GameParams, GameState, Player
+from core.symmetry import mirror_permutation, mirror_planet_ids
+
+# per-planet features, seen from the deciding player: owners are +1 for the player's own,
+# -1 for the opponent's and 0 for neutral, and transporter ships carry the sign of their owner
+PLANET_FEATURES = (
+    "owner", "n_ships", "growth_rate", "x", "y",
+    "transporter_ships", "transporter_destination", "transporter_eta",
+)
+
+NO_PLANET = -1
+
+
+def relative_owner(owner: Player, player: Player) -> int:
+    if owner == Player.Neutral:
+        return 0
+    return 1 if owner == player else -1
+
+
+def state_features(state: GameState, player: Player) -> np.ndarray:
+    """(n_planets, len(PLANET_FEATURES)) float32 features of the state as player sees it."""
+    planets = state.planets
+    features = np.zeros((len(planets), len(PLANET_FEATURES)), dtype=np.float32)
+    for i, planet in enumerate(planets):
+        row = features[i]
+        row[0] = relative_owner(planet.owner, player)
+        row[1] = planet.n_ships
+        row[2] = planet.growth_rate
+        row[3] = planet.position.x
+        row[4] = planet.position.y
+        transporter = planet.transporter
+        if transporter is None:
+            row[6] = NO_PLANET
+        else:
+            row[5] = relative_owner(transporter.owner, player) * transporter.n_ships
+            row[6] = transporter.destination_index
+            speed = transporter.v.mag()
+            destination = planets[transporter.destination_index].position
+            row[7] = transporter.s.distance(destination) / speed if speed > 0 else 0.0
+    return features
+
+
+def batch_state_features(state: BatchGameState, player: Player) -> np.ndarray:
+    """state_features of every game of a batch, as a (batch_size, n_planets, len(PLANET_FEATURES)) array."""
+    me = PLAYER_CODES[player]
+    features = np.zeros((state.batch_size, state.n_planets, len(PLANET_FEATURES)), dtype=np.float32)
+    features[..., 0] = np.where(state.owner == me, 1, np.where(state.owner == 0, 0, -1))
+    features[..., 1] = state.ships
+    features[..., 2] = state.growth
+    features[..., 3] = state.x
+    features[..., 4] = state.y
+    active = state.t_active
+    sign = np.where(state.t_owner == me, 1.0, -1.0)
+    features[..., 5] = np.where(active, sign * state.t_ships, 0.0)
+    features[..., 6] = np.where(active, state.t_dest, NO_PLANET)
+    dest = np.maximum(state.t_dest, 0)
+    eta = transporter_eta(state.t_x, state.t_y, state.t_vx, state.t_vy,
+                          np.take_along_axis(state.x, dest, axis=1), np.take_along_axis(state.y, dest, axis=1))
+    features[..., 7] = np.where(active, eta, 0.0)
+    return features
+
+
+def transporter_eta(x: np.ndarray, y: np.ndarray, vx: np.ndarray, vy: np.ndarray,
+                    destination_x: np.ndarray, destination_y: np.ndarray) -> np.ndarray:
+    """Ticks until transporters at (x, y) moving at (vx, vy) reach their destination; 0 when they stand still."""
+    speed = np.sqrt(vx ** 2 + vy ** 2)
+    distance = np.sqrt((x - destination_x) ** 2 + (y - destination_y) ** 2)
+    return np.divide(distance, speed, out=np.zeros_like(distance), where=speed > 0)
+
+
+def outcome_for(winner: Player, player: Player) -> int:
+    """+1 when player won, -1 when it lost and 0 for a draw."""
+    return relative_owner(winner, player)
+
+
+class Decision(NamedTuple):
+    """One agent decision: the state it saw, what it chose and how its game ended."""
+    game: int
+    tick: int
+    player: int
+    features: np.ndarray
+    source: int
+    destination: int
+    n_ships: float
+    outcome: int
+    # True for the twin of a recorded decision in the mirrored game (see mirror_game)
+    mirrored: bool = False
+
+
+def mirror_features(features: np.ndarray, params: GameParams) -> np.ndarray:
+    """
+    state_features of the mirrored game as the other seat sees it, from (..., n_planets, n_features) features.
+    Owners and ship signs are relative to the deciding player, so only planets, positions and
+    destinations change.
+    """
+    n_planets = features.shape[-2]
+    mirrored = features[..., mirror_permutation(n_planets), :]
+    mirrored[..., 3] = params.width - mirrored[..., 3]
+    mirrored[..., 4] = params.height - mirrored[..., 4]
+    mirrored[..., 6] = mirror_planet_ids(mirrored[..., 6].astype(np.int64), n_planets)
+    return mirrored
+
+
+def mirror_game(game: Dict[str, np.ndarray], params: GameParams) -> Dict[str, np.ndarray]:
+    """
+    A recorded game replayed in the mirrored game: every decision by one seat becomes the same
+    decision by the other seat, with the same outcome, at no simulation cost.
+    """
+    n_planets = game["features"].shape[-2]
+    return {
+        "tick": game["tick"],
+        "player": (3 - game["player"]).astype(np.int8),
+        "features": mirror_features(game["features"], params),
+        "source": mirror_planet_ids(game["source"], n_planets).astype(np.int32),
+        "destination": mirror_planet_ids(game["destination"], n_planets).astype(np.int32),
+        "n_ships": game["n_ships"],
+        "outcome": game["outcome"],
+    }
+
+
+# steps of a game the recorder buffers before turning them into a chunk
+DEFAULT_FLUSH_STEPS = 256
+
+
+class TrajectoryRecorder:
+    """
+    GameRunner recorder that turns each game into columnar arrays of decisions, one per player
+    per tick, without keeping any GameState. Decisions are buffered for at most flush_every steps
+    and then turned into a chunk: a dict of columns like a game's, whose outcome column is 0 as the
+    outcome is only known at the end.
+    Without a sink, a game's chunks are joined into one game, with its outcomes, and appended to
+    games when it ends. With a sink, such as learning.shards.ShardWriter, each chunk is handed to
+    sink.add_chunk(game, chunk) as soon as it is full, and Player1's outcome to
+    sink.end_game(game, outcome) at the end, so no more than flush_every steps are held in memory.
+    Games are numbered from first_game in the order they end.
+    """
+
+    def __init__(self, params: GameParams, players=(Player.Player1, Player.Player2), sink=None,
+                 flush_every: int = DEFAULT_FLUSH_STEPS, first_game: int = 0):
+        self.params = params
+        self.players = players
+        self.sink = sink
+        self.flush_every = flush_every
+        self.game = first_game
+        self.games: List[Dict[str, np.ndarray]] = []
+        self.chunks: List[Dict[str, np.ndarray]] = []
+        self.pending: Dict[Player, np.ndarray] = {}
+
+    def start_game(self, state: GameState, agent_types: Dict[Player, str], map_seed: Optional[int] = None):
+        # a game that never ended, such as the one GameRunner sets up in its constructor, is dropped;
+        # chunks of it that already went to a sink keep their 0 outcome
+        self.chunks = []
+        self.start_chunk()
+        self.encode(state)
+
+    def start_chunk(self):
+        self.ticks: List[int] = []
+        self.columns: Dict[str, List] = {name: [] for name in ("player", "features", "action")}
+
+    def encode(self, state: GameState):
+        self.tick = state.game_tick
+        self.pending = {player: state_features(state, player) for player in self.players}
+
+    def record_step(self, state: GameState, actions: Dict[Player, Action]):
+        # state is the one after the step; the actions were chosen on the previous one
+        for player in self.players:
+            action = actions[player]
+            self.ticks.append(self.tick)
+            self.columns["player"].append(1 if player == Player.Player1 else 2)
+            self.columns["features"].append(self.pending[player])
+            self.columns["action"].append((action.source_planet_id, action.destination_planet_id,
+                                           action.num_ships))
+        self.encode(state)
+        if len(self.ticks) >= self.flush_every * len(self.players):
+            self.flush()
+
+    def flush(self):
+        if not self.ticks:
+            return
+        n_planets = self.pending[self.players[0]].shape[0]
+        action = np.array(self.columns["action"], dtype=np.float64).reshape(-1, 3)
+        chunk = {
+            "tick": np.array(self.ticks, dtype=np.int32),
+            "player": np.array(self.columns["player"], dtype=np.int8),
+            "features": np.array(self.columns["features"], dtype=np.float32)
+                          .reshape(-1, n_planets, len(PLANET_FEATURES)),
+            "source": action[:, 0].astype(np.int32),
+            "destination": action[:, 1].astype(np.int32),
+            "n_ships": action[:, 2].astype(np.float32),
+            "outcome": np.zeros(len(self.ticks), dtype=np.int8),
+        }
+        self.start_chunk()
+        if self.sink is not None:
+            self.sink.add_chunk(self.game, chunk)
+        else:
+            self.chunks.append(chunk)
+
+    def end_game(self, model: ForwardModel):
+        self.flush()
+        player1_outcome = outcome_for(model.get_leader(), Player.Player1)
+        if self.sink is not None:
+            self.sink.end_game(self.game, player1_outcome)
+        else:
+            game = {name: np.concatenate([chunk[name] for chunk in self.chunks])
+                    for name in self.chunks[0]} if self.chunks else empty_game(len(model.state.planets))
+            game["outcome"] = outcomes(game["player"], player1_outcome)
+            self.games.append(game)
+        self.chunks = []
+        self.pending = {}
+        self.game += 1
+
+
+def outcomes(seat: np.ndarray, player1_outcome: int) -> np.ndarray:
+    """The outcome for each of the seats (1 or 2) of a game that Player1 ended with player1_outcome."""
+    return np.where(seat == 1, player1_outcome, -player1_outcome).astype(np.int8)
+
+
+def empty_game(n_planets: int) -> Dict[str, np.ndarray]:
+    return {
+        "tick": np.zeros(0, dtype=np.int32),
+        "player": np.zeros(0, dtype=np.int8),
+        "features": np.zeros((0, n_planets, len(PLANET_FEATURES)), dtype=np.float32),
+        "source": np.zeros(0, dtype=np.int32),
+        "destination": np.zeros(0, dtype=np.int32),
+        "n_ships": np.zeros(0, dtype=np.float32),
+        "outcome": np.zeros(0, dtype=np.int8),
+    }
+
+
+def decisions(game_index: int, game: Dict[str, np.ndarray], mirrored: bool = False):
+    """The decisions of one recorded game, in order."""
+    for i in range(len(game["tick"])):
+        yield Decision(game_index, int(game["tick"][i]), int(game["player"][i]), game["features"][i],
+                       int(game["source"][i]), int(game["destination"][i]), float(game["n_ships"][i]),
+                       int(game["outcome"][i]), mirrored)
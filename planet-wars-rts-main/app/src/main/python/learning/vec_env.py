@@ -0,0 +1,153 @@
+import copy
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from agents.batch_agent import BatchPlanetWarsAgent
+from agents.planet_wars_agent import PlanetWarsAgent
+from core.array_forward_model import ArrayGameState, PLAYER_CODES
+from core.batch_forward_model import BatchActions, BatchForwardModel, BatchGameState
+from core.game_state import GameParams, GameState, Player
+from core.game_state_factory import GameStateFactory, derive_seed
+from core.parallel_runner import GlobalRandomState
+from learning.trajectories import batch_state_features
+
+Opponent = Union[PlanetWarsAgent, BatchPlanetWarsAgent]
+
+
+class VecPlanetWarsEnv:
+    """
+    N games stepped together on a BatchForwardModel, for training a policy that plays `player`
+    against a fixed opponent. Observations are batch_state_features arrays of shape
+    (n_envs, n_planets, len(PLANET_FEATURES)) and actions are BatchActions, or an (n_envs, 3)
+    array of source, destination and ships, one per env. The reward is +1, -1 or 0 on the
+    step that ends a game, when the env is reset to a fresh map straight away.
+
+    Env i draws the map of its episode k from GameStateFactory(params, derive_seed(seeds[i], k)),
+    so maps depend on that env's seed alone. A BatchPlanetWarsAgent opponent plays every env in
+    one call; any other PlanetWarsAgent is copied once per env, as agents keep per-game state.
+    """
+
+    def __init__(self, opponent: Opponent, params: GameParams, n_envs: int,
+                 seed: int = 0, seeds: Optional[Sequence[int]] = None, player: Player = Player.Player1):
+        if seeds is not None and len(seeds) != n_envs:
+            raise ValueError(f"Expected {n_envs} seeds, got {len(seeds)}")
+        self.params = params
+        self.n_envs = n_envs
+        self.seed = seed
+        self.seeds = list(seeds) if seeds is not None else [derive_seed(seed, i) for i in range(n_envs)]
+        self.player = player
+        self.opponent_player = player.opponent()
+        self.batched = isinstance(opponent, BatchPlanetWarsAgent)
+        self.opponent = opponent
+        self.opponents: List[PlanetWarsAgent] = [] if self.batched else \
+            [copy.deepcopy(opponent) for _ in range(n_envs)]
+        self.episodes = np.zeros(n_envs, dtype=np.int64)
+        self.model: Optional[BatchForwardModel] = None
+        # the opponents' draws from the global random generators, kept apart from the caller's
+        self.random: Optional[GlobalRandomState] = None
+
+    def new_map(self, env: int) -> GameState:
+        episode = int(self.episodes[env]) if self.params.new_map_each_run else 0
+        return GameStateFactory(self.params, derive_seed(self.seeds[env], episode)).create_game()
+
+    def reset(self) -> np.ndarray:
+        """
+        Starts episode 0 of every env. The opponents draw from the global random generators
+        through a stream of their own seeded from seed, so the caller's generators are left alone.
+        """
+        self.random = GlobalRandomState(self.seed)
+        self.episodes[:] = 0
+        states = [self.new_map(env) for env in range(self.n_envs)]
+        self.model = BatchForwardModel(BatchGameState.from_game_states(states), self.params)
+        with self.random:
+            if self.batched:
+                self.opponent.prepare_to_play_as(self.opponent_player, self.params)
+            for agent in self.opponents:
+                agent.prepare_to_play_as(self.opponent_player, self.params)
+        return self.observe()
+
+    def observe(self) -> np.ndarray:
+        return batch_state_features(self.model.state, self.player)
+
+    def opponent_actions(self) -> BatchActions:
+        state = self.model.state
+        if self.batched:
+            return self.opponent.get_batch_action(state, np.ones(self.n_envs, dtype=bool))
+        actions = BatchActions.do_nothing(self.n_envs)
+        for env, agent in enumerate(self.opponents):
+            action = agent.get_action(state.to_game_state(env))
+            actions.source[env] = action.source_planet_id
+            actions.destination[env] = action.destination_planet_id
+            actions.num_ships[env] = action.num_ships
+        return actions
+
+    def step(self, actions: Union[BatchActions, np.ndarray]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Dict[str, np.ndarray]]:
+        """
+        Steps every env once and returns observations, rewards, done flags and info arrays.
+        Finished envs are reset, so their observation is the first of the next game;
+        info["final_observation"] holds the last observation of the finished games (zeros elsewhere),
+        info["winner"] their winner's owner code and info["ticks"] their length.
+        """
+        if self.model is None:
+            raise RuntimeError("Call reset() before step()")
+        if not isinstance(actions, BatchActions):
+            actions = np.asarray(actions)
+            actions = BatchActions(actions[:, 0], actions[:, 1], actions[:, 2])
+        with self.random:
+            opponent_actions = self.opponent_actions()
+        # ForwardModel applies Player1's action first
+        if self.player == Player.Player1:
+            step_actions = {Player.Player1: actions, Player.Player2: opponent_actions}
+        else:
+            step_actions = {Player.Player1: opponent_actions, Player.Player2: actions}
+        done = self.model.step_batch(step_actions)
+
+        observation = self.observe()
+        rewards = np.zeros(self.n_envs, dtype=np.float32)
+        info = {
+            "final_observation": np.zeros_like(observation),
+            "winner": np.zeros(self.n_envs, dtype=np.int8),
+            "ticks": np.zeros(self.n_envs, dtype=np.int64),
+        }
+        finished = np.flatnonzero(done)
+        if finished.size:
+            state = self.model.state
+            info["final_observation"][finished] = observation[finished]
+            info["ticks"][finished] = state.game_tick[finished]
+            leaders = self.model.get_leader_batch()
+            for env in finished.tolist():
+                winner = PLAYER_CODES[leaders[env]]
+                info["winner"][env] = winner
+                rewards[env] = 0.0 if winner == 0 else (1.0 if winner == PLAYER_CODES[self.player] else -1.0)
+                self.episodes[env] += 1
+                state.set_game(env, ArrayGameState.from_game_state(self.new_map(env)))
+                if not self.batched:
+                    with self.random:
+                        self.opponents[env].prepare_to_play_as(self.opponent_player, self.params)
+            observation[finished] = batch_state_features(state, self.player)[finished]
+        return observation, rewards, done, info
+
+
+if __name__ == "__main__":
+    import time
+    from agents.random_agents import BatchCarefulRandomAgent, CarefulRandomAgent
+
+    params = GameParams(num_planets=20)
+    rng = np.random.default_rng(0)
+    for opponent, n_envs in ((BatchCarefulRandomAgent(seed=1), 256), (CarefulRandomAgent(), 16)):
+        env = VecPlanetWarsEnv(opponent, params, n_envs, seed=42)
+        observation = env.reset()
+        n_steps, n_games, wins = 500, 0, 0
+        t0 = time.perf_counter()
+        for _ in range(n_steps):
+            state = env.model.state
+            source = rng.integers(0, params.num_planets, n_envs)
+            actions = BatchActions(source, rng.integers(0, params.num_planets, n_envs),
+                                   state.ships[np.arange(n_envs), source] / 2)
+            observation, rewards, done, info = env.step(actions)
+            n_games += int(done.sum())
+            wins += int((rewards > 0).sum())
+        t1 = time.perf_counter()
+        print(f"{opponent.get_agent_type()}, {n_envs} envs: {(t1 - t0) * 1e6 / (n_steps * n_envs):.1f} us per env step, "
+              f"{n_games} games finished, {wins} won; observations {observation.shape}")
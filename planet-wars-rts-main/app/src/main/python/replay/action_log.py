@@ -0,0 +1,158 @@
+import hashlib
+import json
+import struct
+import zlib
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+
+from core.array_forward_model import PLAYER_CODES, CODE_PLAYERS
+from core.forward_model import ForwardModel
+from core.game_state import GameParams, GameState, Player, Action
+from core.game_state_factory import GameStateFactory
+
+# File layout: MAGIC, u32 header length, JSON header, zlib-compressed action records.
+# ForwardModel is deterministic, so the map and the actions that were actually applied are
+# enough to rebuild every state of a game; ships are stored as float64 to keep that exact.
+MAGIC = b"PWA1"
+VERSION = 1
+
+ACTION_DTYPE = np.dtype([
+    ("tick", "<i4"),
+    ("player", "i1"),
+    ("source", "<i4"),
+    ("destination", "<i4"),
+    ("num_ships", "<f8"),
+])
+
+
+class ReplayDivergenceError(RuntimeError):
+    pass
+
+
+def state_digest(state: GameState) -> str:
+    """Exact digest of a state: pydantic writes floats with full round-trip precision."""
+    return hashlib.sha256(state.model_dump_json().encode()).hexdigest()
+
+
+class ActionLogWriter:
+    """
+    Records games played by a GameRunner given recorder=ActionLogWriter(...) as the map seed plus
+    the actions the ForwardModel carried out each tick, and a digest of the final state. When the map has
+    no seed (an unseeded GameRunner) the initial state is stored instead.
+    With a directory, log i is saved there as game_<i>.pwa; the bytes of the last log are kept
+    in last_log either way.
+    """
+
+    def __init__(self, params: GameParams, directory: Optional[Path] = None):
+        self.params = params
+        self.directory = None if directory is None else Path(directory)
+        self.n_games = 0
+        self.last_log: Optional[bytes] = None
+        self.paths: List[Path] = []
+
+    def start_game(self, state: GameState, agent_types: Dict[Player, str], map_seed: Optional[int] = None):
+        self.agent_types = agent_types
+        self.map_seed = map_seed
+        self.initial_state = state.model_dump_json() if map_seed is None or state.game_tick != 0 else None
+        self.tick = state.game_tick
+        self.actions: List[tuple] = []
+        self.remember(state)
+
+    def remember(self, state: GameState):
+        # what ForwardModel.apply_actions checks, as of the start of the next step
+        self.sources = [(planet.owner, planet.n_ships, planet.transporter is None) for planet in state.planets]
+
+    def record_step(self, state: GameState, actions: Optional[Dict[Player, Action]] = None):
+        for player, action in (actions or {}).items():
+            if action == Action.DO_NOTHING:
+                continue
+            # actions the ForwardModel rejected changed nothing, so they are left out
+            owner, n_ships, idle = self.sources[action.source_planet_id]
+            if not (idle and owner == player and n_ships >= action.num_ships):
+                continue
+            self.actions.append((self.tick, PLAYER_CODES[player], action.source_planet_id,
+                                 action.destination_planet_id, action.num_ships))
+        self.tick += 1
+        self.remember(state)
+
+    def end_game(self, model: ForwardModel) -> bytes:
+        header = {
+            "version": VERSION,
+            "params": self.params.model_dump(by_alias=True, mode="json"),
+            "map_seed": self.map_seed,
+            "initial_state": self.initial_state,
+            "final_tick": model.state.game_tick,
+            "final_digest": state_digest(model.state),
+            "agent_types": {player.value: agent_type for player, agent_type in self.agent_types.items()},
+            "winner": model.get_leader().value,
+        }
+        header_bytes = json.dumps(header).encode()
+        actions = np.array(self.actions, dtype=ACTION_DTYPE)
+        self.last_log = MAGIC + struct.pack("<I", len(header_bytes)) + header_bytes + \
+            zlib.compress(actions.tobytes(), 9)
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            path = self.directory / f"game_{self.n_games:06d}.pwa"
+            path.write_bytes(self.last_log)
+            self.paths.append(path)
+        self.n_games += 1
+        return self.last_log
+
+
+class ActionLogReader:
+    def __init__(self, data: bytes):
+        if data[:4] != MAGIC:
+            raise ValueError("Not a Planet Wars action log")
+        (header_length,) = struct.unpack("<I", data[4:8])
+        self.header = json.loads(data[8:8 + header_length])
+        if self.header["version"] != VERSION:
+            raise ValueError(f"Unsupported action log version {self.header['version']}")
+        self.params = GameParams.model_validate(self.header["params"])
+        self.map_seed: Optional[int] = self.header["map_seed"]
+        self.final_tick: int = self.header["final_tick"]
+        self.agent_types: Dict[Player, str] = {Player(p): t for p, t in self.header["agent_types"].items()}
+        self.winner = Player(self.header["winner"])
+        self.actions = np.frombuffer(zlib.decompress(data[8 + header_length:]), dtype=ACTION_DTYPE)
+
+    @staticmethod
+    def load(path: Path) -> 'ActionLogReader':
+        return ActionLogReader(Path(path).read_bytes())
+
+    def initial_state(self) -> GameState:
+        if self.header["initial_state"] is not None:
+            return GameState.model_validate_json(self.header["initial_state"])
+        return GameStateFactory(self.params, self.map_seed).create_game()
+
+    def states(self) -> Iterator[GameState]:
+        """
+        Re-simulates the game, yielding the live state before the first step and after every step;
+        copy a state to keep it. Raises ReplayDivergenceError at the end if the final state does not
+        match the recorded digest, e.g. because the engine or map generation has changed since.
+        """
+        model = ForwardModel(self.initial_state(), self.params)
+        actions = self.actions
+        # the actions of tick t are the records from starts[t] up to starts[t + 1]
+        first_tick = model.state.game_tick
+        starts = np.searchsorted(actions["tick"], np.arange(first_tick, self.final_tick + 1)).tolist()
+        yield model.state
+        for k in range(self.final_tick - first_tick):
+            tick_actions = {}
+            for record in actions[starts[k]:starts[k + 1]].tolist():
+                _, player, source, destination, num_ships = record
+                player = CODE_PLAYERS[player]
+                tick_actions[player] = Action(player_id=player, source_planet_id=source,
+                                              destination_planet_id=destination, num_ships=num_ships)
+            model.step(tick_actions)
+            yield model.state
+        if state_digest(model.state) != self.header["final_digest"]:
+            raise ReplayDivergenceError(
+                f"Re-simulated final state at tick {model.state.game_tick} does not match the recorded game"
+            )
+
+    def final_state(self) -> GameState:
+        state = None
+        for state in self.states():
+            pass
+        return state
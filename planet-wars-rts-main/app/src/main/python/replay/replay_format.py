@@ -0,0 +1,119 @@
+import bz2
+import json
+import lzma
+import struct
+import zlib
+from typing import List, Tuple
+
+import numpy as np
+
+# File layout: MAGIC, u32 header length, JSON header, then blobs whose offsets (relative to the
+# end of the header) the header gives: the segment index, the map geometry, the capture events
+# and one compressed blob per segment.
+# A segment covers keyframe_interval consecutive rows (states). Its first row is a keyframe with
+# the absolute owners and ships, and later rows are deltas to the row before, so any row can be
+# rebuilt by decoding a single segment.
+MAGIC = b"PWR1"
+VERSION = 2
+
+# ship counts are stored as integer multiples of 1 / SHIP_SCALE
+SHIP_SCALE = 100
+
+KEYFRAME_INTERVAL = 100
+
+CODECS = {
+    "zlib": (lambda data: zlib.compress(data, 9), zlib.decompress),
+    "bz2": (bz2.compress, bz2.decompress),
+    "lzma": (lzma.compress, lzma.decompress),
+}
+
+# one record per transporter and segment: the transporter is in the states of rows first .. end - 1
+# of the segment, and (x, y) is its exact position in row first
+TRANSPORTER_DTYPE = np.dtype([
+    ("first", "<i4"),
+    ("end", "<i4"),
+    ("source", "<i4"),
+    ("destination", "<i4"),
+    ("owner", "i1"),
+    ("ships", "<i8"),
+    ("x", "<f8"),
+    ("y", "<f8"),
+])
+
+# planet changed hands to owner in row
+CAPTURE_DTYPE = np.dtype([
+    ("row", "<i4"),
+    ("planet", "<i4"),
+    ("owner", "i1"),
+])
+
+
+def quantize_ships(ships) -> np.ndarray:
+    return np.rint(np.asarray(ships, dtype=np.float64) * SHIP_SCALE).astype(np.int64)
+
+
+def dequantize_ships(ships: np.ndarray) -> np.ndarray:
+    return ships / SHIP_SCALE
+
+
+def delta_encode(rows: np.ndarray) -> np.ndarray:
+    """Keeps the first row and replaces every later row by its difference to the one before."""
+    deltas = rows.copy()
+    deltas[1:] = rows[1:] - rows[:-1]
+    return deltas
+
+
+def delta_decode(deltas: np.ndarray) -> np.ndarray:
+    return np.cumsum(deltas, axis=0, dtype=deltas.dtype)
+
+
+def encode_segment(owners: np.ndarray, ships: np.ndarray, transporters: np.ndarray) -> bytes:
+    return delta_encode(owners.astype(np.int8)).tobytes() + \
+        delta_encode(quantize_ships(ships)).tobytes() + \
+        transporters.astype(TRANSPORTER_DTYPE).tobytes()
+
+
+def decode_segment(raw: bytes, n_rows: int, n_planets: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Returns the segment's absolute owners and ships, one row per state, and its transporter records."""
+    n_cells = n_rows * n_planets
+    owners = np.frombuffer(raw, dtype=np.int8, count=n_cells).reshape(n_rows, n_planets)
+    ships = np.frombuffer(raw, dtype="<i8", count=n_cells, offset=n_cells).reshape(n_rows, n_planets)
+    transporters = np.frombuffer(raw, dtype=TRANSPORTER_DTYPE, offset=9 * n_cells)
+    return delta_decode(owners), dequantize_ships(delta_decode(ships)), transporters
+
+
+def pack(header: dict, geometry: np.ndarray, captures: np.ndarray, segments: List[bytes],
+         codec: str = "zlib") -> bytes:
+    """Builds a replay file from raw (uncompressed) segments."""
+    compress, _ = CODECS[codec]
+    blobs = [compress(segment) for segment in segments]
+    offsets = np.cumsum([0] + [len(blob) for blob in blobs], dtype="<i8")
+    geometry_blob = compress(np.ascontiguousarray(geometry, dtype="<f8").tobytes())
+    captures_blob = compress(captures.astype(CAPTURE_DTYPE).tobytes())
+
+    # the index holds the segment offsets relative to the first segment
+    index = offsets.tobytes()
+    header = dict(header, version=VERSION, codec=codec, n_segments=len(segments))
+    header["index"] = [0, len(index)]
+    header["geometry"] = [len(index), len(geometry_blob)]
+    header["captures"] = [len(index) + len(geometry_blob), len(captures_blob)]
+    header["segments"] = len(index) + len(geometry_blob) + len(captures_blob)
+    header_bytes = json.dumps(header).encode()
+    return MAGIC + struct.pack("<I", len(header_bytes)) + header_bytes + \
+        index + geometry_blob + captures_blob + b"".join(blobs)
+
+
+def unpack_header(data) -> Tuple[dict, int]:
+    """Returns the header and the position where the blobs start."""
+    if bytes(data[:4]) != MAGIC:
+        raise ValueError("Not a Planet Wars replay")
+    (header_length,) = struct.unpack("<I", bytes(data[4:8]))
+    header = json.loads(bytes(data[8:8 + header_length]))
+    if header["version"] != VERSION:
+        raise ValueError(f"Unsupported replay version {header['version']}")
+    return header, 8 + header_length
+
+
+def read_blob(data, header: dict, base: int, offset: int, length: int) -> bytes:
+    _, decompress = CODECS[header["codec"]]
+    return decompress(data[base + offset:base + offset + length])
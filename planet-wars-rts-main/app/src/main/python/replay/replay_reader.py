@@ -0,0 +1,118 @@
+import mmap
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from core.array_forward_model import CODE_PLAYERS
+from core.game_state import GameParams, GameState, Planet, Player, Transporter, Vec2d
+from replay.replay_format import CAPTURE_DTYPE, decode_segment, dequantize_ships, read_blob, unpack_header
+
+
+class ReplayReader:
+    """
+    Reconstructs the GameState of any tick of a replay written by ReplayWriter.
+    Seeking decodes only the segment holding the row, starting from its keyframe, and only the
+    most recent segment is kept, so memory stays constant however long the game or however the
+    reader jumps around. load() memory-maps the file instead of reading it.
+    Owners and transporters come back exactly, ship counts to within 1 / SHIP_SCALE.
+    Transporter positions are advanced from the keyframe with the same Vec2d arithmetic as
+    ForwardModel, so they match the recorded game bit for bit.
+    """
+
+    def __init__(self, data):
+        self.data = data
+        self.header, self.base = unpack_header(data)
+        self.params = GameParams.model_validate(self.header["params"])
+        self.n_rows: int = self.header["n_rows"]
+        self.n_planets: int = self.header["n_planets"]
+        self.initial_tick: int = self.header["initial_tick"]
+        self.keyframe_interval: int = self.header["keyframe_interval"]
+        self.agent_types: Dict[Player, str] = {Player(p): t for p, t in self.header["agent_types"].items()}
+        self.winner = Player(self.header["winner"])
+
+        start, length = self.header["index"]
+        self.index = np.frombuffer(data[self.base + start:self.base + start + length], dtype="<i8")
+        geometry = np.frombuffer(self.read(*self.header["geometry"]), dtype="<f8").reshape(4, self.n_planets)
+        self.positions = [Vec2d(x=x, y=y) for x, y in zip(geometry[0].tolist(), geometry[1].tolist())]
+        self.growth_rates: List[float] = geometry[2].tolist()
+        self.radii: List[float] = geometry[3].tolist()
+        self.segment: Optional[int] = None
+        self.decoded: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+
+    @staticmethod
+    def load(path: Path) -> 'ReplayReader':
+        with open(path, "rb") as f:
+            return ReplayReader(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+
+    def __enter__(self) -> 'ReplayReader':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.n_rows
+
+    def read(self, offset: int, length: int) -> bytes:
+        return read_blob(self.data, self.header, self.base, offset, length)
+
+    def captures(self) -> np.ndarray:
+        """Every change of ownership as (row, planet, owner code) records, in row order."""
+        return np.frombuffer(self.read(*self.header["captures"]), dtype=CAPTURE_DTYPE)
+
+    def load_segment(self, segment: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        if segment != self.segment:
+            start = self.header["segments"] + int(self.index[segment])
+            raw = self.read(start, int(self.index[segment + 1] - self.index[segment]))
+            n_rows = min(self.keyframe_interval, self.n_rows - segment * self.keyframe_interval)
+            self.decoded = decode_segment(raw, n_rows, self.n_planets)
+            self.segment = segment
+        return self.decoded
+
+    def get_state(self, row: int) -> GameState:
+        """State after row steps; row 0 is the initial state."""
+        if not 0 <= row < self.n_rows:
+            raise IndexError(f"Row {row} out of range for a replay of {self.n_rows} rows")
+        segment, offset = divmod(row, self.keyframe_interval)
+        owners, ships, transporters = self.load_segment(segment)
+        planets = [
+            Planet(
+                owner=CODE_PLAYERS[owner],
+                n_ships=n_ships,
+                position=self.positions[i],
+                growth_rate=self.growth_rates[i],
+                radius=self.radii[i],
+                id=i
+            )
+            for i, (owner, n_ships) in enumerate(zip(owners[offset].tolist(), ships[offset].tolist()))
+        ]
+        for record in transporters[(transporters["first"] <= row) & (row < transporters["end"])]:
+            planets[int(record["source"])].transporter = self.make_transporter(record, row)
+        return GameState(planets=planets, game_tick=self.initial_tick + row)
+
+    def make_transporter(self, record: np.ndarray, row: int) -> Transporter:
+        source = int(record["source"])
+        destination = int(record["destination"])
+        # the same operations as ForwardModel.apply_actions and update_transporters
+        direction = (self.positions[destination] - self.positions[source]).normalize()
+        velocity = direction * self.params.transporter_speed
+        s = Vec2d(x=float(record["x"]), y=float(record["y"]))
+        for _ in range(row - int(record["first"])):
+            s = s + velocity
+        return Transporter(
+            s=s,
+            v=velocity,
+            owner=CODE_PLAYERS[int(record["owner"])],
+            source_index=source,
+            destination_index=destination,
+            n_ships=float(dequantize_ships(record["ships"]))
+        )
+
+    def states(self) -> Iterator[GameState]:
+        for row in range(self.n_rows):
+            yield self.get_state(row)
@@ -0,0 +1,111 @@
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from core.array_forward_model import PLAYER_CODES
+from core.forward_model import ForwardModel
+from core.game_state import GameParams, GameState, Player, Action
+from replay.replay_format import CAPTURE_DTYPE, KEYFRAME_INTERVAL, TRANSPORTER_DTYPE, encode_segment, pack, \
+    quantize_ships
+
+
+class ReplayWriter:
+    """
+    Records games played by a GameRunner given recorder=ReplayWriter(...) as compact binary replays.
+    The map geometry is stored once; per tick only owners and quantized ship counts are kept,
+    delta-encoded along time in segments that each start with a keyframe, and each transporter
+    is one record per segment, since its positions in between follow from the map.
+    With a directory, replay i is saved there as game_<i>.pwr; the bytes of the last replay
+    are kept in last_replay either way.
+    """
+
+    def __init__(self, params: GameParams, directory: Optional[Path] = None, codec: str = "zlib",
+                 keyframe_interval: int = KEYFRAME_INTERVAL):
+        self.params = params
+        self.directory = None if directory is None else Path(directory)
+        self.codec = codec
+        self.keyframe_interval = keyframe_interval
+        self.n_games = 0
+        self.last_replay: Optional[bytes] = None
+        self.paths: List[Path] = []
+
+    def start_game(self, state: GameState, agent_types: Dict[Player, str], map_seed: Optional[int] = None):
+        self.initial_tick = state.game_tick
+        self.agent_types = agent_types
+        self.geometry = np.array([[p.position.x, p.position.y, p.growth_rate, p.radius] for p in state.planets]).T
+        self.n_rows = 0
+        self.segments: List[bytes] = []
+        self.captures: List[tuple] = []
+        self.previous_owners: Optional[List[int]] = None
+        self.start_segment()
+        self.record_step(state)
+
+    def start_segment(self):
+        self.owners: List[List[int]] = []
+        self.ships: List[List[float]] = []
+        self.transporters: List[list] = []
+        # index into self.transporters of the transporter in flight from each planet
+        self.in_flight: Dict[int, int] = {}
+
+    def end_segment(self):
+        for k in self.in_flight.values():
+            self.transporters[k][1] = self.n_rows
+        records = np.array([tuple(t) for t in self.transporters], dtype=TRANSPORTER_DTYPE)
+        self.segments.append(encode_segment(np.array(self.owners), np.array(self.ships), records))
+
+    def record_step(self, state: GameState, actions: Optional[Dict[Player, Action]] = None):
+        """Records the state after a step; call once per step, in order. The actions are not needed."""
+        row = self.n_rows
+        if row > 0 and row % self.keyframe_interval == 0:
+            carried = [planet for planet in state.planets if planet.id in self.in_flight]
+            self.end_segment()
+            self.start_segment()
+            # transporters still in flight are recorded again from their position in the keyframe
+            for planet in carried:
+                if planet.transporter is not None:
+                    self.add_transporter(row, planet.id, planet.transporter)
+        owners = [PLAYER_CODES[planet.owner] for planet in state.planets]
+        self.owners.append(owners)
+        self.ships.append([planet.n_ships for planet in state.planets])
+        if self.previous_owners is not None:
+            for i, (before, after) in enumerate(zip(self.previous_owners, owners)):
+                if before != after:
+                    self.captures.append((row, i, after))
+        self.previous_owners = owners
+        # a planet can only launch while it has no transporter out, so a transporter that is present
+        # before and after a step is the same one; one that launches and lands within a single step
+        # never shows up in any state and need not be recorded
+        for i, planet in enumerate(state.planets):
+            transporter = planet.transporter
+            if i in self.in_flight and transporter is None:
+                self.transporters[self.in_flight.pop(i)][1] = row
+            elif i not in self.in_flight and transporter is not None:
+                self.add_transporter(row, i, transporter)
+        self.n_rows += 1
+
+    def add_transporter(self, row: int, source: int, transporter):
+        self.in_flight[source] = len(self.transporters)
+        self.transporters.append([row, -1, source, transporter.destination_index, PLAYER_CODES[transporter.owner],
+                                  quantize_ships(transporter.n_ships), transporter.s.x, transporter.s.y])
+
+    def end_game(self, model: ForwardModel) -> bytes:
+        self.end_segment()
+        header = {
+            "params": self.params.model_dump(by_alias=True, mode="json"),
+            "initial_tick": self.initial_tick,
+            "n_rows": self.n_rows,
+            "n_planets": self.geometry.shape[1],
+            "keyframe_interval": self.keyframe_interval,
+            "agent_types": {player.value: agent_type for player, agent_type in self.agent_types.items()},
+            "winner": model.get_leader().value,
+        }
+        captures = np.array(self.captures, dtype=CAPTURE_DTYPE)
+        self.last_replay = pack(header, self.geometry, captures, self.segments, self.codec)
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            path = self.directory / f"game_{self.n_games:06d}.pwr"
+            path.write_bytes(self.last_replay)
+            self.paths.append(path)
+        self.n_games += 1
+        return self.last_replay
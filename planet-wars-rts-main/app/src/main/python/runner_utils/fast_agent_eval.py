@@ -10,10 +10,11 @@ to assess any further improvements.
 
 """
 
-from typing import List, Dict, Tuple
+import copy
+from functools import partial
+from typing import List, Dict, Optional, Tuple
 from core.game_state import GameParams, Player
-from core.forward_model import ForwardModel
-from core.game_runner import GameRunner
+from core.parallel_runner import ParallelGameRunner
 from agents.random_agents import PureRandomAgent, CarefulRandomAgent  # adjust imports
 
 
@@ -21,8 +22,16 @@ def fast_agent_eval(
     test_agent,
     game_params: GameParams = GameParams(num_planets=10),
     baseline_agents: List = None,
-    n_games: int = 100
+    n_games: int = 100,
+    n_workers: Optional[int] = 1,
+    seed: int = 0
 ) -> float:
+    """
+    Games are played by a ParallelGameRunner: with n_workers other than 1 they are spread over a
+    process pool (None means one worker per core), with 1 they run in this process. Each game plays
+    a fresh copy of the agents, so they must be picklable, and the results depend only on seed,
+    not on the number of workers.
+    """
     if baseline_agents is None:
         baseline_agents = [PureRandomAgent(), CarefulRandomAgent()]
 
@@ -31,11 +40,11 @@ def fast_agent_eval(
 
     for i, baseline in enumerate(baseline_agents):
         print(f"\nRunning test against baseline #{i + 1}: {baseline.__class__.__name__}")
-        runner = GameRunner(test_agent, baseline, game_params)
+        runner = ParallelGameRunner(partial(copy.deepcopy, test_agent), partial(copy.deepcopy, baseline),
+                                    game_params, seed=seed, n_workers=n_workers)
         scores = runner.run_games(n_games)
         print(f"Scores: {scores}")
-        print(f"Successful actions: {ForwardModel.n_actions}")
-        print(f"Failed actions: {ForwardModel.n_failed_actions}")
+        print(runner.stats.summary())
 
         wins = scores.get(Player.Player1, 0)
         average = wins / n_games
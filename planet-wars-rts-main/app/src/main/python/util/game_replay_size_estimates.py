@@ -4,13 +4,15 @@ from agents.random_agents import CarefulRandomAgent, PureRandomAgent
 from core.forward_model import ForwardModel
 from core.game_runner import GameRunner
 from core.game_state import GameParams
+from replay.replay_writer import ReplayWriter
 
 if __name__ == "__main__":
 
     game_params = GameParams(num_planets=10)
     agent1 = CarefulRandomAgent()
     agent2 = PureRandomAgent()
-    runner = GameRunner(agent2, agent2, game_params)
+    writer = ReplayWriter(game_params)
+    runner = GameRunner(agent2, agent2, game_params, recorder=writer)
 
     state_list = []
 
@@ -39,6 +41,9 @@ if __name__ == "__main__":
     gzipped = gzip.compress(json_bytes)
     print(f"Gzipped JSON size: {len(gzipped):,} bytes")
 
+    # the delta-encoded binary replay of the same game
+    print(f"Binary replay size: {len(writer.last_replay):,} bytes")
+
 
     # # now JSON size
     # json_obj = [gs.model_dump() for gs in state_list]
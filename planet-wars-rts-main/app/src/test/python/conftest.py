@@ -0,0 +1,5 @@
+import os
+import sys
+
+# the Python sources live in app/src/main/python and use absolute imports from there
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "main", "python"))
@@ -0,0 +1,54 @@
+import random
+
+import pytest
+
+from agents.random_agents import CarefulRandomAgent, PureRandomAgent
+from core.game_runner import GameRunner
+from core.game_state import GameParams
+from replay.action_log import ActionLogReader, ActionLogWriter, ReplayDivergenceError
+
+PARAMS = GameParams(num_planets=12, max_ticks=300)
+
+
+def play(recorder, seed=None):
+    """Plays a game with recorder and returns a copy of every state, from the initial one on."""
+    random.seed(0 if seed is None else seed)
+    # PureRandomAgent also tries actions the ForwardModel rejects
+    runner = GameRunner(CarefulRandomAgent(), PureRandomAgent(), PARAMS, seed=seed, recorder=recorder)
+    states = [runner.forward_model.state.model_copy(deep=True)]
+    while not runner.forward_model.is_terminal():
+        runner.step_game()
+        states.append(runner.forward_model.state.model_copy(deep=True))
+    return runner, states
+
+
+@pytest.mark.parametrize("seed", [1, None])
+def test_resimulation_reproduces_every_state_exactly(tmp_path, seed):
+    writer = ActionLogWriter(PARAMS, directory=tmp_path)
+    runner, states = play(writer, seed)
+    reader = ActionLogReader.load(writer.paths[0])
+    # a seeded map is stored as its seed, an unseeded one as the initial state
+    assert reader.map_seed == runner.map_seed
+    assert (reader.header["initial_state"] is None) == (seed is not None)
+    assert reader.winner == runner.forward_model.get_leader()
+    replayed = [state.model_copy(deep=True) for state in reader.states()]
+    assert replayed == states
+
+
+def test_log_keeps_only_the_applied_actions():
+    writer = ActionLogWriter(PARAMS)
+    play(writer, seed=2)
+    reader = ActionLogReader(writer.last_log)
+    assert 0 < len(reader.actions) < 2 * reader.final_tick
+    assert (reader.actions["tick"][1:] >= reader.actions["tick"][:-1]).all()
+
+
+def test_divergence_is_reported():
+    writer = ActionLogWriter(PARAMS)
+    play(writer, seed=3)
+    reader = ActionLogReader(writer.last_log)
+    actions = reader.actions.copy()
+    actions["num_ships"][0] -= 1
+    reader.actions = actions
+    with pytest.raises(ReplayDivergenceError):
+        reader.final_state()
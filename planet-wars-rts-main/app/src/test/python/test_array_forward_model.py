@@ -0,0 +1,74 @@
+import random
+
+from agents.random_agents import CarefulRandomAgent
+from core.array_forward_model import ArrayForwardModel
+from core.forward_model import ForwardModel
+from core.game_state import GameParams, Player
+from core.game_state_factory import GameStateFactory
+
+
+def agents(params):
+    agent1, agent2 = CarefulRandomAgent(), CarefulRandomAgent()
+    agent1.prepare_to_play_as(Player.Player1, params)
+    agent2.prepare_to_play_as(Player.Player2, params)
+    return agent1, agent2
+
+
+def test_array_engine_matches_forward_model_every_tick():
+    for seed, params in ((1, GameParams(num_planets=20, max_ticks=500)),
+                         (2, GameParams(num_planets=12, max_ticks=500, width=1000, height=300))):
+        random.seed(seed)
+        state = GameStateFactory(params, seed).create_game()
+        model = ForwardModel(state.model_copy(deep=True), params)
+        array_model = ArrayForwardModel.from_game_state(state, params)
+        assert array_model.to_game_state() == model.state
+        agent1, agent2 = agents(params)
+        while not model.is_terminal():
+            actions = {
+                Player.Player1: agent1.get_action(model.state),
+                Player.Player2: agent2.get_action(model.state),
+            }
+            model.step(actions)
+            array_model.step(actions)
+            assert array_model.to_game_state() == model.state, f"diverged at tick {model.state.game_tick}"
+        assert array_model.is_terminal()
+        assert array_model.get_leader() == model.get_leader()
+        for player in (Player.Player1, Player.Player2):
+            assert array_model.get_ships(player) == model.get_ships(player)
+
+
+def test_fast_forward_matches_single_steps():
+    params = GameParams(num_planets=20, max_ticks=600)
+    for seed in (3, 4):
+        random.seed(seed)
+        state = GameStateFactory(params, seed).create_game()
+        agent1, agent2 = agents(params)
+        stepped = ArrayForwardModel.from_game_state(state, params)
+        fast = ArrayForwardModel.from_game_state(state, params)
+        n_calls = 0
+        # launch some transporters every 50 ticks, and let the game run idle in between
+        while not stepped.is_terminal():
+            if stepped.state.game_tick % 50 == 0:
+                view = stepped.to_game_state()
+                actions = {Player.Player1: agent1.get_action(view), Player.Player2: agent2.get_action(view)}
+                stepped.step(actions)
+                fast.step(actions)
+                continue
+            target = min((stepped.state.game_tick // 50 + 1) * 50, params.max_ticks + 1)
+            while fast.state.game_tick < target and not fast.is_terminal():
+                fast.advance_until_next_event(target - fast.state.game_tick)
+                n_calls += 1
+            while stepped.state.game_tick < target and not stepped.is_terminal():
+                stepped.step({})
+            assert fast.state.game_tick == stepped.state.game_tick
+            assert fast.to_game_state() == stepped.to_game_state(), f"diverged at tick {fast.state.game_tick}"
+        assert fast.is_terminal()
+        assert n_calls < params.max_ticks
+
+
+def test_fast_forward_stops_at_the_end_of_the_game():
+    params = GameParams(num_planets=10, max_ticks=100)
+    model = ArrayForwardModel.from_game_state(GameStateFactory(params, 5).create_game(), params)
+    assert model.advance_until_next_event(10 ** 6) == params.max_ticks + 1
+    assert model.is_terminal()
+    assert model.advance_until_next_event(10) == 0
@@ -0,0 +1,69 @@
+import random
+
+import numpy as np
+
+from agents.random_agents import CarefulRandomAgent
+from core.batch_forward_model import BatchActions, BatchForwardModel, BatchGameState
+from core.forward_model import ForwardModel
+from core.game_state import Action, GameParams, Player
+from core.game_state_factory import GameStateFactory
+
+PLAYERS = (Player.Player1, Player.Player2)
+
+
+def random_action(rng, player, model, n_planets):
+    # any source, valid or not: the batch engine must reject what ForwardModel rejects
+    source = int(rng.integers(0, n_planets))
+    destination = int(rng.integers(0, n_planets))
+    return Action(player_id=player, source_planet_id=source, destination_planet_id=destination,
+                  num_ships=model.state.planets[source].n_ships * float(rng.uniform(0.1, 1.2)))
+
+
+def test_batch_matches_forward_model_for_every_game():
+    params = GameParams(num_planets=12, max_ticks=400)
+    batch_size = 8
+    random.seed(0)
+    rng = np.random.default_rng(0)
+    states = [GameStateFactory(params, seed).create_game() for seed in range(batch_size)]
+    models = [ForwardModel(state.model_copy(deep=True), params) for state in states]
+    batch = BatchForwardModel(BatchGameState.from_game_states(states), params)
+    agents = {}
+    for player in PLAYERS:
+        agents[player] = CarefulRandomAgent()
+        agents[player].prepare_to_play_as(player, params)
+
+    while not all(model.is_terminal() for model in models):
+        per_game = []
+        for model in models:
+            actions = {}
+            for player in PLAYERS:
+                if model.is_terminal():
+                    actions[player] = Action.DO_NOTHING
+                elif rng.random() < 0.5:
+                    actions[player] = agents[player].get_action(model.state)
+                else:
+                    actions[player] = random_action(rng, player, model, params.num_planets)
+            per_game.append(actions)
+        terminal = batch.step_batch({player: BatchActions.from_actions([actions[player] for actions in per_game])
+                                     for player in PLAYERS})
+        for b, (model, actions) in enumerate(zip(models, per_game)):
+            if not model.is_terminal():
+                model.step(actions)
+            assert batch.state.to_game_state(b) == model.state, f"game {b} diverged at tick {model.state.game_tick}"
+            assert terminal[b] == model.is_terminal()
+
+    assert batch.get_leader_batch() == [model.get_leader() for model in models]
+    for player in PLAYERS:
+        assert batch.get_ships_batch(player).tolist() == [model.get_ships(player) for model in models]
+
+
+def test_terminal_games_are_left_untouched():
+    params = GameParams(num_planets=10, max_ticks=5)
+    states = [GameStateFactory(params, seed).create_game() for seed in range(2)]
+    batch = BatchForwardModel(BatchGameState.from_game_states(states), params)
+    for _ in range(params.max_ticks + 1):
+        batch.step_batch({player: BatchActions.do_nothing(2) for player in PLAYERS})
+    assert batch.is_terminal_batch().all()
+    before = [batch.state.to_game_state(b) for b in range(2)]
+    batch.step_batch({player: BatchActions.do_nothing(2) for player in PLAYERS})
+    assert [batch.state.to_game_state(b) for b in range(2)] == before
@@ -0,0 +1,24 @@
+from agents.defensive_agent import DefensiveTurtleAgent
+from core.game_state import GameParams, Player, Transporter
+from core.game_state_factory import GameStateFactory
+
+
+def test_threatened_planet_gets_reinforcements():
+    params = GameParams(num_planets=10)
+    state = GameStateFactory(params, seed=1).create_game()
+    target, attacker, helper = state.planets[0], state.planets[1], state.planets[2]
+    target.owner, target.n_ships = Player.Player1, 5.0
+    helper.owner, helper.n_ships = Player.Player1, 300.0
+    attacker.owner = Player.Player2
+    attacker.transporter = Transporter(
+        s=attacker.position,
+        v=(target.position - attacker.position).normalize() * params.transporter_speed,
+        owner=Player.Player2, source_index=attacker.id, destination_index=target.id, n_ships=50.0)
+
+    agent = DefensiveTurtleAgent()
+    agent.prepare_to_play_as(Player.Player1, params)
+    # used to raise AttributeError: the agent read an undefined DEFENSE_RESERVE
+    action = agent.get_action(state)
+    assert action.source_planet_id == helper.id
+    assert action.destination_planet_id == target.id
+    assert action.num_ships <= helper.n_ships * (1 - agent.REINFORCEMENT_RESERVE)
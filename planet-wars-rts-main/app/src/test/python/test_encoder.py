@@ -0,0 +1,16 @@
+import numpy as np
+
+from core.game_state import GameParams, Player
+from core.game_state_factory import GameStateFactory
+from learning.encoder import ObservationEncoder
+
+
+def test_one_encoder_reused_across_maps_of_the_same_size():
+    params = GameParams(num_planets=20)
+    reused = ObservationEncoder(params, Player.Player1)
+    for seed in (1, 2, 1):
+        state = GameStateFactory(params, seed=seed).create_game()
+        expected = ObservationEncoder(params, Player.Player1).encode(state)
+        observation = reused.encode(state)
+        for name, array in observation._asdict().items():
+            assert np.array_equal(array, getattr(expected, name)), name
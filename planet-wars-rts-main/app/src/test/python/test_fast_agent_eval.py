@@ -0,0 +1,18 @@
+from agents.random_agents import CarefulRandomAgent
+from core.game_state import GameParams
+from runner_utils.fast_agent_eval import fast_agent_eval
+
+
+def test_results_do_not_depend_on_the_number_of_workers():
+    params = GameParams(num_planets=10, max_ticks=300)
+    for seed in (3, 4):
+        serial = fast_agent_eval(CarefulRandomAgent(), params, [CarefulRandomAgent()], n_games=12, n_workers=1, seed=seed)
+        pooled = fast_agent_eval(CarefulRandomAgent(), params, [CarefulRandomAgent()], n_games=12, n_workers=2, seed=seed)
+        assert serial == pooled
+
+
+def test_results_depend_on_the_seed():
+    params = GameParams(num_planets=10, max_ticks=300)
+    win_rates = {fast_agent_eval(CarefulRandomAgent(), params, [CarefulRandomAgent()], n_games=12, seed=seed)
+                 for seed in (3, 4)}
+    assert len(win_rates) == 2
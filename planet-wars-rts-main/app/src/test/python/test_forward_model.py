@@ -0,0 +1,60 @@
+import random
+
+import pytest
+
+from agents.random_agents import CarefulRandomAgent
+from core.forward_model import ForwardModel
+from core.game_state import GameParams, Player
+from core.game_state_factory import GameStateFactory
+
+
+def play(model: ForwardModel, n_steps: int, seed: int = 0):
+    random.seed(seed)
+    agents = {player: CarefulRandomAgent() for player in (Player.Player1, Player.Player2)}
+    for player, agent in agents.items():
+        agent.prepare_to_play_as(player, model.params)
+    for _ in range(n_steps):
+        model.step({player: agent.get_action(model.state) for player, agent in agents.items()})
+
+
+@pytest.mark.parametrize("with_clone", [False, True])
+def test_undo_restores_every_step(with_clone):
+    params = GameParams(num_planets=12)
+    model = ForwardModel(GameStateFactory(params, seed=1).create_game(), params, record_undo=True, debug=True)
+    model.state.state_hash()  # keep hashes maintained incrementally
+    history = []
+    random.seed(0)
+    agents = {player: CarefulRandomAgent() for player in (Player.Player1, Player.Player2)}
+    for player, agent in agents.items():
+        agent.prepare_to_play_as(player, params)
+    for _ in range(120):
+        history.append((model.state.model_copy(deep=True), model.state.state_hash()))
+        model.step({player: agent.get_action(model.state) for player, agent in agents.items()})
+
+    clones = []
+    while history:
+        if with_clone:
+            # a live copy-on-write clone taken before every undo must keep its contents
+            clone = model.state.fast_clone(copy_on_write=True)
+            clones.append((clone, clone.model_copy(deep=True), clone.state_hash()))
+        expected, expected_hash = history.pop()
+        model.undo()
+        assert model.state == expected
+        assert model.state.state_hash() == expected_hash
+    for clone, snapshot, clone_hash in clones:
+        assert clone == snapshot
+        assert clone.state_hash() == clone_hash
+
+
+def test_undo_then_replay_matches_a_fresh_game():
+    params = GameParams(num_planets=12)
+    model = ForwardModel(GameStateFactory(params, seed=2).create_game(), params, record_undo=True)
+    play(model, 80)
+    final_hash = model.state.state_hash()
+    clone = model.state.fast_clone(copy_on_write=True)
+    for _ in range(80):
+        model.undo()
+    assert model.state == GameStateFactory(params, seed=2).create_game()
+    play(model, 80)
+    assert model.state.state_hash() == final_hash
+    assert clone.state_hash() == final_hash
@@ -0,0 +1,41 @@
+import threading
+
+from agents.random_agents import CarefulRandomAgent
+from core.game_runner import GameRunner
+from core.game_state import GameParams
+from core.game_state_factory import GameStateFactory, derive_seed
+
+
+def test_run_games_stops_the_agent_worker_threads():
+    runner = GameRunner(CarefulRandomAgent(), CarefulRandomAgent(), GameParams(num_planets=10, max_ticks=50),
+                        seed=1, time_budget_ms=1000)
+    runner.run_games(2)
+    assert runner.workers == {}
+    for thread in threading.enumerate():
+        if thread.name.endswith(" agent"):
+            thread.join(timeout=5)
+            assert not thread.is_alive()
+
+
+class MapSeeds:
+    def __init__(self):
+        self.map_seeds = []
+
+    def start_game(self, state, agent_types, map_seed=None):
+        self.map_seeds.append(map_seed)
+
+    def record_step(self, state, actions):
+        pass
+
+    def end_game(self, forward_model):
+        pass
+
+
+def test_game_i_of_a_seeded_runner_is_played_on_map_i():
+    params = GameParams(num_planets=10, max_ticks=20)
+    recorder = MapSeeds()
+    runner = GameRunner(CarefulRandomAgent(), CarefulRandomAgent(), params, seed=5, recorder=recorder)
+    recorder.map_seeds.clear()  # the game set up by the constructor
+    runner.run_games(3)
+    assert recorder.map_seeds == [derive_seed(5, i) for i in range(3)]
+    assert runner.game_state == GameStateFactory(params, derive_seed(5, 2)).create_game()
@@ -0,0 +1,40 @@
+import random
+
+import numpy as np
+
+from agents.random_agents import CarefulRandomAgent, PureRandomAgent
+from core.game_state import GameParams
+from core.parallel_runner import GlobalRandomState, ParallelGameRunner
+
+
+def test_global_random_state_leaves_the_callers_generators_alone():
+    random.seed(5)
+    np.random.seed(5)
+    expected = random.random(), np.random.random()
+
+    random.seed(5)
+    np.random.seed(5)
+    stream = GlobalRandomState(1)
+    with stream:
+        first = random.random()
+    assert (random.random(), np.random.random()) == expected
+
+    # the stream carries on where it left off
+    with stream:
+        second = random.random()
+    reference = random.Random(1)
+    assert [first, second] == [reference.random(), reference.random()]
+
+
+def test_serial_games_do_not_reseed_the_caller():
+    params = GameParams(num_planets=10, max_ticks=200)
+    random.seed(5)
+    np.random.seed(5)
+    expected = random.random(), np.random.random()
+
+    random.seed(5)
+    np.random.seed(5)
+    runner = ParallelGameRunner(CarefulRandomAgent, PureRandomAgent, params, seed=42, n_workers=1)
+    winners = runner.run_winners(4)
+    assert (random.random(), np.random.random()) == expected
+    assert ParallelGameRunner(CarefulRandomAgent, PureRandomAgent, params, seed=42, n_workers=1).run_winners(4) == winners
@@ -0,0 +1,89 @@
+import random
+
+import pytest
+
+from agents.random_agents import CarefulRandomAgent
+from core.array_forward_model import CODE_PLAYERS
+from core.game_runner import GameRunner
+from core.game_state import GameParams
+from replay.replay_format import CODECS, SHIP_SCALE
+from replay.replay_reader import ReplayReader
+from replay.replay_writer import ReplayWriter
+
+PARAMS = GameParams(num_planets=12, max_ticks=300)
+
+
+def play(recorder, seed=1):
+    """Plays a seeded game with recorder and returns a copy of every state, from the initial one on."""
+    random.seed(seed)
+    runner = GameRunner(CarefulRandomAgent(), CarefulRandomAgent(), PARAMS, seed=seed, recorder=recorder)
+    states = [runner.forward_model.state.model_copy(deep=True)]
+    while not runner.forward_model.is_terminal():
+        runner.step_game()
+        states.append(runner.forward_model.state.model_copy(deep=True))
+    return runner, states
+
+
+def assert_same_state(replayed, recorded):
+    assert replayed.game_tick == recorded.game_tick
+    for got, expected in zip(replayed.planets, recorded.planets, strict=True):
+        assert (got.id, got.owner, got.position, got.growth_rate, got.radius) == \
+               (expected.id, expected.owner, expected.position, expected.growth_rate, expected.radius)
+        assert got.n_ships == pytest.approx(expected.n_ships, abs=0.5 / SHIP_SCALE)
+        if expected.transporter is None:
+            assert got.transporter is None
+        else:
+            transporter = expected.transporter
+            assert got.transporter.n_ships == pytest.approx(transporter.n_ships, abs=0.5 / SHIP_SCALE)
+            assert got.transporter.model_copy(update={"n_ships": transporter.n_ships}) == transporter
+
+
+@pytest.mark.parametrize("codec", sorted(CODECS))
+def test_replay_reproduces_every_state(codec):
+    writer = ReplayWriter(PARAMS, codec=codec)
+    runner, states = play(writer)
+    reader = ReplayReader(writer.last_replay)
+    assert len(reader) == len(states)
+    assert reader.winner == runner.forward_model.get_leader()
+    assert reader.params == PARAMS
+    for replayed, recorded in zip(reader.states(), states, strict=True):
+        assert_same_state(replayed, recorded)
+
+
+def test_replay_is_much_smaller_than_the_states():
+    writer = ReplayWriter(PARAMS)
+    _, states = play(writer)
+    json_size = sum(len(state.model_dump_json()) for state in states)
+    assert len(writer.last_replay) * 50 < json_size
+
+
+def test_reader_rejects_other_files():
+    with pytest.raises(ValueError):
+        ReplayReader(b"not a replay at all")
+
+
+def test_keyframed_segments_support_random_access_from_a_mapped_file(tmp_path):
+    # a short interval puts many transporters across segment boundaries
+    writer = ReplayWriter(PARAMS, directory=tmp_path, keyframe_interval=7)
+    _, states = play(writer, seed=2)
+    assert writer.paths == [tmp_path / "game_000000.pwr"]
+    rows = list(range(len(states)))
+    random.Random(0).shuffle(rows)
+    with ReplayReader.load(writer.paths[0]) as reader:
+        assert reader.header["n_segments"] == -(-len(states) // 7)
+        for row in rows:
+            assert_same_state(reader.get_state(row), states[row])
+        with pytest.raises(IndexError):
+            reader.get_state(len(states))
+
+
+def test_captures_list_every_change_of_owner():
+    writer = ReplayWriter(PARAMS, keyframe_interval=10)
+    _, states = play(writer, seed=3)
+    expected = [(row, planet.id, planet.owner)
+                for row in range(1, len(states))
+                for planet, before in zip(states[row].planets, states[row - 1].planets)
+                if planet.owner != before.owner]
+    assert expected
+    reader = ReplayReader(writer.last_replay)
+    assert [(row, planet, CODE_PLAYERS[owner]) for row, planet, owner in reader.captures().tolist()] == expected
@@ -0,0 +1,65 @@
+import numpy as np
+
+from agents.greedy_heuristic_agent import GreedyHeuristicAgent
+from agents.random_agents import CarefulRandomAgent
+from core.game_state import GameParams
+from core.parallel_runner import play_games
+from learning.self_play import ChunkLog, self_play
+from learning.shards import ShardWriter, read_manifest, read_shards
+from learning.trajectories import TrajectoryRecorder
+
+PARAMS = GameParams(num_planets=10, max_ticks=300)
+
+
+def concatenated(directory):
+    shards = list(read_shards(directory))
+    return {name: np.concatenate([shard[name] for shard in shards]) for name in shards[0]}
+
+
+def test_recorder_sends_bounded_chunks_and_outcomes_to_its_sink():
+    log = ChunkLog()
+    recorder = TrajectoryRecorder(PARAMS, sink=log, flush_every=16, first_game=5)
+    play_games(GreedyHeuristicAgent, CarefulRandomAgent, PARAMS, 1, range(5, 7), recorder=recorder)
+    chunks = [args for name, args in log.calls if name == "add_chunk"]
+    ends = [args for name, args in log.calls if name == "end_game"]
+    assert [game for game, _ in ends] == [5, 6]
+    assert all(len(chunk["tick"]) <= 16 * 2 for _, chunk in chunks)
+    # each game's chunks come before its outcome
+    assert log.calls.index(("end_game", ends[0])) < next(
+        i for i, (name, args) in enumerate(log.calls) if name == "add_chunk" and args[0] == 6)
+
+
+def test_streamed_shards_match_games_recorded_in_memory(tmp_path):
+    recorder = TrajectoryRecorder(PARAMS)
+    play_games(GreedyHeuristicAgent, CarefulRandomAgent, PARAMS, 1, range(3), recorder=recorder)
+    with ShardWriter(tmp_path, max_shard_bytes=20_000) as writer:
+        self_play(writer, GreedyHeuristicAgent, CarefulRandomAgent, PARAMS, 3, seed=1, flush_every=16)
+    assert len(writer.shards) > 1
+    data = concatenated(tmp_path)
+    for game_index, game in enumerate(recorder.games):
+        rows = data["game"] == game_index
+        for name in game:
+            np.testing.assert_array_equal(data[name][rows], game[name])
+    assert sorted(read_manifest(tmp_path)["outcomes"]) == ["0", "1", "2"]
+
+
+def test_mirrored_decisions_get_the_outcome_of_their_seat(tmp_path):
+    with ShardWriter(tmp_path) as writer:
+        self_play(writer, GreedyHeuristicAgent, CarefulRandomAgent, PARAMS, 2, seed=1, mirror=True, flush_every=16)
+    data = concatenated(tmp_path)
+    original, twin = ~data["mirrored"], data["mirrored"]
+    np.testing.assert_array_equal(data["outcome"][original], data["outcome"][twin])
+    np.testing.assert_array_equal(data["player"][original], 3 - data["player"][twin])
+
+
+def test_shards_do_not_depend_on_the_number_of_workers(tmp_path):
+    datasets = []
+    for n_workers in (1, 2):
+        directory = tmp_path / str(n_workers)
+        with ShardWriter(directory) as writer:
+            self_play(writer, GreedyHeuristicAgent, CarefulRandomAgent, PARAMS, 6, seed=2,
+                      n_workers=n_workers, games_per_task=2, flush_every=32)
+        datasets.append(concatenated(directory))
+    serial, pooled = datasets
+    for name in serial:
+        np.testing.assert_array_equal(serial[name], pooled[name])
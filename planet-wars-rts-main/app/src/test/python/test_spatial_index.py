@@ -0,0 +1,40 @@
+import pytest
+
+from agents.defensive_agent import DefensiveTurtleAgent
+from agents.greedy_heuristic_agent import GreedyHeuristicAgent
+from core.forward_model import ForwardModel
+from core.game_state import GameParams, Player
+from core.game_state_factory import GameStateFactory
+from core.spatial_index import SpatialIndex
+
+
+def states_after(params: GameParams, seed: int, ticks: int):
+    # a few ticks in, so the agents have ships to send
+    model = ForwardModel(GameStateFactory(params, seed=seed).create_game(), params)
+    for _ in range(ticks):
+        model.step({})
+    return model.state
+
+
+@pytest.mark.parametrize("agent_class", [GreedyHeuristicAgent, DefensiveTurtleAgent])
+def test_one_agent_reused_across_maps_matches_fresh_agents(agent_class):
+    params = GameParams(num_planets=20)
+    reused = agent_class()
+    reused.prepare_to_play_as(Player.Player1, params)
+    # alternate maps without prepare_to_play_as in between, as one agent asked about many games would
+    for seed in (1, 2, 1, 3):
+        state = states_after(params, seed, 30)
+        fresh = agent_class()
+        fresh.prepare_to_play_as(Player.Player1, params)
+        assert reused.get_action(state) == fresh.get_action(state)
+        assert reused.spatial.distance_rows == SpatialIndex.from_game_state(state, params.transporter_speed).distance_rows
+
+
+def test_index_matches_only_its_own_map():
+    params = GameParams(num_planets=20)
+    state1 = GameStateFactory(params, seed=1).create_game()
+    state2 = GameStateFactory(params, seed=2).create_game()
+    index = state1.spatial_index(params.transporter_speed)
+    assert index.matches(state1.fast_clone().planets)
+    assert not index.matches(state2.planets)
+    assert not index.matches(state1.planets[:-2])
@@ -0,0 +1,86 @@
+import os
+import random
+import subprocess
+import sys
+
+from agents.random_agents import CarefulRandomAgent
+from core.forward_model import ForwardModel
+from core.game_state import GameParams, GameState, Player
+from core.game_state_factory import GameStateFactory
+from core.state_hash import compute_hashes
+
+PARAMS = GameParams(num_planets=16, max_ticks=400)
+
+
+def played_states(seed):
+    """Every state of a seeded game, with the hashes maintained incrementally from the start."""
+    random.seed(seed)
+    model = ForwardModel(GameStateFactory(PARAMS, seed).create_game(), PARAMS)
+    model.state.state_hash()
+    agents = {player: CarefulRandomAgent() for player in (Player.Player1, Player.Player2)}
+    for player, agent in agents.items():
+        agent.prepare_to_play_as(player, PARAMS)
+    while not model.is_terminal():
+        model.step({player: agent.get_action(model.state) for player, agent in agents.items()})
+        yield model
+
+
+def test_incremental_hashes_match_a_full_recomputation():
+    for model in played_states(1):
+        assert model.state.cached_hashes() == compute_hashes(model.state), f"tick {model.state.game_tick}"
+
+
+def test_equal_states_hash_equally():
+    for model in played_states(2):
+        if model.state.game_tick % 50:
+            continue
+        state = model.state
+        copy = GameState.model_validate(state.model_dump())
+        assert copy.cached_hashes() == (None, None)
+        assert copy.state_hash() == state.state_hash()
+        assert copy.canonical_hash() == state.canonical_hash()
+
+
+def test_tick_is_part_of_the_hash():
+    state = GameStateFactory(PARAMS, 3).create_game()
+    later = state.model_copy(deep=True)
+    later.game_tick += 1
+    assert later.state_hash() != state.state_hash()
+    assert compute_hashes(later) == compute_hashes(state)
+
+
+def test_canonical_hash_is_shared_with_the_mirrored_state():
+    for model in played_states(4):
+        state = model.state
+        mirrored = state.mirrored(PARAMS)
+        assert mirrored.canonical_hash() == state.canonical_hash()
+        # the mirror's cached hashes are the original's swapped, and agree with a recomputation
+        assert mirrored.cached_hashes() == compute_hashes(mirrored)
+
+
+def test_undo_restores_the_hash():
+    random.seed(5)
+    model = ForwardModel(GameStateFactory(PARAMS, 5).create_game(), PARAMS, record_undo=True)
+    agent = CarefulRandomAgent()
+    agent.prepare_to_play_as(Player.Player1, PARAMS)
+    hashes = [model.state.state_hash()]
+    for _ in range(60):
+        model.step({Player.Player1: agent.get_action(model.state)})
+        hashes.append(model.state.state_hash())
+    while model.undo_stack:
+        hashes.pop()
+        model.undo()
+        assert model.state.state_hash() == hashes[-1]
+        assert model.state.cached_hashes() == compute_hashes(model.state)
+
+
+def test_hash_does_not_depend_on_the_interpreter_hash_seed():
+    script = ("from core.game_state import GameParams; from core.game_state_factory import GameStateFactory; "
+              "print(GameStateFactory(GameParams(num_planets=16), 7).create_game().state_hash())")
+    source = os.path.join(os.path.dirname(__file__), "..", "..", "main", "python")
+    hashes = set()
+    for hash_seed in ("1", "2"):
+        env = dict(os.environ, PYTHONHASHSEED=hash_seed, PYTHONPATH=source)
+        hashes.add(subprocess.run([sys.executable, "-c", script], env=env, capture_output=True,
+                                  text=True, check=True).stdout)
+    assert len(hashes) == 1
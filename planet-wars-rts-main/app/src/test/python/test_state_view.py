@@ -0,0 +1,112 @@
+import copy
+
+import pytest
+
+from core.game_state import GameParams, GameState
+from core.game_state_factory import GameStateFactory
+from core.state_view import ReadOnlyStateError, read_only
+
+
+@pytest.fixture
+def state() -> GameState:
+    return GameStateFactory(GameParams(num_planets=10), seed=1).create_game()
+
+
+def test_reads_follow_the_live_state(state):
+    view = read_only(state)
+    state.game_tick = 7
+    assert view.game_tick == 7
+    assert isinstance(view, GameState)
+    assert view.planets[0].n_ships == state.planets[0].n_ships
+
+
+def test_assignment_is_rejected(state):
+    view = read_only(state)
+    with pytest.raises(ReadOnlyStateError):
+        view.game_tick = 5
+    with pytest.raises(ReadOnlyStateError):
+        view.planets[0].n_ships = 0.0
+    with pytest.raises(ReadOnlyStateError):
+        view.planets[0].position.x = 0.0
+
+
+@pytest.mark.parametrize("name", ["__dict__", "__pydantic_private__", "_shared_planets", "_copy_planets"])
+def test_private_and_dunder_attributes_are_not_forwarded(state, name):
+    view = read_only(state)
+    with pytest.raises(AttributeError):
+        getattr(view, name)
+    with pytest.raises(AttributeError):
+        getattr(view.planets[0], name)
+
+
+def test_dict_cannot_be_used_to_write_through(state):
+    view = read_only(state)
+    with pytest.raises(AttributeError):
+        view.__dict__["game_tick"] = 5
+    assert state.game_tick == 0
+
+
+@pytest.mark.parametrize("name", ["ensure_writable", "invalidate_hash", "set_cached_hashes", "copy"])
+def test_mutating_methods_are_rejected(state, name):
+    with pytest.raises(ReadOnlyStateError):
+        getattr(read_only(state), name)
+
+
+def test_copies_are_independent(state):
+    view = read_only(state)
+    ships = state.planets[0].n_ships
+    for clone in (view.model_copy(), copy.copy(view), copy.deepcopy(view), view.fast_clone(copy_on_write=True)):
+        assert clone == state
+        clone.planets[0].n_ships = ships + 100
+        clone.game_tick = 9
+    assert state.planets[0].n_ships == ships
+    assert state.game_tick == 0
+
+
+def test_equality_holds_in_both_directions(state):
+    view = read_only(state)
+    assert view == state
+    assert state == view
+    assert state.planets == view.planets
+    assert view.planets == state.planets
+    assert state.planets[0] == view.planets[0]
+    assert view.planets[0].position == state.planets[0].position
+    other = state.model_copy(deep=True)
+    other.game_tick += 1
+    assert other != view
+    assert view != other
+
+
+def test_lists_behave_like_lists(state):
+    view = read_only(state)
+    planets = view.planets
+    assert isinstance(planets, list)
+    extended = planets + [state.planets[0]]
+    assert len(extended) == len(state.planets) + 1
+    copied = planets.copy()
+    copied.append(None)
+    assert len(copied) == len(state.planets) + 1
+    assert sorted(planets, key=lambda p: p.n_ships)[0].n_ships == min(p.n_ships for p in state.planets)
+    assert copy.deepcopy(planets) == state.planets
+
+
+@pytest.mark.parametrize("change", [
+    lambda planets: planets.append(None),
+    lambda planets: planets.extend([None]),
+    lambda planets: planets.pop(),
+    lambda planets: planets.clear(),
+    lambda planets: planets.sort(key=id),
+    lambda planets: planets.__setitem__(0, None),
+    lambda planets: planets.__delitem__(0),
+    lambda planets: planets.__iadd__([None]),
+])
+def test_lists_cannot_be_changed_in_place(state, change):
+    with pytest.raises(ReadOnlyStateError):
+        change(read_only(state).planets)
+    assert len(state.planets) == 10
+
+
+def test_read_only_methods_still_work(state):
+    view = read_only(state)
+    assert view.state_hash() == state.state_hash()
+    assert view.mirrored(GameParams(num_planets=10)) == state.mirrored(GameParams(num_planets=10))
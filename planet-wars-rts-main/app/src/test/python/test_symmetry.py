@@ -0,0 +1,66 @@
+import random
+
+import numpy as np
+import pytest
+
+from agents.random_agents import CarefulRandomAgent
+from core.array_forward_model import ArrayGameState
+from core.forward_model import ForwardModel
+from core.game_state import GameParams, Player
+from core.game_state_factory import GameStateFactory
+from core.symmetry import is_point_symmetric, mirror_action, mirror_arrays
+
+PARAMS = [
+    GameParams(num_planets=12),
+    GameParams(num_planets=16, width=1000, height=300),
+]
+
+
+@pytest.mark.parametrize("params", PARAMS, ids=["default", "wide"])
+def test_mirrored_game_tracks_the_mirror_of_the_game(params):
+    state = GameStateFactory(params, seed=4).create_game()
+    assert is_point_symmetric(state, params)
+    model = ForwardModel(state, params)
+    mirrored = ForwardModel(state.mirrored(params), params)
+    random.seed(1)
+    agents = {player: CarefulRandomAgent() for player in (Player.Player1, Player.Player2)}
+    for player, agent in agents.items():
+        agent.prepare_to_play_as(player, params)
+    n = len(state.planets)
+    for _ in range(300):
+        actions = {player: agent.get_action(model.state) for player, agent in agents.items()}
+        model.step(actions)
+        # the seats swap, and Player1's action is applied first, so the mirrored game gets them swapped too
+        mirrored.step({player.opponent(): mirror_action(action, n) for player, action in actions.items()})
+        expected = model.state.mirrored(params)
+        for planet, other in zip(mirrored.state.planets, expected.planets):
+            assert planet.owner == other.owner
+            assert planet.n_ships == pytest.approx(other.n_ships, abs=1e-9)
+            assert (planet.transporter is None) == (other.transporter is None)
+            if planet.transporter is not None:
+                assert planet.transporter.s.x == pytest.approx(other.transporter.s.x, abs=1e-9)
+                assert planet.transporter.s.y == pytest.approx(other.transporter.s.y, abs=1e-9)
+
+
+@pytest.mark.parametrize("params", PARAMS, ids=["default", "wide"])
+def test_mirroring_twice_gives_the_original(params):
+    model = ForwardModel(GameStateFactory(params, seed=5).create_game(), params)
+    random.seed(2)
+    agents = {player: CarefulRandomAgent() for player in (Player.Player1, Player.Player2)}
+    for player, agent in agents.items():
+        agent.prepare_to_play_as(player, params)
+    for _ in range(100):
+        model.step({player: agent.get_action(model.state) for player, agent in agents.items()})
+    state = model.state
+    # transporter positions go through width - (width - x), so compare the quantized hashes
+    assert state.mirrored(params).mirrored(params).state_hash() == state.state_hash()
+    assert state.mirrored(params).canonical_hash() == state.canonical_hash()
+
+    arrays = ArrayGameState.from_game_state(state)
+    mirrored_arrays = mirror_arrays(arrays, params)
+    expected = ArrayGameState.from_game_state(state.mirrored(params))
+    for name in ("owner", "ships", "t_active", "t_owner", "t_dest", "t_ships"):
+        assert np.array_equal(getattr(mirrored_arrays, name), getattr(expected, name)), name
+    active = expected.t_active
+    assert np.allclose(mirrored_arrays.t_x[active], expected.t_x[active])
+    assert np.allclose(mirrored_arrays.t_y[active], expected.t_y[active])
@@ -0,0 +1,36 @@
+import random
+
+import numpy as np
+
+from agents.random_agents import CarefulRandomAgent
+from core.batch_forward_model import BatchActions
+from core.game_state import GameParams
+from learning.vec_env import VecPlanetWarsEnv
+
+
+def observations(disturb: bool):
+    env = VecPlanetWarsEnv(CarefulRandomAgent(), GameParams(num_planets=10), n_envs=4, seed=3)
+    env.reset()
+    sums = []
+    for _ in range(100):
+        if disturb:
+            random.random()
+            np.random.random()
+        observation, _, _, _ = env.step(BatchActions.do_nothing(4))
+        sums.append(float(observation.sum()))
+    return sums
+
+
+def test_reset_leaves_the_callers_generators_alone():
+    random.seed(1)
+    np.random.seed(1)
+    expected = random.random(), np.random.random()
+
+    random.seed(1)
+    np.random.seed(1)
+    VecPlanetWarsEnv(CarefulRandomAgent(), GameParams(num_planets=10), n_envs=2, seed=3).reset()
+    assert (random.random(), np.random.random()) == expected
+
+
+def test_opponents_do_not_depend_on_the_callers_draws():
+    assert observations(disturb=False) == observations(disturb=True)